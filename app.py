@@ -1,5 +1,4 @@
 import os
-import time
 import threading
 import logging
 import argparse
@@ -10,8 +9,10 @@ from app.database import get_db
 from app.services.matlab_interface import get_matlab
 from app.services.monitor_service import get_monitor_service
 from app.services.event_service import get_event_service
+from app.services.retention_service import get_retention_service
 from app.utils import get_logger
 from app.utils.logger import Logger
+from app.monitor import run_forever as run_monitor
 
 # Parse command-line arguments
 parser = argparse.ArgumentParser(description='ASTRA - Automated Satellite Threshold Reporting & Alerts')
@@ -61,33 +62,13 @@ db = get_db()
 matlab = get_matlab()
 
 def monitor_metrics():
-    """Background thread to monitor satellite metrics at regular intervals."""
-    logger.info("Starting background monitoring thread")
+    """Background thread to monitor satellite metrics at regular intervals.
     
-    while True:
-        try:
-            logger.info("Running scheduled metrics check")
-            results = matlab.monitor_all_metrics()
-            
-            # Log results to database
-            for result in results:
-                db.log_trigger(
-                    scid=result["scid"],
-                    metric_type=result["metric_type"],
-                    timestamp=result["timestamp"],
-                    value=result["value"],
-                    threshold=result["threshold"],
-                    status=result["status"]
-                )
-            
-            logger.info(f"Monitored {len(results)} metrics, found {sum(1 for r in results if r['status'] == 'BREACH')} breaches")
-        except Exception as e:
-            logger.error(f"Error in monitoring thread: {e}")
-        
-        # Sleep until next interval
-        interval = config.get_refresh_interval()
-        logger.info(f"Sleeping for {interval} seconds until next check")
-        time.sleep(interval)
+    Only used by the development server; in production run the monitor as
+    its own process with ``python -m app.monitor``.
+    """
+    logger.info("Starting background monitoring thread")
+    run_monitor()
 
 @app.route('/')
 def index():
@@ -100,23 +81,30 @@ def events():
     return render_template('events.html')
 
 if __name__ == "__main__":
-    # Start the background monitoring thread
-    monitor_thread = threading.Thread(target=monitor_metrics, daemon=True)
-    monitor_thread.start()
+    # Start the background threads. With debug=True the reloader runs this
+    # script twice; only the child that serves requests (WERKZEUG_RUN_MAIN)
+    # starts them, so two processes never run MATLAB or expire the same batches
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        monitor_thread = threading.Thread(target=monitor_metrics, daemon=True)
+        monitor_thread.start()
+        
+        if config.is_retention_enabled():
+            get_retention_service().start()
     
     print("\n" + "="*80)
     print("ASTRA - Automated Satellite Threshold Reporting & Alerts")
     print("="*80)
     print(f"- Monitoring {len(config.get_payloads())} payloads and {len(config.get_metrics())} metrics")
-    print(f"- Database: {config.get_database_path()}")
+    print(f"- Database: {db.engine.url.render_as_string(hide_password=True)}")
     print(f"- MATLAB scripts path: {config.get_matlab_scripts_path()}")
     print(f"- Simulation mode: {'ENABLED' if use_simulation else 'DISABLED'}")
     print(f"- Refresh interval: {config.get_refresh_interval()} seconds")
+    print(f"- Retention: {'ENABLED' if config.is_retention_enabled() else 'DISABLED'}")
     print(f"- Logging: {'DISABLED' if not logging_enabled else 'ENABLED'}")
     print("\nAccessing the web interface:")
     print("- Dashboard: http://localhost:5000/")
     print("- Events: http://localhost:5000/events")
     print("="*80 + "\n")
     
-    # Start the Flask application
+    # Start the Flask development server (see wsgi.py for production serving)
     app.run(host='0.0.0.0', port=5000, debug=True) 
\ No newline at end of file
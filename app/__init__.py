@@ -6,7 +6,9 @@ from app.database import get_db
 from app.routes.main import main_bp
 from app.routes.api import api_bp
 from app.utils import get_logger
+from app.utils.json_provider import FastJSONProvider
 from app.config.cache import cache, init_cache
+from app.cli import register_commands
 
 # Initialize logger
 logger = get_logger('app')
@@ -18,6 +20,9 @@ def create_app(config_class=Config):
     # Load configuration
     app.config.from_object(config_class)
     
+    # Encode JSON responses with orjson when available
+    app.json = FastJSONProvider(app)
+    
     # Initialize database
     db = get_db()
     db.init_app()
@@ -29,6 +34,9 @@ def create_app(config_class=Config):
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp, url_prefix='/api')
     
+    # Register maintenance CLI commands
+    register_commands(app)
+    
     # Register teardown function to close database resources
     @app.teardown_appcontext
     def cleanup(exception=None):
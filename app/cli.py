@@ -0,0 +1,130 @@
+"""Flask CLI commands for database maintenance.
+
+Run with ``flask --app app <command>`` from the repository root.
+"""
+
+import click
+from datetime import timedelta
+from app.database import get_db
+
+def _retained_since():
+    """First day whose raw BREACH events are all still kept by retention."""
+    from app.services.retention_service import get_retention_service
+    
+    return (get_retention_service().get_cutoffs()['BREACH'] + timedelta(days=1)).date()
+
+def register_commands(app):
+    """Register maintenance commands on the application's CLI."""
+    
+    @app.cli.command('rebuild-latest-status')
+    def rebuild_latest_status():
+        """Rebuild the latest_status table from existing events."""
+        count = get_db().rebuild_latest_status()
+        click.echo(f"Rebuilt latest_status with {count} rows")
+    
+    @app.cli.command('rebuild-breach-counts')
+    def rebuild_breach_counts():
+        """Rebuild the daily breach count rollup from existing events.
+        
+        Days whose raw events were removed by retention keep their counts.
+        """
+        count = get_db().rebuild_breach_counts(since=_retained_since())
+        click.echo(f"Rebuilt breach_daily_counts with {count} rows")
+    
+    @app.cli.command('check-breach-counts')
+    @click.option('--fix', is_flag=True, help='Rebuild the rollup if any bucket is inconsistent.')
+    def check_breach_counts(fix):
+        """Check the daily breach count rollup against the events table.
+        
+        Only days still inside the BREACH retention period are compared.
+        """
+        db = get_db()
+        since = _retained_since()
+        mismatches = db.check_breach_counts(since=since)
+        for m in mismatches:
+            click.echo(f"SCID {m['scid']} {m['metric_type']} {m['day']}: "
+                       f"expected {m['expected']}, rollup has {m['actual']}")
+        if not mismatches:
+            click.echo("breach_daily_counts is consistent with events")
+        elif fix:
+            count = db.rebuild_breach_counts(since=since)
+            click.echo(f"Rebuilt breach_daily_counts with {count} rows")
+        else:
+            raise SystemExit(1)
+    
+    @app.cli.command('run-retention')
+    @click.option('--max-batches', type=int, default=None,
+                  help='Stop after this many batches per status instead of catching up fully.')
+    def run_retention(max_batches):
+        """Archive, downsample and delete events past their retention period."""
+        from app.services.retention_service import get_retention_service
+        
+        removed = get_retention_service().run_once(max_batches=max_batches)
+        click.echo(f"Removed {removed['NORMAL']} NORMAL and {removed['BREACH']} BREACH events")
+    
+    @app.cli.command('ingest-spool')
+    def ingest_spool():
+        """Load every result file waiting in the spool directory into events."""
+        from app.services.ingest_service import get_ingest_service
+        
+        ingested = get_ingest_service().run_once()
+        click.echo(f"Ingested {ingested['rows']} rows from {ingested['files']} files")
+    
+    @app.cli.command('export-events')
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson', 'arrow', 'parquet']),
+                  default='csv', show_default=True, help='Output format; arrow and parquet need pyarrow.')
+    @click.option('--output', '-o', type=click.Path(dir_okay=False, writable=True), default=None,
+                  help='File to write; defaults to standard output.')
+    @click.option('--date-from', default=None, help='Start date (YYYY-MM-DD).')
+    @click.option('--date-to', default=None, help='End date (YYYY-MM-DD).')
+    @click.option('--scid', type=int, default=None, help='Only this payload.')
+    @click.option('--metric-type', default=None, help='Only this metric.')
+    @click.option('--status', type=click.Choice(['BREACH', 'NORMAL']), default=None, help='Only this status.')
+    @click.option('--chunk-size', type=int, default=10000, show_default=True, help='Rows read per chunk.')
+    def export_events(fmt, output, date_from, date_to, scid, metric_type, status, chunk_size):
+        """Export events, oldest first, streaming them chunk by chunk."""
+        from app.services.export_service import get_export_service
+        
+        filters = {
+            'scid': scid,
+            'metric_type': metric_type,
+            'status': status,
+            'date_from': date_from,
+            'date_to': date_to
+        }
+        try:
+            chunks = get_export_service().export(fmt, filters=filters, chunk_size=chunk_size)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+        
+        size = 0
+        with click.open_file(output or '-', 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+        if output:
+            click.echo(f"Wrote {size} bytes to {output}")
+    
+    @app.cli.command('migrate-indexes')
+    def migrate_indexes():
+        """Create missing indexes and drop superseded ones on an existing database."""
+        created, dropped = get_db().migrate_indexes()
+        click.echo(f"Created {len(created)} indexes: {', '.join(created) or '-'}")
+        click.echo(f"Dropped {len(dropped)} indexes: {', '.join(dropped) or '-'}")
+    
+    @app.cli.command('audit-query-plans')
+    def audit_query_plans():
+        """Check that every hot query is served by an index, not a table scan."""
+        from app.services.query_audit import explain_hot_queries
+        
+        try:
+            report = explain_hot_queries()
+        except ValueError as e:
+            click.echo(f"Skipping query plan audit: {e}")
+            return
+        for entry in report:
+            click.echo(f"[{'ok' if entry['uses_index'] else 'SCAN'}] {entry['name']}")
+            for line in entry['plan']:
+                click.echo(f"       {line}")
+        if not all(entry['uses_index'] for entry in report):
+            raise SystemExit(1)
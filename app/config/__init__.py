@@ -1,4 +1,4 @@
-from .cache import cache, init_cache
-from .config import Config
+from .cache import cache, init_cache, memoize, cache_get, cache_set, get_generation, bump_generation
+from .config import Config, get_config
 
-__all__ = ['cache', 'init_cache', 'Config'] 
\ No newline at end of file
+__all__ = ['cache', 'init_cache', 'memoize', 'cache_get', 'cache_set', 'get_generation', 'bump_generation', 'Config', 'get_config'] 
\ No newline at end of file
@@ -1,8 +1,188 @@
+"""Application caches.
+
+Memoized reads go through two tiers: a bounded in-process LRU in front of the
+Flask-Caching backend (filesystem by default, shared between processes).
+Cache keys include an ingestion generation that is bumped after every
+committed ingestion, so new data is visible immediately and entries for old
+generations simply age out.
+"""
+
+from collections import OrderedDict
 from flask_caching import Cache
+import functools
+import json
 import os
+import threading
+import time
+from app.config.config import get_config
 
 cache = Cache()
 
+# Backend key holding the generation shared by every process
+GENERATION_KEY = 'astra:generation'
+
+# Seconds between checks of the shared generation in the backend
+GENERATION_CHECK_INTERVAL = 1.0
+
+class MemoryLRU:
+    """Thread-safe, size-bounded in-process cache with per-entry expiry."""
+    
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Get a cached value.
+        
+        Returns:
+            tuple: (hit, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+    
+    def set(self, key, value, timeout=None):
+        """Store a value, evicting the least recently used entry when full."""
+        expires_at = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
+memory_cache = MemoryLRU(get_config().get_cache_memory_size())
+
+_generation = 0
+_generation_checked_at = 0.0
+_generation_lock = threading.Lock()
+
+def _backend():
+    """Get the Flask-Caching backend, or None before init_cache has run."""
+    try:
+        return cache.cache
+    except (AttributeError, KeyError, RuntimeError):
+        return None
+
+def get_generation():
+    """Get the current ingestion generation.
+    
+    The shared value in the backend is read at most once per
+    GENERATION_CHECK_INTERVAL, so cache hits in between never leave the process.
+    """
+    global _generation, _generation_checked_at
+    now = time.monotonic()
+    if now - _generation_checked_at < GENERATION_CHECK_INTERVAL:
+        return _generation
+    
+    with _generation_lock:
+        if now - _generation_checked_at >= GENERATION_CHECK_INTERVAL:
+            backend = _backend()
+            if backend is not None:
+                try:
+                    shared = backend.get(GENERATION_KEY)
+                    if shared is not None and shared > _generation:
+                        _generation = shared
+                except Exception:
+                    pass
+            _generation_checked_at = now
+    return _generation
+
+def bump_generation():
+    """Start a new ingestion generation after new data has been committed.
+    
+    Generations never repeat, even if the shared key is evicted, because
+    they are at least the current time in nanoseconds.
+    
+    Returns:
+        int: The new generation
+    """
+    global _generation, _generation_checked_at
+    with _generation_lock:
+        _generation = max(_generation + 1, time.time_ns())
+        _generation_checked_at = time.monotonic()
+        backend = _backend()
+        if backend is not None:
+            try:
+                backend.set(GENERATION_KEY, _generation, timeout=0)
+            except Exception:
+                pass
+        return _generation
+
+def memoize(timeout=300):
+    """Memoize a service method through the memory and backend tiers.
+    
+    The first positional argument (``self``) is not part of the key, so this
+    is meant for singleton services. Results are shared between callers and
+    must not be modified.
+    
+    Args:
+        timeout (int): Seconds an entry stays valid in either tier
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = f"{name}:{get_generation()}:{json.dumps([args, kwargs], sort_keys=True, default=str)}"
+            
+            value = cache_get(key, timeout)
+            if value is None:
+                value = func(self, *args, **kwargs)
+                cache_set(key, value, timeout)
+            return value
+        
+        return wrapper
+    return decorator
+
+def cache_get(key, timeout=300):
+    """Look a key up in the memory tier, then the backend.
+    
+    A backend hit is copied into the memory tier for ``timeout`` seconds.
+    
+    Returns:
+        The cached value, or None on a miss
+    """
+    hit, value = memory_cache.get(key)
+    if hit:
+        return value
+    
+    backend = _backend()
+    if backend is not None:
+        try:
+            value = backend.get(key)
+        except Exception:
+            value = None
+        if value is not None:
+            memory_cache.set(key, value, timeout)
+            return value
+    return None
+
+def cache_set(key, value, timeout=300):
+    """Store a value in both tiers for ``timeout`` seconds."""
+    memory_cache.set(key, value, timeout)
+    backend = _backend()
+    if backend is not None:
+        try:
+            backend.set(key, value, timeout=timeout)
+        except Exception:
+            pass
+
 def init_cache(app):
     """Initialize Flask-Caching with the application."""
     # Create cache directory if it doesn't exist
@@ -11,7 +191,7 @@ def init_cache(app):
         os.makedirs(cache_dir)
     
     cache_config = {
-        'CACHE_TYPE': 'filesystem',
+        'CACHE_TYPE': get_config().get_cache_backend(),
         'CACHE_DIR': cache_dir,
         'CACHE_DEFAULT_TIMEOUT': 300,  # 5 minutes
         'CACHE_THRESHOLD': 1000,  # Maximum number of items the cache will store
@@ -26,4 +206,6 @@ def init_cache(app):
     if app.config.get('CACHE_DEFAULT_TIMEOUT'):
         cache_config['CACHE_DEFAULT_TIMEOUT'] = app.config['CACHE_DEFAULT_TIMEOUT']
     
-    cache.init_app(app, config=cache_config) 
\ No newline at end of file
+    cache.init_app(app, config=cache_config)
+    # Let the monitor thread and CLI commands reach the backend outside a request
+    cache.app = app
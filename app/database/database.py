@@ -1,28 +1,44 @@
 import os
-from sqlalchemy import create_engine, func
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.exc import SQLAlchemyError
 import datetime
 import sqlalchemy
-from app.config import Config
+from app.config import Config, bump_generation
 from app.database.base import Base
+from app.database.engine import create_database_engine, enable_time_partitioning
+from app.database.pagination import apply_keyset
 from app.utils import get_logger
 
 # Initialize logger
 logger = get_logger('database')
 
+# Single-column indexes made redundant by the composite indexes on the models
+OBSOLETE_INDEXES = {
+    'events': ('ix_events_scid', 'ix_events_status'),
+    'breach_history': ('ix_breach_history_scid',),
+}
+
 class Database:
     """Database connection and session management."""
     
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, database_url=None):
         """Initialize database connection.
         
         Args:
-            db_path (str, optional): Path to the database file. If not provided,
+            db_path (str, optional): Path to a SQLite database file. If not provided,
                                    will use the path from Config.
+            database_url (str, optional): SQLAlchemy URL of the database. If neither
+                                   argument is provided, DATABASE_URL from Config is
+                                   used when set, otherwise the SQLite file.
         """
         self.config = Config()
         self.db_path = db_path or self.config.get_database_path()
+        self.database_url = database_url or (None if db_path else self.config.get_database_url())
+        if not self.database_url:
+            self.database_url = f'sqlite:///{self.db_path}'
         self.engine = None
         self.session_factory = None
         self.Session = None
@@ -30,27 +46,97 @@ class Database:
     def init_app(self):
         """Initialize database connection."""
         try:
-            # Ensure database directory exists
-            db_dir = os.path.dirname(self.db_path)
-            if not os.path.exists(db_dir):
-                os.makedirs(db_dir)
+            # Ensure the SQLite database directory exists
+            url = make_url(self.database_url)
+            if url.get_backend_name() == 'sqlite' and url.database:
+                db_dir = os.path.dirname(url.database)
+                if db_dir and not os.path.exists(db_dir):
+                    os.makedirs(db_dir)
             
-            # Create engine
-            self.engine = create_engine(f'sqlite:///{self.db_path}')
+            # Create engine with connection tuning and pooling from config
+            self.engine = create_database_engine(self.database_url, self.config)
             
             # Create session factory
             self.session_factory = sessionmaker(bind=self.engine)
             self.Session = scoped_session(self.session_factory)
             
+            # Import models so their tables are registered before creating them
+            import app.models  # noqa: F401
+            
             # Create tables
             Base.metadata.create_all(self.engine)
             
+            # Events reference payloads by foreign key, so register the configured ones
+            with self.get_session() as session:
+                self._ensure_payloads(session, [payload['scid'] for payload in self.config.get_payloads()])
+                session.commit()
+            
+            # Partition events by time where the backend supports it
+            enable_time_partitioning(self.engine, self.config.get_events_partition_interval())
+            
+            # Bring indexes on tables that already existed up to date
+            self.migrate_indexes()
+            
+            # Backfill derived tables for databases created before they existed
+            self._backfill_rollups()
+            
             logger.info("Database initialized successfully")
             
         except SQLAlchemyError as e:
             logger.error(f"Database initialization failed: {str(e)}")
             raise
     
+    def migrate_indexes(self):
+        """Create missing model indexes and drop superseded ones.
+        
+        create_all only creates indexes for tables it creates, so databases
+        from older versions need this to pick up new composite indexes.
+        
+        Returns:
+            tuple: (created, dropped) lists of index names
+        """
+        inspector = sqlalchemy.inspect(self.engine)
+        created, dropped = [], []
+        
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {index['name'] for index in inspector.get_indexes(table.name)}
+            
+            for index in table.indexes:
+                if index.name not in existing:
+                    logger.info(f"Creating index {index.name} on {table.name}")
+                    index.create(self.engine)
+                    created.append(index.name)
+            
+            for name in OBSOLETE_INDEXES.get(table.name, ()):
+                if name in existing:
+                    logger.info(f"Dropping superseded index {name} on {table.name}")
+                    with self.engine.begin() as conn:
+                        conn.execute(sqlalchemy.text(f"DROP INDEX {name}"))
+                    dropped.append(name)
+        
+        return created, dropped
+    
+    def _backfill_rollups(self):
+        """Rebuild derived tables that are empty while events already exist."""
+        from app.models.event import Event
+        from app.models.rollup import LatestStatus, BreachDailyCount
+        
+        with self.get_session() as session:
+            if session.query(Event.id).first() is None:
+                return
+            latest_empty = session.query(LatestStatus.scid).first() is None
+            counts_empty = session.query(BreachDailyCount.scid).first() is None
+            has_breaches = session.query(Event.id).filter(Event.status == 'BREACH').first() is not None
+        
+        if latest_empty:
+            logger.info("latest_status is empty, backfilling from events")
+            self.rebuild_latest_status()
+        if counts_empty and has_breaches:
+            logger.info("breach_daily_counts is empty, backfilling from events")
+            self.rebuild_breach_counts()
+    
     def get_session(self):
         """Get a new database session."""
         if not self.Session:
@@ -69,29 +155,43 @@ class Database:
         if self.Session:
             self.Session.remove()
     
-    def get_all_triggers(self, limit=25, offset=0, sort_by="timestamp", sort_order="DESC", filters=None):
-        """Get all trigger events with optional filtering and sorting."""
+    def get_all_triggers(self, limit=25, offset=0, sort_by="timestamp", sort_order="DESC", filters=None, cursor=None):
+        """Get all trigger events with optional filtering and sorting.
+        
+        When a keyset ``cursor`` (see app.database.pagination) is given the
+        page starts at that cursor and ``offset`` is ignored.
+        
+        Returns:
+            list: Read-only rows of EVENT_COLUMNS; see event_dicts to convert them
+        """
         try:
             # Import Event model here to avoid circular imports
-            from app.models.event import Event
+            from app.models.event import EVENT_COLUMNS, Event
             
             with self.get_session() as session:
-                query = session.query(Event)
-                
-                # Apply filters
+                # Collect filter conditions
+                conditions = []
                 if filters:
                     if filters.get('scid'):
-                        query = query.filter(Event.scid == filters['scid'])
+                        conditions.append(Event.scid == filters['scid'])
                     if filters.get('metric_type'):
-                        query = query.filter(Event.metric_type == filters['metric_type'])
+                        conditions.append(Event.metric_type == filters['metric_type'])
                     if filters.get('status'):
-                        query = query.filter(Event.status == filters['status'])
+                        conditions.append(Event.status == filters['status'])
                     if filters.get('date_from'):
                         date_from = datetime.datetime.strptime(filters['date_from'], '%Y-%m-%d')
-                        query = query.filter(Event.timestamp >= date_from)
+                        conditions.append(Event.timestamp >= date_from)
                     if filters.get('date_to'):
                         date_to = datetime.datetime.strptime(filters['date_to'], '%Y-%m-%d')
-                        query = query.filter(Event.timestamp < date_to)
+                        conditions.append(Event.timestamp < date_to)
+                
+                if cursor:
+                    query, backwards = apply_keyset(select(*EVENT_COLUMNS), Event, sort_by, sort_order,
+                                                    cursor, conditions)
+                    events = session.execute(query.limit(limit)).all()
+                    return events[::-1] if backwards else events
+                
+                query = select(*EVENT_COLUMNS).where(*conditions)
                 
                 # Apply sorting
                 sort_column = getattr(Event, sort_by)
@@ -103,7 +203,7 @@ class Database:
                 # Apply pagination
                 query = query.limit(limit).offset(offset)
                 
-                return query.all()
+                return session.execute(query).all()
         except Exception as e:
             logger.error(f"Error fetching triggers: {str(e)}", exc_info=True)
             raise
@@ -138,32 +238,14 @@ class Database:
             raise
     
     def get_breach_counts(self, filters=None):
-        """Get count of breaches by payload and metric type."""
+        """Get count of breaches by payload and metric type.
+        
+        Sums the daily buckets in breach_daily_counts instead of scanning
+        BREACH events. Date filters are whole days, so the result is exact.
+        """
         try:
-            # Import Event model here to avoid circular imports
-            from app.models.event import Event
-            
             with self.get_session() as session:
-                # Convert scid to integer for proper key matching with status_matrix
-                query = session.query(
-                    Event.scid.cast(type_=sqlalchemy.Integer).label('scid'),  # Cast to integer
-                    Event.metric_type,
-                    func.count(Event.id).label('count')
-                ).filter(Event.status == 'BREACH')
-                
-                # Apply date filters
-                if filters:
-                    if filters.get('date_from'):
-                        date_from = datetime.datetime.strptime(filters['date_from'], '%Y-%m-%d')
-                        query = query.filter(Event.timestamp >= date_from)
-                    if filters.get('date_to'):
-                        date_to = datetime.datetime.strptime(filters['date_to'], '%Y-%m-%d')
-                        query = query.filter(Event.timestamp < date_to)
-                
-                query = query.group_by(Event.scid, Event.metric_type)
-                
-                # Execute query and convert results to list of named tuples
-                results = query.all()
+                results = self.breach_counts_query(session, filters).all()
                 logger.info(f"Found {len(results)} breach count results")
                 
                 return results
@@ -171,54 +253,239 @@ class Database:
             logger.error(f"Error getting breach counts: {str(e)}", exc_info=True)
             raise
     
+    def breach_counts_query(self, session, filters=None):
+        """Build the query that sums daily breach buckets per payload and metric."""
+        from app.models.rollup import BreachDailyCount
+        
+        query = session.query(
+            BreachDailyCount.scid,
+            BreachDailyCount.metric_type,
+            func.sum(BreachDailyCount.count).label('count')
+        )
+        
+        # Apply date filters
+        if filters:
+            if filters.get('date_from'):
+                date_from = datetime.datetime.strptime(filters['date_from'], '%Y-%m-%d').date()
+                query = query.filter(BreachDailyCount.day >= date_from)
+            if filters.get('date_to'):
+                date_to = datetime.datetime.strptime(filters['date_to'], '%Y-%m-%d').date()
+                query = query.filter(BreachDailyCount.day < date_to)
+        
+        return query.group_by(BreachDailyCount.scid, BreachDailyCount.metric_type)
+    
+    def _breach_counts_from_events(self, since=None):
+        """Select breach counts per payload, metric and day from the events table."""
+        from app.models.event import Event
+        
+        day = func.date(Event.timestamp)
+        query = select(
+            Event.scid,
+            Event.metric_type,
+            day.label('day'),
+            func.count(Event.id).label('count')
+        ).where(Event.status == 'BREACH')
+        if since:
+            query = query.where(Event.timestamp >= datetime.datetime.combine(since, datetime.time()))
+        return query.group_by(Event.scid, Event.metric_type, day)
+    
+    def rebuild_breach_counts(self, since=None):
+        """Rebuild the breach_daily_counts table from the events table.
+        
+        Args:
+            since (date, optional): Only rebuild buckets from this day on, so
+                                    counts for days whose raw events were
+                                    removed by retention are kept
+        
+        Returns:
+            int: Number of daily buckets written
+        """
+        try:
+            from app.models.rollup import BreachDailyCount
+            
+            with self.get_session() as session:
+                stale = delete(BreachDailyCount)
+                if since:
+                    stale = stale.where(BreachDailyCount.day >= since)
+                session.execute(stale)
+                session.execute(insert(BreachDailyCount).from_select(
+                    ['scid', 'metric_type', 'day', 'count'],
+                    self._breach_counts_from_events(since)
+                ))
+                session.commit()
+                count = session.query(BreachDailyCount).count()
+            
+            logger.info(f"Rebuilt breach_daily_counts with {count} rows")
+            return count
+        except Exception as e:
+            logger.error(f"Error rebuilding breach counts: {str(e)}", exc_info=True)
+            raise
+    
+    def check_breach_counts(self, since=None):
+        """Compare breach_daily_counts against the events table.
+        
+        Args:
+            since (date, optional): Only compare buckets from this day on
+        
+        Returns:
+            list: Dicts with scid, metric_type, day, expected and actual for
+                  every bucket whose rollup count does not match the events
+        """
+        try:
+            from app.models.rollup import BreachDailyCount
+            
+            with self.get_session() as session:
+                expected = {
+                    (row.scid, row.metric_type, str(row.day)): row.count
+                    for row in session.execute(self._breach_counts_from_events(since))
+                }
+                buckets = session.query(BreachDailyCount)
+                if since:
+                    buckets = buckets.filter(BreachDailyCount.day >= since)
+                actual = {
+                    (row.scid, row.metric_type, row.day.isoformat()): row.count
+                    for row in buckets
+                }
+            
+            mismatches = []
+            for key in sorted(set(expected) | set(actual)):
+                if expected.get(key, 0) != actual.get(key, 0):
+                    scid, metric_type, day = key
+                    mismatches.append({
+                        'scid': scid,
+                        'metric_type': metric_type,
+                        'day': day,
+                        'expected': expected.get(key, 0),
+                        'actual': actual.get(key, 0)
+                    })
+            
+            logger.info(f"Breach count check found {len(mismatches)} mismatched buckets")
+            return mismatches
+        except Exception as e:
+            logger.error(f"Error checking breach counts: {str(e)}", exc_info=True)
+            raise
+    
     def get_latest_statuses(self, filters=None):
-        """Get the latest status for each payload and metric."""
+        """Get the latest status for each payload and metric.
+        
+        Reads the latest_status table maintained by log_triggers, so the cost
+        is proportional to payloads x metrics rather than to the events table.
+        """
         try:
-            # Import Event model here to avoid circular imports
+            with self.get_session() as session:
+                return self.latest_status_query(session, filters).all()
+        except Exception as e:
+            logger.error(f"Error getting latest statuses: {str(e)}", exc_info=True)
+            raise
+    
+    def latest_status_query(self, session, filters=None):
+        """Build the query that reads latest statuses within a date window."""
+        from app.models.rollup import LatestStatus
+        
+        query = session.query(LatestStatus)
+        
+        # Apply date filters
+        if filters:
+            if filters.get('date_from'):
+                date_from = datetime.datetime.strptime(filters['date_from'], '%Y-%m-%d')
+                query = query.filter(LatestStatus.timestamp >= date_from)
+            if filters.get('date_to'):
+                date_to = datetime.datetime.strptime(filters['date_to'], '%Y-%m-%d')
+                query = query.filter(LatestStatus.timestamp < date_to)
+        
+        return query
+    
+    def get_status_cells(self, filters=None):
+        """Get latest statuses and windowed breach counts in one round trip.
+        
+        Args:
+            filters (dict, optional): ``date_from`` and ``date_to`` (YYYY-MM-DD)
+        
+        Returns:
+            list: (scid, metric_type, status, count) rows; latest status rows
+                  have a count of 0 and breach count rows a status of None
+        """
+        try:
+            with self.get_session() as session:
+                return session.execute(self.status_cells_query(filters)).all()
+        except Exception as e:
+            logger.error(f"Error getting status cells: {str(e)}", exc_info=True)
+            raise
+    
+    def status_cells_query(self, filters=None):
+        """Build the UNION ALL of latest statuses and summed daily breach buckets."""
+        from app.models.rollup import BreachDailyCount, LatestStatus
+        
+        statuses = select(
+            LatestStatus.scid,
+            LatestStatus.metric_type,
+            LatestStatus.status,
+            sqlalchemy.literal(0).label('count')
+        )
+        counts = select(
+            BreachDailyCount.scid,
+            BreachDailyCount.metric_type,
+            sqlalchemy.cast(sqlalchemy.null(), LatestStatus.status.type).label('status'),
+            func.sum(BreachDailyCount.count).label('count')
+        )
+        
+        # Apply date filters
+        if filters:
+            if filters.get('date_from'):
+                date_from = datetime.datetime.strptime(filters['date_from'], '%Y-%m-%d')
+                statuses = statuses.where(LatestStatus.timestamp >= date_from)
+                counts = counts.where(BreachDailyCount.day >= date_from.date())
+            if filters.get('date_to'):
+                date_to = datetime.datetime.strptime(filters['date_to'], '%Y-%m-%d')
+                statuses = statuses.where(LatestStatus.timestamp < date_to)
+                counts = counts.where(BreachDailyCount.day < date_to.date())
+        
+        counts = counts.group_by(BreachDailyCount.scid, BreachDailyCount.metric_type)
+        return sqlalchemy.union_all(statuses, counts)
+    
+    def rebuild_latest_status(self):
+        """Rebuild the latest_status table from the events table.
+        
+        Returns:
+            int: Number of latest status rows written
+        """
+        try:
+            # Import models here to avoid circular imports
             from app.models.event import Event
+            from app.models.rollup import LatestStatus
+            
+            # Rank each payload/metric's events newest first, ties broken by id
+            ranked = select(
+                Event.scid,
+                Event.metric_type,
+                Event.id.label('event_id'),
+                Event.value,
+                Event.threshold,
+                Event.status,
+                Event.timestamp,
+                func.row_number().over(
+                    partition_by=(Event.scid, Event.metric_type),
+                    order_by=(Event.timestamp.desc(), Event.id.desc())
+                ).label('rank')
+            ).subquery()
+            
+            columns = ['scid', 'metric_type', 'event_id', 'value', 'threshold', 'status', 'timestamp']
+            latest = select(*[ranked.c[name] for name in columns]).where(ranked.c.rank == 1)
             
             with self.get_session() as session:
-                # Subquery to get the latest timestamp for each scid and metric_type
-                latest_timestamps = session.query(
-                    Event.scid.cast(type_=sqlalchemy.Integer).label('scid'),  # Cast to integer
-                    Event.metric_type,
-                    func.max(Event.timestamp).label('max_timestamp')
-                ).group_by(Event.scid, Event.metric_type).subquery()
-                
-                # Main query to get the latest status
-                query = session.query(Event).join(
-                    latest_timestamps,
-                    (Event.scid == latest_timestamps.c.scid) &
-                    (Event.metric_type == latest_timestamps.c.metric_type) &
-                    (Event.timestamp == latest_timestamps.c.max_timestamp)
-                )
-                
-                # Apply date filters
-                if filters:
-                    if filters.get('date_from'):
-                        date_from = datetime.datetime.strptime(filters['date_from'], '%Y-%m-%d')
-                        query = query.filter(Event.timestamp >= date_from)
-                    if filters.get('date_to'):
-                        date_to = datetime.datetime.strptime(filters['date_to'], '%Y-%m-%d')
-                        query = query.filter(Event.timestamp < date_to)
-                
-                events = query.all()
-                
-                # Ensure scid is an integer where possible
-                for event in events:
-                    try:
-                        event.scid = int(event.scid)
-                    except (ValueError, TypeError):
-                        # Keep as is if not convertible
-                        pass
-                
-                return events
+                session.execute(delete(LatestStatus))
+                session.execute(insert(LatestStatus).from_select(columns, latest))
+                session.commit()
+                count = session.query(LatestStatus).count()
+            
+            logger.info(f"Rebuilt latest_status with {count} rows")
+            return count
         except Exception as e:
-            logger.error(f"Error getting latest statuses: {str(e)}", exc_info=True)
+            logger.error(f"Error rebuilding latest status: {str(e)}", exc_info=True)
             raise
     
     def log_trigger(self, scid, metric_type, timestamp, value, threshold, status):
-        """Log a trigger event to the database.
+        """Log a single trigger event to the database.
         
         Args:
             scid (str): Spacecraft ID
@@ -228,40 +495,169 @@ class Database:
             threshold (float): Threshold value
             status (str): Event status
         """
+        self.log_triggers([{
+            'scid': scid,
+            'metric_type': metric_type,
+            'timestamp': timestamp,
+            'value': value,
+            'threshold': threshold,
+            'status': status
+        }])
+    
+    def log_triggers(self, results):
+        """Log a batch of trigger events to the database in one transaction.
+        
+        Events are inserted with a single executemany, and the BreachHistory
+        rows for any breaches are inserted against the returned event IDs
+        before the one commit.
+        
+        Args:
+            results (list): List of dicts with scid, metric_type, timestamp,
+                            value, threshold and status keys
+        
+        Returns:
+            int: Number of events written
+        """
+        if not results:
+            return 0
+        
         try:
-            # Import Event model here to avoid circular imports
-            from app.models.event import Event
-            
             with self.get_session() as session:
-                event = Event(
-                    scid=scid,
-                    metric_type=metric_type,
-                    timestamp=timestamp,
-                    value=value,
-                    threshold=threshold,
-                    status=status
-                )
-                session.add(event)
+                count, breaches = self.insert_triggers(session, results)
                 session.commit()
-                
-                # If this is a breach, also log to breach history
-                if status == 'BREACH':
-                    from app.models.event import BreachHistory
-                    breach = BreachHistory(
-                        event_id=event.id,
-                        scid=scid,
-                        metric_type=metric_type,
-                        value=value,
-                        threshold=threshold,
-                        timestamp=timestamp
-                    )
-                    session.add(breach)
-                    session.commit()
-                
-                logger.info(f"Logged trigger: {scid} {metric_type} {status}")
+            
+            # Invalidate cached reads in every process
+            bump_generation()
+            
+            logger.info(f"Logged {count} triggers ({breaches} breaches) in one transaction")
+            return count
         except Exception as e:
-            logger.error(f"Error logging trigger: {str(e)}", exc_info=True)
+            logger.error(f"Error logging triggers: {str(e)}", exc_info=True)
             raise
+    
+    def insert_triggers(self, session, results):
+        """Insert a batch of trigger events and their derived rows without committing.
+        
+        Lets callers commit the events together with their own bookkeeping;
+        they are responsible for calling bump_generation after the commit.
+        
+        Args:
+            session (Session): Session the rows are added to
+            results (list): List of dicts with scid, metric_type, timestamp,
+                            value, threshold and status keys
+        
+        Returns:
+            tuple: (events inserted, breaches among them)
+        """
+        # Import models here to avoid circular imports
+        from app.models.event import Event, BreachHistory
+        
+        rows = [{
+            'scid': result['scid'],
+            'metric_type': result['metric_type'],
+            'timestamp': result['timestamp'],
+            'value': result['value'],
+            'threshold': result['threshold'],
+            'status': result['status']
+        } for result in results]
+        
+        self._ensure_payloads(session, {row['scid'] for row in rows})
+        event_ids = session.scalars(
+            insert(Event).returning(Event.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        
+        breaches = [{
+            'event_id': event_id,
+            'scid': row['scid'],
+            'metric_type': row['metric_type'],
+            'value': row['value'],
+            'threshold': row['threshold'],
+            'timestamp': row['timestamp']
+        } for event_id, row in zip(event_ids, rows) if row['status'] == 'BREACH']
+        
+        if breaches:
+            session.execute(insert(BreachHistory), breaches)
+        
+        self._upsert_latest_status(session, event_ids, rows)
+        self._increment_breach_counts(session, breaches)
+        return len(rows), len(breaches)
+    
+    def _upsert(self, model):
+        """Create an INSERT ... ON CONFLICT statement for the current backend."""
+        if self.engine.dialect.name == 'postgresql':
+            return postgresql.insert(model)
+        return sqlite.insert(model)
+    
+    def _ensure_payloads(self, session, scids):
+        """Insert payload rows for spacecraft IDs that do not have one yet.
+        
+        events.scid and breach_history.scid are foreign keys to payloads,
+        which PostgreSQL enforces. Payloads missing from the configuration
+        (e.g. in spooled result files) get a placeholder name.
+        
+        Args:
+            session (Session): Session the rows are added to
+            scids (iterable): Spacecraft IDs about to be referenced
+        """
+        from app.models.payload import Payload
+        
+        names = self.config.get_payload_names()
+        rows = [
+            {'scid': scid, 'name': names.get(str(scid), f"Unknown ({scid})")}
+            for scid in sorted(set(scids))
+        ]
+        if rows:
+            stmt = self._upsert(Payload).on_conflict_do_nothing(index_elements=[Payload.scid])
+            session.execute(stmt, rows)
+    
+    def _upsert_latest_status(self, session, event_ids, rows):
+        """Upsert the newest event per payload/metric into latest_status."""
+        from app.models.rollup import LatestStatus
+        
+        latest = {}
+        for event_id, row in zip(event_ids, rows):
+            key = (row['scid'], row['metric_type'])
+            current = latest.get(key)
+            if current is None or (row['timestamp'], event_id) >= (current['timestamp'], current['event_id']):
+                latest[key] = {**row, 'event_id': event_id}
+        
+        stmt = self._upsert(LatestStatus)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LatestStatus.scid, LatestStatus.metric_type],
+            set_={
+                'event_id': stmt.excluded.event_id,
+                'value': stmt.excluded.value,
+                'threshold': stmt.excluded.threshold,
+                'status': stmt.excluded.status,
+                'timestamp': stmt.excluded.timestamp
+            },
+            # Never let an older, late-arriving result replace a newer one
+            where=LatestStatus.timestamp <= stmt.excluded.timestamp
+        )
+        session.execute(stmt, list(latest.values()))
+    
+    def _increment_breach_counts(self, session, breaches):
+        """Add a batch's breaches to their daily buckets in breach_daily_counts."""
+        from app.models.rollup import BreachDailyCount
+        
+        if not breaches:
+            return
+        
+        buckets = {}
+        for breach in breaches:
+            key = (breach['scid'], breach['metric_type'], breach['timestamp'].date())
+            buckets[key] = buckets.get(key, 0) + 1
+        
+        stmt = self._upsert(BreachDailyCount)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BreachDailyCount.scid, BreachDailyCount.metric_type, BreachDailyCount.day],
+            set_={'count': BreachDailyCount.count + stmt.excluded.count}
+        )
+        session.execute(stmt, [
+            {'scid': scid, 'metric_type': metric_type, 'day': day, 'count': count}
+            for (scid, metric_type, day), count in buckets.items()
+        ])
 
 # Create a singleton instance
 db = Database()
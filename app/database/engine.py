@@ -0,0 +1,124 @@
+"""SQLAlchemy engine construction and per-connection tuning."""
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from app.utils import get_logger
+
+# Initialize logger
+logger = get_logger('database.engine')
+
+def create_database_engine(url, config):
+    """Create an engine for any supported backend.
+    
+    SQLite URLs get the tuned engine from create_sqlite_engine; server
+    databases (e.g. PostgreSQL/TimescaleDB) get a pre-pinged connection pool.
+    
+    Args:
+        url (str): SQLAlchemy database URL
+        config (Config): Application configuration
+        
+    Returns:
+        Engine: Configured SQLAlchemy engine
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == 'sqlite':
+        return create_sqlite_engine(parsed.database, config)
+    
+    engine = create_engine(
+        url,
+        pool_size=config.get_database_pool_size(),
+        max_overflow=config.get_database_pool_overflow(),
+        pool_pre_ping=True
+    )
+    logger.info(f"Created {parsed.get_backend_name()} engine for {parsed.render_as_string(hide_password=True)}")
+    return engine
+
+def create_sqlite_engine(db_path, config):
+    """Create a SQLite engine tuned for one writer and many reader threads.
+    
+    Every pooled connection gets the PRAGMAs from ``Config.get_sqlite_pragmas``
+    (WAL journaling by default, so readers do not block the monitor's writes),
+    and connections may be shared across Flask and monitor threads.
+    
+    Args:
+        db_path (str): Path to the database file
+        config (Config): Application configuration
+        
+    Returns:
+        Engine: Configured SQLAlchemy engine
+    """
+    pragmas = config.get_sqlite_pragmas()
+    
+    engine = create_engine(
+        f'sqlite:///{db_path}',
+        poolclass=QueuePool,
+        pool_size=config.get_database_pool_size(),
+        max_overflow=config.get_database_pool_overflow(),
+        connect_args={
+            'check_same_thread': False,
+            # sqlite3 waits this long for a lock before raising "database is locked"
+            'timeout': pragmas['busy_timeout'] / 1000
+        }
+    )
+    
+    @event.listens_for(engine, 'connect')
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+    
+    logger.info(f"Created SQLite engine for {db_path} with pragmas {pragmas}")
+    return engine
+
+def enable_time_partitioning(engine, interval):
+    """Turn the events table into a TimescaleDB hypertable partitioned by time.
+    
+    Only applies to PostgreSQL with the timescaledb extension available, and
+    only while the events table is still empty. TimescaleDB requires the
+    partition column in every unique constraint, so the primary key becomes
+    (id, timestamp) and the breach_history -> events foreign key is dropped;
+    event IDs stay unique through their sequence.
+    
+    Args:
+        engine (Engine): Database engine
+        interval (str): Chunk width as a PostgreSQL interval, e.g. '7 days'
+        
+    Returns:
+        bool: True if events is (now) a hypertable
+    """
+    if engine.dialect.name != 'postgresql' or not interval:
+        return False
+    
+    with engine.begin() as conn:
+        available = conn.execute(text(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'"
+        )).first()
+        if not available:
+            logger.info("timescaledb extension not available, events stay a plain table")
+            return False
+        
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS timescaledb"))
+        already = conn.execute(text(
+            "SELECT 1 FROM timescaledb_information.hypertables WHERE hypertable_name = 'events'"
+        )).first()
+        if already:
+            return True
+        
+        if conn.execute(text("SELECT 1 FROM events LIMIT 1")).first():
+            logger.warning("events already has rows; convert it with create_hypertable(..., migrate_data => true) manually")
+            return False
+        
+        conn.execute(text("ALTER TABLE breach_history DROP CONSTRAINT IF EXISTS breach_history_event_id_fkey"))
+        conn.execute(text("ALTER TABLE events DROP CONSTRAINT IF EXISTS events_pkey"))
+        conn.execute(text("ALTER TABLE events ADD PRIMARY KEY (id, timestamp)"))
+        conn.execute(
+            text("SELECT create_hypertable('events', 'timestamp', chunk_time_interval => CAST(:interval AS INTERVAL))"),
+            {'interval': interval}
+        )
+    
+    logger.info(f"events is now a hypertable with {interval} chunks")
+    return True
@@ -0,0 +1,177 @@
+"""Keyset (cursor) pagination helpers for list queries.
+
+Pages are addressed by the (sort column, id) of a boundary row instead of an
+offset, so fetching a deep page costs the same as fetching the first one.
+Cursors are opaque URL-safe tokens that also record the sort they belong to.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+from sqlalchemy import tuple_
+
+# Columns that can be used as the primary sort key of a keyset page
+SORTABLE_COLUMNS = ('timestamp', 'scid', 'metric_type', 'value', 'threshold', 'status')
+
+# Page size used when a request does not ask for one
+DEFAULT_PAGE_SIZE = 25
+
+# Largest number of rows a single page may return
+MAX_PAGE_SIZE = 1000
+
+def clamp_page_size(page_size):
+    """Limit a requested page size to 1..MAX_PAGE_SIZE.
+
+    Args:
+        page_size (int): Requested page size
+
+    Returns:
+        int: Page size within bounds
+    """
+    return max(1, min(int(page_size), MAX_PAGE_SIZE))
+
+def encode_cursor(sort_by, sort_order, value, row_id, direction):
+    """Encode a page boundary as an opaque cursor token.
+
+    Args:
+        sort_by (str): Sort column name
+        sort_order (str): 'ASC' or 'DESC'
+        value: Sort column value of the boundary row
+        row_id (int): ID of the boundary row
+        direction (str): 'next' to read past the row, 'prev' to read before it
+
+    Returns:
+        str: Cursor token
+    """
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+    payload = json.dumps({
+        's': sort_by,
+        'o': sort_order.upper(),
+        'v': value,
+        'id': row_id,
+        'd': direction
+    }, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(token, sort_by, sort_order):
+    """Decode a cursor token produced by encode_cursor.
+
+    Args:
+        token (str): Cursor token
+        sort_by (str): Sort column the current request uses
+        sort_order (str): Sort order the current request uses
+
+    Returns:
+        tuple: (value, row_id, direction)
+
+    Raises:
+        ValueError: If the token is malformed or was issued for another sort
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, row_id, direction = data['v'], int(data['id']), data['d']
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+
+    if data.get('s') != sort_by or data.get('o') != sort_order.upper() or direction not in ('next', 'prev'):
+        raise ValueError("Cursor does not match the requested sort order")
+
+    if sort_by == 'timestamp':
+        value = datetime.datetime.fromisoformat(value)
+    return value, row_id, direction
+
+def apply_keyset(query, model, sort_by, sort_order, cursor=None, conditions=()):
+    """Filter and order a query so it starts at a cursor.
+
+    Args:
+        query: Unfiltered ORM query or Core select over ``model``
+        model: Mapped class with an ``id`` column
+        sort_by (str): Sort column name
+        sort_order (str): 'ASC' or 'DESC'
+        cursor (str, optional): Cursor token, None for the first page
+        conditions (iterable): Filter conditions. They are added after the
+                               cursor bound because SQLite seeks the index on
+                               the first bound it sees for a column.
+
+    Returns:
+        tuple: (query, backwards) where backwards is True when the query
+               reads towards the start and its rows must be reversed
+    """
+    if sort_by not in SORTABLE_COLUMNS:
+        raise ValueError(f"Invalid sort column: {sort_by}")
+
+    sort_column = getattr(model, sort_by)
+    backwards = False
+    descending = sort_order.upper() == 'DESC'
+
+    if cursor:
+        value, row_id, direction = decode_cursor(cursor, sort_by, sort_order)
+        backwards = direction == 'prev'
+
+    # Reading backwards flips the scan direction of the index
+    scan_descending = descending != backwards
+
+    if cursor:
+        # The plain column bound lets the planner seek the index to the cursor;
+        # the row-value comparison then skips ties already shown
+        key = tuple_(sort_column, model.id)
+        if scan_descending:
+            query = query.filter(sort_column <= value, key < (value, row_id))
+        else:
+            query = query.filter(sort_column >= value, key > (value, row_id))
+
+    if conditions:
+        query = query.filter(*conditions)
+
+    if scan_descending:
+        query = query.order_by(sort_column.desc(), model.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), model.id.asc())
+
+    return query, backwards
+
+def paginate_keyset(query, model, sort_by, sort_order, page_size, cursor=None, conditions=(), session=None):
+    """Fetch one keyset page and the cursors for its neighbours.
+
+    Args:
+        query: Unfiltered ORM query or Core select over ``model``; a select
+               must include the sort column and ``id``
+        model: Mapped class with an ``id`` column
+        sort_by (str): Sort column name
+        sort_order (str): 'ASC' or 'DESC'
+        page_size (int): Number of rows per page, clamped to 1..MAX_PAGE_SIZE
+        cursor (str, optional): Cursor token, None for the first page
+        conditions (iterable): Filter conditions, see apply_keyset
+        session (Session, optional): Session to execute a Core select in
+
+    Returns:
+        tuple: (rows, next_cursor, prev_cursor); a cursor is None when there
+               is no page in that direction
+    """
+    page_size = clamp_page_size(page_size)
+    query, backwards = apply_keyset(query, model, sort_by, sort_order, cursor, conditions)
+
+    # Read one extra row to learn whether another page follows
+    query = query.limit(page_size + 1)
+    rows = session.execute(query).all() if session is not None else query.all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if backwards:
+        rows.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, cursor is not None
+
+    next_cursor = prev_cursor = None
+    if rows and has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_by, sort_order, getattr(last, sort_by), last.id, 'next')
+    if rows and has_prev:
+        first = rows[0]
+        prev_cursor = encode_cursor(sort_by, sort_order, getattr(first, sort_by), first.id, 'prev')
+
+    return rows, next_cursor, prev_cursor
@@ -2,5 +2,7 @@
 
 from .event import Event, BreachHistory
 from .payload import Payload
+from .rollup import LatestStatus, BreachDailyCount, EventHourlyRollup
+from .ingest import IngestManifest
 
-__all__ = ['Event', 'BreachHistory', 'Payload'] 
\ No newline at end of file
+__all__ = ['Event', 'BreachHistory', 'Payload', 'LatestStatus', 'BreachDailyCount', 'EventHourlyRollup', 'IngestManifest'] 
@@ -7,13 +7,23 @@ class Event(Base):
     """Event model for storing monitoring events."""
     
     __tablename__ = 'events'
+    __table_args__ = (
+        # Per payload/metric history and latest-status rebuilds
+        Index('ix_events_scid_metric_timestamp', 'scid', 'metric_type', 'timestamp'),
+        # Per payload event lists over a date range
+        Index('ix_events_scid_timestamp', 'scid', 'timestamp'),
+        # Status filters (e.g. all breaches) over a date range
+        Index('ix_events_status_timestamp', 'status', 'timestamp'),
+        # Breach history charts; covers the value/threshold columns they read
+        Index('ix_events_breach_lookup', 'scid', 'metric_type', 'status', 'timestamp', 'value', 'threshold'),
+    )
     
     id = Column(Integer, primary_key=True)
-    scid = Column(Integer, ForeignKey('payloads.scid'), nullable=False, index=True)
+    scid = Column(Integer, ForeignKey('payloads.scid'), nullable=False)
     metric_type = Column(String(50), nullable=False, index=True)
     value = Column(Float, nullable=False)
     threshold = Column(Float, nullable=False)
-    status = Column(String(20), nullable=False, index=True)
+    status = Column(String(20), nullable=False)
     timestamp = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
     
     # Define relationships
@@ -35,14 +45,40 @@ class Event(Base):
             'timestamp': self.timestamp.isoformat() if self.timestamp else None
         }
 
+# Columns of Event.to_dict(), for read-only list queries that select them with
+# SQLAlchemy Core instead of loading Event instances
+EVENT_COLUMNS = (Event.id, Event.scid, Event.metric_type, Event.value, Event.threshold, Event.status, Event.timestamp)
+
+def event_dicts(rows):
+    """Convert rows of EVENT_COLUMNS into the dicts Event.to_dict() returns.
+    
+    Args:
+        rows (iterable): Rows selected with EVENT_COLUMNS, in that order
+    
+    Returns:
+        list: Event dicts with ISO 8601 timestamps
+    """
+    return [{
+        'id': event_id,
+        'scid': scid,
+        'metric_type': metric_type,
+        'value': value,
+        'threshold': threshold,
+        'status': status,
+        'timestamp': timestamp.isoformat() if timestamp else None
+    } for event_id, scid, metric_type, value, threshold, status, timestamp in rows]
+
 class BreachHistory(Base):
     """Breach history model for storing breach events."""
     
     __tablename__ = 'breach_history'
+    __table_args__ = (
+        Index('ix_breach_history_scid_metric_timestamp', 'scid', 'metric_type', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True)
-    event_id = Column(Integer, ForeignKey('events.id'), nullable=False)
-    scid = Column(Integer, ForeignKey('payloads.scid'), nullable=False, index=True)
+    event_id = Column(Integer, ForeignKey('events.id'), nullable=False, index=True)
+    scid = Column(Integer, ForeignKey('payloads.scid'), nullable=False)
     metric_type = Column(String(50), nullable=False, index=True)
     value = Column(Float, nullable=False)
     threshold = Column(Float, nullable=False)
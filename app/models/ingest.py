@@ -0,0 +1,38 @@
+"""Bookkeeping for files ingested from the spool directory."""
+
+from sqlalchemy import Column, BigInteger, String, DateTime
+from app.database.base import Base
+
+class IngestManifest(Base):
+    """One row per spool file, keyed by content hash so each file is loaded exactly once.
+    
+    ``rows_loaded`` is advanced in the same transaction as each chunk of
+    events, so an interrupted load resumes after the last committed chunk.
+    """
+    
+    __tablename__ = 'ingest_manifest'
+    
+    sha256 = Column(String(64), primary_key=True)
+    file_name = Column(String(255), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    rows_loaded = Column(BigInteger, nullable=False, default=0)
+    status = Column(String(20), nullable=False)  # LOADING, DONE or FAILED
+    error = Column(String(500))
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime)
+    
+    def __repr__(self):
+        return f"<IngestManifest(file_name='{self.file_name}', status='{self.status}')>"
+    
+    def to_dict(self):
+        """Convert manifest entry to dictionary."""
+        return {
+            'sha256': self.sha256,
+            'file_name': self.file_name,
+            'size': self.size,
+            'rows_loaded': self.rows_loaded,
+            'status': self.status,
+            'error': self.error,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
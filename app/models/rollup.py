@@ -0,0 +1,88 @@
+"""Derived tables maintained during event ingestion."""
+
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Index
+from app.database.base import Base
+
+class LatestStatus(Base):
+    """Most recent event for each payload and metric, upserted on ingest."""
+    
+    __tablename__ = 'latest_status'
+    
+    scid = Column(Integer, primary_key=True)
+    metric_type = Column(String(50), primary_key=True)
+    event_id = Column(Integer, nullable=False)
+    value = Column(Float, nullable=False)
+    threshold = Column(Float, nullable=False)
+    status = Column(String(20), nullable=False)
+    timestamp = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<LatestStatus(scid='{self.scid}', metric_type='{self.metric_type}', status='{self.status}')>"
+    
+    def to_dict(self):
+        """Convert latest status to dictionary."""
+        return {
+            'scid': self.scid,
+            'metric_type': self.metric_type,
+            'event_id': self.event_id,
+            'value': self.value,
+            'threshold': self.threshold,
+            'status': self.status,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None
+        }
+
+class BreachDailyCount(Base):
+    """Number of breaches per payload, metric and day, incremented on ingest."""
+    
+    __tablename__ = 'breach_daily_counts'
+    __table_args__ = (
+        # Date-window sums read only this index
+        Index('ix_breach_daily_counts_day', 'day', 'scid', 'metric_type', 'count'),
+    )
+    
+    scid = Column(Integer, primary_key=True)
+    metric_type = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<BreachDailyCount(scid='{self.scid}', metric_type='{self.metric_type}', day='{self.day}', count={self.count})>"
+    
+    def to_dict(self):
+        """Convert breach daily count to dictionary."""
+        return {
+            'scid': self.scid,
+            'metric_type': self.metric_type,
+            'day': self.day.isoformat() if self.day else None,
+            'count': self.count
+        }
+
+class EventHourlyRollup(Base):
+    """Downsampled events per payload, metric and hour, kept after raw events expire."""
+    
+    __tablename__ = 'event_hourly_rollups'
+    
+    scid = Column(Integer, primary_key=True)
+    metric_type = Column(String(50), primary_key=True)
+    hour = Column(DateTime, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    breach_count = Column(Integer, nullable=False, default=0)
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+    sum_value = Column(Float, nullable=False)
+    
+    def __repr__(self):
+        return f"<EventHourlyRollup(scid='{self.scid}', metric_type='{self.metric_type}', hour='{self.hour}')>"
+    
+    def to_dict(self):
+        """Convert hourly rollup to dictionary."""
+        return {
+            'scid': self.scid,
+            'metric_type': self.metric_type,
+            'hour': self.hour.isoformat() if self.hour else None,
+            'count': self.count,
+            'breach_count': self.breach_count,
+            'min': self.min_value,
+            'max': self.max_value,
+            'mean': self.sum_value / self.count if self.count else None
+        }
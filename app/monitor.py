@@ -0,0 +1,79 @@
+"""Dedicated monitor process.
+
+Runs every metric on its own fixed-rate schedule (see
+app.services.scheduler) and writes the results to the database. Web
+workers learn about new data through the ingestion generation, so exactly
+one monitor runs however many web workers serve requests:
+
+    python -m app.monitor [--once] [--no-logging]
+"""
+
+import argparse
+from app import create_app
+from app.config import get_config
+from app.database import get_db
+from app.services.matlab_interface import get_matlab
+from app.services.ingest_service import get_ingest_service
+from app.services.retention_service import get_retention_service
+from app.services.scheduler import get_scheduler
+from app.utils import get_logger
+from app.utils.logger import Logger
+
+# Initialize logger
+logger = get_logger('monitor')
+
+def run_cycle():
+    """Run every metric once and log the results in a single transaction.
+    
+    Returns:
+        list: Monitoring results
+    """
+    logger.info("Running scheduled metrics check")
+    results = get_matlab().monitor_all_metrics()
+    
+    # Log results to database in a single transaction
+    get_db().log_triggers(results)
+    
+    logger.info(f"Monitored {len(results)} metrics, found {sum(1 for r in results if r['status'] == 'BREACH')} breaches")
+    return results
+
+def run_forever(stop_event=None):
+    """Run every metric on its schedule until ``stop_event`` is set.
+    
+    Args:
+        stop_event (threading.Event, optional): Set to stop scheduling new runs
+    """
+    get_scheduler().run(stop_event)
+
+def main(argv=None):
+    """Entry point for ``python -m app.monitor``."""
+    parser = argparse.ArgumentParser(description='ASTRA monitor process')
+    parser.add_argument('--once', action='store_true', help='Run a single monitoring cycle and exit')
+    parser.add_argument('--no-logging', action='store_true', help='Disable all logging')
+    args = parser.parse_args(argv)
+    
+    if args.no_logging:
+        Logger.set_enabled(False)
+    
+    # Initializes the database and the shared cache the generation is published through
+    create_app()
+    
+    if args.once:
+        run_cycle()
+        return
+    
+    config = get_config()
+    if config.is_retention_enabled():
+        get_retention_service().start()
+    if config.is_spool_enabled():
+        get_ingest_service().start()
+    
+    try:
+        run_forever()
+    except KeyboardInterrupt:
+        logger.info("Monitor stopped")
+    finally:
+        get_matlab().cancel_running_scripts()
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,25 @@
-from flask import Blueprint, jsonify, request
-from app.services import get_event_service, get_monitor_service
+import queue
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from app.services import get_event_service, get_export_service, get_monitor_service, get_status_broker
+from app.services.export_service import EXPORT_CHUNK_SIZE, EXPORT_FORMATS
 from app.utils import get_logger
+from app.utils.json_provider import dumps
 from app.utils.logger import Logger
 from .utils import (
-    get_matlab, parse_filter_params, parse_pagination_params,
+    cached_json, get_matlab, parse_filter_params, parse_pagination_params, parse_cursor_params,
     parse_sort_params, handle_error, validate_required_params
 )
-from app.config import Config
+from app.config import get_config
 
 # Initialize logger
 logger = get_logger('api')
 
+# Seconds between keepalive comments on an idle event stream
+STREAM_KEEPALIVE = 15
+
+# Seconds a client refused past STREAM_MAX_CONNECTIONS should wait before retrying
+STREAM_RETRY_AFTER = 30
+
 # Create blueprint
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
@@ -65,49 +74,110 @@ def toggle_logging():
         return handle_error(e)
 
 @api_bp.route('/events')
+@cached_json()
 def get_events():
-    """Get events in JSON format."""
+    """Get events in JSON format.
+    
+    Pages are numbered (``page``, offset pagination) unless the request
+    passes a ``cursor`` token or ``paginate=cursor``; those pages are
+    addressed with opaque cursor tokens (keyset pagination) and
+    ``count=exact`` adds a total count.
+    """
     try:
-        # Get filters, pagination, and sorting parameters using utility functions
+        # Get filters and sorting parameters using utility functions
         filters = parse_filter_params(request)
-        page, page_size = parse_pagination_params(request)
         sort_by, sort_order = parse_sort_params(request)
         
-        logger.info(f"API events request: page={page}, sort_by={sort_by}, sort_order={sort_order}, filters={filters}")
-        
-        # Get events from event service
-        result = get_event_service().get_events(
-            page=page,
-            page_size=page_size,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            filters=filters
-        )
-        
         # Map payload IDs to names for better display
-        payloads = {str(p['scid']): p['name'] for p in Config().get_payloads()}
-        
-        # Enrich event data with payload names
-        for event in result['events']:
-            event['payload_name'] = payloads.get(str(event['scid']), f"Unknown ({event['scid']})")
+        payloads = get_config().get_payload_names()
         
-        return jsonify({
-            'success': True,
-            'data': {
+        if not request.args.get('cursor') and request.args.get('paginate') != 'cursor':
+            page, page_size = parse_pagination_params(request)
+            logger.info(f"API events request: page={page}, sort_by={sort_by}, sort_order={sort_order}, filters={filters}")
+            
+            result = get_event_service().get_events(
+                page=page,
+                page_size=page_size,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                filters=filters
+            )
+            data = {
                 'events': result['events'],
                 'total_pages': result['total_pages'],
                 'total_count': result['total_count'],
-                'page': page,
-                'page_size': page_size,
-                'sort_by': sort_by,
-                'sort_order': sort_order
+                'page': page
             }
+        else:
+            cursor, page_size, include_total = parse_cursor_params(request)
+            logger.info(f"API events request: cursor={cursor}, sort_by={sort_by}, sort_order={sort_order}, filters={filters}")
+            
+            result = get_event_service().get_events_page(
+                cursor=cursor,
+                page_size=page_size,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                filters=filters,
+                include_total=include_total
+            )
+            data = {
+                'events': result['events'],
+                'next_cursor': result['next_cursor'],
+                'prev_cursor': result['prev_cursor'],
+                'total_count': result['total_count']
+            }
+        
+        # Enrich event data with payload names (on copies; cached results are shared)
+        data['events'] = [
+            {**event, 'payload_name': payloads.get(str(event['scid']), f"Unknown ({event['scid']})")}
+            for event in data['events']
+        ]
+        
+        data.update({
+            'page_size': page_size,
+            'sort_by': sort_by,
+            'sort_order': sort_order
         })
+        
+        return jsonify({
+            'success': True,
+            'data': data
+        })
+    except ValueError as e:
+        return handle_error(e, status_code=400)
     except Exception as e:
         logger.error(f"Error fetching events: {str(e)}", exc_info=True)
         return handle_error(e)
 
+@api_bp.route('/events/export')
+def export_events():
+    """Stream every event matching the filters as a file download.
+    
+    ``format`` is ``csv`` (default), ``ndjson``, ``arrow`` or ``parquet``
+    (the last two need pyarrow). Takes the same filters as /api/events;
+    events are returned oldest first and streamed ``chunk_size`` rows at a
+    time, however many match.
+    """
+    try:
+        filters = parse_filter_params(request)
+        fmt = request.args.get('format', 'csv').lower()
+        chunk_size = request.args.get('chunk_size', EXPORT_CHUNK_SIZE, type=int)
+        
+        chunks = get_export_service().export(fmt, filters=filters, chunk_size=chunk_size)
+        
+        mimetype, extension = EXPORT_FORMATS[fmt]
+        filename = f"events_{filters['date_from']}_{filters['date_to']}.{extension}"
+        return Response(stream_with_context(chunks), mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'X-Accel-Buffering': 'no'
+        })
+    except ValueError as e:
+        return handle_error(e, status_code=400)
+    except Exception as e:
+        return handle_error(e)
+
 @api_bp.route('/breach_history')
+@cached_json()
 def get_breach_history():
     """Get breach history for a specific payload and metric."""
     try:
@@ -138,4 +208,87 @@ def get_breach_history():
     except ValueError as e:
         return handle_error(e, status_code=400)
     except Exception as e:
-        return handle_error(e) 
\ No newline at end of file
+        return handle_error(e) 
+
+@api_bp.route('/timeseries')
+@cached_json()
+def get_timeseries():
+    """Get a downsampled value series for a specific payload and metric.
+    
+    ``points`` (default 500) or ``bucket_seconds`` sets the resolution,
+    ``include_normal=true`` adds NORMAL events for context and
+    ``method=lttb`` returns representative raw events instead of
+    min/max/mean buckets.
+    """
+    try:
+        params = {
+            'scid': request.args.get('scid'),
+            'metric_type': request.args.get('metric_type')
+        }
+        validate_required_params(params, ['scid', 'metric_type'])
+        filters = parse_filter_params(request)
+        
+        series = get_event_service().get_timeseries(
+            scid=int(params['scid']),
+            metric_type=params['metric_type'],
+            date_from=filters['date_from'],
+            date_to=filters['date_to'],
+            points=request.args.get('points', 500, type=int),
+            bucket_seconds=request.args.get('bucket_seconds', type=int),
+            include_normal=request.args.get('include_normal', '').lower() in ('true', '1', 'yes'),
+            method=request.args.get('method', 'buckets')
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': series
+        })
+    except ValueError as e:
+        return handle_error(e, status_code=400)
+    except Exception as e:
+        return handle_error(e)
+
+@api_bp.route('/stream')
+def stream():
+    """Stream status matrix updates to the dashboard as Server-Sent Events.
+    
+    Each ``status`` event lists the cells (scid, metric_type, status, count)
+    that changed in the last ingestion cycle for the requested date range.
+    ``since`` is the generation the page was rendered at; if data changed in
+    between, the first event carries every cell.
+    
+    Every open stream holds a worker thread until the browser disconnects,
+    so past STREAM_MAX_CONNECTIONS per process the stream is refused with a
+    503 and the dashboard falls back to its rendered state until it retries.
+    """
+    filters = parse_filter_params(request)
+    since = request.args.get('since', type=int)
+    broker = get_status_broker()
+    subscription = broker.subscribe(filters['date_from'], filters['date_to'], since=since)
+    if subscription is None:
+        return jsonify({
+            'success': False,
+            'error': 'Too many open live update streams, try again later'
+        }), 503, {'Retry-After': str(STREAM_RETRY_AFTER)}
+    
+    def generate():
+        # Ask the browser to reconnect quickly if the stream drops
+        yield 'retry: 5000\n\n'
+        while True:
+            try:
+                message = subscription.get(timeout=STREAM_KEEPALIVE)
+            except queue.Empty:
+                # Comment line keeps proxies from closing an idle stream
+                yield ': keepalive\n\n'
+                continue
+            if message is None:
+                break
+            yield f"event: status\nid: {message['generation']}\ndata: {dumps(message)}\n\n"
+    
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # Runs when the server closes the response, even if the stream never started
+    response.call_on_close(lambda: broker.unsubscribe(subscription))
+    return response
@@ -1,9 +1,9 @@
 from flask import Blueprint, render_template, request
-from app.config import Config
-from app.services import get_event_service, get_monitor_service
+from app.config import Config, get_generation
+from app.services import get_event_service, get_status_matrix_builder
 from app.utils import get_logger
 from .utils import (
-    parse_filter_params, parse_pagination_params,
+    parse_filter_params, parse_cursor_params,
     parse_sort_params, handle_error
 )
 
@@ -24,32 +24,21 @@ def index():
         filters = parse_filter_params(request)
         logger.info(f"Dashboard filters: {filters}")
         
-        # Get current status from monitor service
-        dashboard_data = get_monitor_service().get_current_status(filters=filters)
+        # Read the generation first so the live stream resends anything
+        # ingested while this page is being built
+        generation = get_generation()
         
-        # Debug logging for dashboard data
-        breach_count = 0
-        breach_cells = 0
+        # Get the status matrix for the window, shared until the next ingestion
+        status_matrix = get_status_matrix_builder().build(filters['date_from'], filters['date_to'])
         
-        for scid, payload_data in dashboard_data.items():
-            for metric_name, metric_data in payload_data['metrics'].items():
-                count = metric_data.get('count', 0)
-                status = metric_data.get('status', 'NORMAL')
-                breach_count += count
-                if status == 'BREACH':
-                    breach_cells += 1
-                    logger.info(f"BREACH found: SCID {scid}, metric {metric_name}, count {count}, status {status}")
-        
-        logger.info(f"Dashboard summary: {len(dashboard_data)} payloads, {breach_count} total breaches, {breach_cells} cells in breach status")
-        
-        # Get the list of metrics from config
-        metrics = config.get_metrics()
+        summary = status_matrix.summary()
+        logger.info(f"Dashboard summary: {summary['payloads']} payloads, {summary['breaches']} total breaches, {summary['breach_cells']} cells in breach status")
         
         return render_template('dashboard.html', 
-                             dashboard_data=dashboard_data,
-                             metrics=metrics,
+                             status_matrix=status_matrix,
                              date_from=filters['date_from'],
-                             date_to=filters['date_to'])
+                             date_to=filters['date_to'],
+                             generation=generation)
     except Exception as e:
         return handle_error(e)
 
@@ -59,55 +48,60 @@ def events():
     try:
         # Get filters, pagination, and sorting parameters using utility functions
         filters = parse_filter_params(request)
-        page, page_size = parse_pagination_params(request)
+        cursor, page_size, include_total = parse_cursor_params(request)
         sort_by, sort_order = parse_sort_params(request)
         
-        logger.info(f"Events page request: page={page}, sort_by={sort_by}, sort_order={sort_order}, filters={filters}")
+        logger.info(f"Events page request: cursor={cursor}, sort_by={sort_by}, sort_order={sort_order}, filters={filters}")
         
         # Convert scid to string for consistent comparison in template
         if 'scid' in filters:
             filters['scid'] = str(filters['scid'])
         
         # Get events from event service
-        result = get_event_service().get_events(
-            page=page,
+        result = get_event_service().get_events_page(
+            cursor=cursor,
             page_size=page_size,
             sort_by=sort_by,
             sort_order=sort_order,
-            filters=filters
+            filters=filters,
+            include_total=include_total
         )
         
         # Enrich events with payload names for display
-        payloads = config.get_payloads()
-        
-        # Convert payload scids to strings for consistent comparison
-        for payload in payloads:
-            if 'scid' in payload:
-                payload['scid'] = str(payload['scid'])
+        # Convert payload scids to strings for consistent comparison; the
+        # config's own payload dicts are shared and must not be modified
+        payloads = [
+            {**payload, 'scid': str(payload['scid'])} if 'scid' in payload else dict(payload)
+            for payload in config.get_payloads()
+        ]
         
         payloads_dict = {p['scid']: p for p in payloads}
         
+        # Copy the events; cached results are shared between requests
+        events = []
         for event in result['events']:
             event_scid = str(event['scid'])
             if event_scid in payloads_dict:
-                event['payload_name'] = payloads_dict[event_scid]['name']
+                events.append({**event, 'payload_name': payloads_dict[event_scid]['name']})
             else:
-                event['payload_name'] = f"Unknown ({event_scid})"
+                events.append({**event, 'payload_name': f"Unknown ({event_scid})"})
         
         # Get the list of metrics from config for filter dropdowns
         metrics = config.get_metrics()
         
         return render_template('events.html',
-                             events=result['events'],
+                             events=events,
                              payloads=payloads,
                              metrics=metrics,
                              filters=filters,
-                             page=page,
                              page_size=page_size,
-                             total_pages=result['total_pages'],
+                             next_cursor=result['next_cursor'],
+                             prev_cursor=result['prev_cursor'],
                              total_count=result['total_count'],
                              sort_by=sort_by,
                              sort_order=sort_order)
+    except ValueError as e:
+        return handle_error(e, status_code=400)
     except Exception as e:
         logger.error(f"Error in events route: {str(e)}", exc_info=True)
         return handle_error(e) 
\ No newline at end of file
@@ -1,10 +1,13 @@
 """Common utilities for route handlers."""
 
 import datetime
-from flask import g, jsonify, render_template, request
-from app.config import Config
+import functools
+from flask import Response, g, jsonify, render_template, request
+from app.config import cache_get, cache_set, get_config, get_generation
+from app.database.pagination import DEFAULT_PAGE_SIZE, SORTABLE_COLUMNS, clamp_page_size
 from app.services import MatlabInterface
 from app.utils import get_logger
+from app.utils.json_provider import raw_json_response
 
 # Initialize logger
 logger = get_logger('routes.utils')
@@ -19,7 +22,7 @@ def get_default_date_range():
 def get_matlab():
     """Get or create a MATLAB interface for the current request."""
     if 'matlab' not in g:
-        g.matlab = MatlabInterface(Config())
+        g.matlab = MatlabInterface(get_config())
     return g.matlab
 
 def parse_filter_params(request):
@@ -49,15 +52,44 @@ def parse_filter_params(request):
     logger.info(f"Parsed filters: {filters}")
     return filters
 
+def parse_page_size(request):
+    """Parse the page_size parameter, clamped to 1..MAX_PAGE_SIZE.
+    
+    Missing or non-numeric values fall back to DEFAULT_PAGE_SIZE.
+    """
+    try:
+        return clamp_page_size(request.args.get('page_size', DEFAULT_PAGE_SIZE))
+    except (ValueError, TypeError):
+        logger.warning(f"Invalid page_size value: {request.args.get('page_size')}")
+        return DEFAULT_PAGE_SIZE
+
 def parse_pagination_params(request):
     """Parse pagination parameters from request."""
-    page = int(request.args.get('page', 1))
-    page_size = int(request.args.get('page_size', 25))
+    page = max(1, int(request.args.get('page', 1)))
+    page_size = parse_page_size(request)
     return page, page_size
 
+def parse_cursor_params(request):
+    """Parse keyset pagination parameters from request.
+    
+    Returns:
+        tuple: (cursor, page_size, include_total) where cursor is None for the
+               first page and include_total is True when ``count=exact`` was requested
+    """
+    cursor = request.args.get('cursor') or None
+    page_size = parse_page_size(request)
+    include_total = request.args.get('count', '').lower() == 'exact'
+    return cursor, page_size, include_total
+
 def parse_sort_params(request):
-    """Parse sorting parameters from request."""
+    """Parse sorting parameters from request.
+    
+    Raises:
+        ValueError: If sort_by is not one of SORTABLE_COLUMNS
+    """
     sort_by = request.args.get('sort_by', 'timestamp')
+    if sort_by not in SORTABLE_COLUMNS:
+        raise ValueError(f"Invalid sort column: {sort_by}")
     sort_order = request.args.get('sort_order', 'DESC')
     return sort_by, sort_order
 
@@ -78,4 +110,32 @@ def validate_required_params(params, required):
     """Validate that all required parameters are present."""
     missing = [param for param in required if not params.get(param)]
     if missing:
-        raise ValueError(f"Missing required parameters: {', '.join(missing)}") 
\ No newline at end of file
+        raise ValueError(f"Missing required parameters: {', '.join(missing)}") 
+
+def cached_json(timeout=300):
+    """Cache the encoded body of a JSON view until the next ingestion.
+    
+    Successful responses are stored as bytes, keyed by the endpoint, the
+    query string, the ingestion generation and the current day (default
+    date ranges depend on it). A cache hit is sent as is, without building
+    or encoding the response data again. Error responses are not cached.
+    
+    Args:
+        timeout (int): Seconds an entry stays valid
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (f"response:{request.endpoint}:{get_generation()}:{datetime.date.today()}:"
+                   f"{request.query_string.decode()}")
+            body = cache_get(key, timeout)
+            if body is not None:
+                return raw_json_response(body)
+            
+            response = view(*args, **kwargs)
+            if isinstance(response, Response) and response.status_code == 200 and response.is_json:
+                cache_set(key, response.get_data(), timeout)
+            return response
+        
+        return wrapper
+    return decorator
@@ -1,7 +1,13 @@
 """Services package initialization."""
 
 from .event_service import get_event_service
+from .export_service import get_export_service
+from .ingest_service import get_ingest_service
 from .monitor_service import get_monitor_service
+from .retention_service import get_retention_service
+from .scheduler import get_scheduler
+from .status_broker import get_status_broker
+from .status_matrix import get_status_matrix_builder
 from .matlab_interface import MatlabInterface
 
-__all__ = ['get_event_service', 'get_monitor_service', 'MatlabInterface'] 
\ No newline at end of file
+__all__ = ['get_event_service', 'get_export_service', 'get_ingest_service', 'get_monitor_service', 'get_retention_service', 'get_scheduler', 'get_status_broker', 'get_status_matrix_builder', 'MatlabInterface'] 
\ No newline at end of file
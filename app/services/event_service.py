@@ -1,63 +1,52 @@
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_
+import numpy as np
+from sqlalchemy import Integer, case, cast, func, select
 from app.database import get_db
-from app.models.event import Event
+from app.database.pagination import clamp_page_size, paginate_keyset
+from app.models.event import EVENT_COLUMNS, Event, event_dicts
 from app.utils import get_logger
-from app.config import cache
+from app.config import memoize
 
 # Initialize logger
 logger = get_logger('services.event')
 
+# Largest number of points a time series request may ask for
+MAX_TIMESERIES_POINTS = 5000
+
 class EventService:
     """Service for handling event-related business logic."""
     
     def __init__(self):
         self.db = get_db()
     
-    @cache.memoize(timeout=300)
+    @memoize(timeout=300)
     def get_events(self, page=1, page_size=25, sort_by="timestamp", sort_order="DESC", filters=None):
         """Get paginated events with filtering and sorting."""
         try:
             # Validate and normalize filters
             normalized_filters = self._normalize_filters(filters)
+            page_size = clamp_page_size(page_size)
+            
+            # Select only the listed columns; no Event instances are built
+            conditions = self._event_conditions(normalized_filters)
+            query = select(*EVENT_COLUMNS).where(*conditions)
+            
+            # Apply sorting using index
+            sort_column = getattr(Event, sort_by)
+            if sort_order.upper() == 'DESC':
+                query = query.order_by(sort_column.desc())
+            else:
+                query = query.order_by(sort_column.asc())
             
-            # Get events from database with optimized query
             with self.db.get_session() as session:
-                # Build base query
-                query = session.query(Event)
-                
-                # Apply filters efficiently
-                if normalized_filters:
-                    conditions = []
-                    if normalized_filters.get('scid'):
-                        conditions.append(Event.scid == normalized_filters['scid'])
-                    if normalized_filters.get('metric_type'):
-                        conditions.append(Event.metric_type == normalized_filters['metric_type'])
-                    if normalized_filters.get('status'):
-                        conditions.append(Event.status == normalized_filters['status'])
-                    if normalized_filters.get('date_from'):
-                        conditions.append(Event.timestamp >= normalized_filters['date_from'])
-                    if normalized_filters.get('date_to'):
-                        conditions.append(Event.timestamp <= normalized_filters['date_to'])
-                    
-                    if conditions:
-                        query = query.filter(and_(*conditions))
-                
-                # Apply sorting using index
-                sort_column = getattr(Event, sort_by)
-                if sort_order.upper() == 'DESC':
-                    query = query.order_by(sort_column.desc())
-                else:
-                    query = query.order_by(sort_column.asc())
-                
                 # Get total count efficiently
-                total_count = query.count()
+                total_count = self._count_events(session, conditions)
                 
                 # Apply pagination
-                events = query.limit(page_size).offset((page - 1) * page_size).all()
+                rows = session.execute(query.limit(page_size).offset((page - 1) * page_size)).all()
             
             return {
-                'events': [event.to_dict() for event in events],
+                'events': event_dicts(rows),
                 'total_count': total_count,
                 'total_pages': (total_count + page_size - 1) // page_size if total_count > 0 else 1
             }
@@ -65,7 +54,46 @@ class EventService:
             logger.error(f"Error getting events: {str(e)}", exc_info=True)
             raise
     
-    @cache.memoize(timeout=300)
+    @memoize(timeout=300)
+    def get_events_page(self, cursor=None, page_size=25, sort_by="timestamp", sort_order="DESC",
+                        filters=None, include_total=False):
+        """Get a keyset-paginated page of events with filtering and sorting.
+        
+        Args:
+            cursor (str, optional): Opaque cursor from a previous page, None for the first page
+            page_size (int): Number of events per page
+            sort_by (str): Column to sort by; ties are broken by event ID
+            sort_order (str): 'ASC' or 'DESC'
+            filters (dict, optional): Filter parameters
+            include_total (bool): Whether to also run an exact COUNT of matching events
+            
+        Returns:
+            dict: events, next_cursor, prev_cursor and total_count (None unless requested)
+        """
+        try:
+            conditions = self._event_conditions(self._normalize_filters(filters))
+            
+            with self.db.get_session() as session:
+                total_count = None
+                if include_total:
+                    total_count = self._count_events(session, conditions)
+                
+                rows, next_cursor, prev_cursor = paginate_keyset(
+                    select(*EVENT_COLUMNS), Event, sort_by, sort_order, page_size,
+                    cursor=cursor, conditions=conditions, session=session
+                )
+            
+            return {
+                'events': event_dicts(rows),
+                'next_cursor': next_cursor,
+                'prev_cursor': prev_cursor,
+                'total_count': total_count
+            }
+        except Exception as e:
+            logger.error(f"Error getting events page: {str(e)}", exc_info=True)
+            raise
+    
+    @memoize(timeout=300)
     def get_breach_history(self, scid, metric_type, date_from, date_to):
         """Get breach history for a specific payload and metric."""
         try:
@@ -76,29 +104,21 @@ class EventService:
             if end_date < start_date:
                 raise ValueError("End date cannot be before start date")
             
-            # Get all events including values and thresholds for the chart
+            # Get the chart columns of every breach; the lookup index covers them
             with self.db.get_session() as session:
-                query = session.query(Event).filter(
-                    Event.scid == scid,
-                    Event.metric_type == metric_type,
-                    Event.status == 'BREACH',  # Only get breach events
-                    Event.timestamp >= start_date,
-                    Event.timestamp <= end_date + timedelta(days=1)
-                ).order_by(Event.timestamp)
-                
-                breach_events = query.all()
+                rows = session.execute(
+                    self._breach_history_query(scid, metric_type, start_date, end_date)
+                ).all()
             
-            logger.info(f"Found {len(breach_events)} breach events for SCID {scid}, metric {metric_type}")
+            logger.info(f"Found {len(rows)} breach events for SCID {scid}, metric {metric_type}")
             
-            # Convert events to the format needed for the chart
-            history = []
-            for event in breach_events:
-                history.append({
-                    'timestamp': event.timestamp.isoformat(),
-                    'value': event.value,
-                    'threshold': event.threshold,
-                    'status': event.status
-                })
+            # Convert rows to the format needed for the chart
+            history = [{
+                'timestamp': timestamp.isoformat(),
+                'value': value,
+                'threshold': threshold,
+                'status': status
+            } for timestamp, value, threshold, status in rows]
             
             if not history:
                 logger.warning(f"No breach history found for SCID {scid}, metric {metric_type}")
@@ -110,6 +130,193 @@ class EventService:
             logger.error(f"Error getting breach history: {str(e)}", exc_info=True)
             raise
     
+    @memoize(timeout=300)
+    def get_timeseries(self, scid, metric_type, date_from, date_to, points=500, bucket_seconds=None,
+                       include_normal=False, method='buckets'):
+        """Get a downsampled time series for one payload and metric.
+        
+        The response size depends only on ``points``, not on how many events
+        fall in the range.
+        
+        Args:
+            scid (int): Payload ID
+            metric_type (str): Metric type
+            date_from (str): Start date (YYYY-MM-DD)
+            date_to (str): End date (YYYY-MM-DD), inclusive
+            points (int): Target number of points
+            bucket_seconds (int, optional): Bucket width; overrides ``points``, but
+                                            is widened so the range never has more
+                                            than MAX_TIMESERIES_POINTS buckets
+            include_normal (bool): Include NORMAL events for context, not only breaches
+            method (str): 'buckets' aggregates fixed-width time buckets in SQL
+                          (count, breach count, min, max, mean); 'lttb' picks
+                          representative raw events with Largest-Triangle-Three-Buckets
+        
+        Returns:
+            dict: method, bucket_seconds (None for 'lttb') and points
+        """
+        start = datetime.strptime(date_from, "%Y-%m-%d")
+        end = datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1)
+        if end <= start:
+            raise ValueError("End date cannot be before start date")
+        if method not in ('buckets', 'lttb'):
+            raise ValueError("method must be 'buckets' or 'lttb'")
+        points = max(1, min(int(points), MAX_TIMESERIES_POINTS))
+        
+        conditions = [
+            Event.scid == scid,
+            Event.metric_type == metric_type,
+            Event.timestamp >= start,
+            Event.timestamp < end
+        ]
+        if not include_normal:
+            conditions.append(Event.status == 'BREACH')
+        
+        with self.db.get_session() as session:
+            if method == 'lttb':
+                rows = session.execute(
+                    select(Event.timestamp, Event.value, Event.threshold, Event.status)
+                    .where(*conditions)
+                    .order_by(Event.timestamp)
+                ).all()
+                series = self._lttb(rows, points)
+                bucket_seconds = None
+            else:
+                span = (end - start).total_seconds()
+                narrowest = int(-(-span // MAX_TIMESERIES_POINTS))
+                bucket_seconds = max(narrowest, int(bucket_seconds or -(-span // points)))
+                series = self._time_buckets(session, conditions, start, bucket_seconds)
+        
+        logger.info(f"Time series for SCID {scid}, {metric_type}: {len(series)} points ({method})")
+        return {'method': method, 'bucket_seconds': bucket_seconds, 'points': series}
+    
+    def _time_buckets(self, session, conditions, start, bucket_seconds):
+        """Aggregate events into fixed-width time buckets in the database."""
+        if self.db.engine.dialect.name == 'postgresql':
+            offset = func.extract('epoch', Event.timestamp - start)
+        else:
+            offset = (func.julianday(Event.timestamp) - func.julianday(start)) * 86400.0
+        bucket = cast(offset / bucket_seconds, Integer).label('bucket')
+        
+        rows = session.execute(
+            select(
+                bucket,
+                func.count().label('count'),
+                func.sum(case((Event.status == 'BREACH', 1), else_=0)).label('breach_count'),
+                func.min(Event.value).label('min'),
+                func.max(Event.value).label('max'),
+                func.avg(Event.value).label('mean'),
+                func.max(Event.threshold).label('threshold')
+            )
+            .where(*conditions)
+            .group_by(bucket)
+            .order_by(bucket)
+        ).all()
+        
+        return [{
+            'timestamp': (start + timedelta(seconds=row.bucket * bucket_seconds)).isoformat(),
+            'count': row.count,
+            'breach_count': int(row.breach_count or 0),
+            'min': row.min,
+            'max': row.max,
+            'mean': row.mean,
+            'threshold': row.threshold
+        } for row in rows]
+    
+    def _lttb(self, rows, points):
+        """Reduce events to ``points`` representatives with Largest-Triangle-Three-Buckets."""
+        if len(rows) <= points or points < 3:
+            selected = range(len(rows)) if len(rows) <= points else np.linspace(0, len(rows) - 1, points).astype(int)
+        else:
+            x = np.array([row.timestamp.timestamp() for row in rows])
+            y = np.array([row.value for row in rows], dtype=np.float64)
+            # First and last points are kept; the rest are split into points - 2 buckets
+            edges = np.linspace(1, len(rows) - 1, points - 1).astype(int)
+            selected = [0]
+            for i in range(points - 2):
+                lo, hi = edges[i], edges[i + 1]
+                # Average of the next bucket, or the last point for the final bucket
+                if i + 2 < len(edges):
+                    next_x = x[hi:edges[i + 2]].mean()
+                    next_y = y[hi:edges[i + 2]].mean()
+                else:
+                    next_x, next_y = x[-1], y[-1]
+                prev = selected[-1]
+                area = np.abs((x[prev] - next_x) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (next_y - y[prev]))
+                selected.append(lo + int(area.argmax()))
+            selected.append(len(rows) - 1)
+        
+        return [{
+            'timestamp': rows[i].timestamp.isoformat(),
+            'value': rows[i].value,
+            'threshold': rows[i].threshold,
+            'status': rows[i].status
+        } for i in selected]
+    
+    def _breach_history_query(self, scid, metric_type, start_date, end_date):
+        """Build the breach events select for one payload and metric."""
+        return select(Event.timestamp, Event.value, Event.threshold, Event.status).where(
+            Event.scid == scid,
+            Event.metric_type == metric_type,
+            Event.status == 'BREACH',  # Only get breach events
+            Event.timestamp >= start_date,
+            Event.timestamp <= end_date + timedelta(days=1)
+        ).order_by(Event.timestamp)
+    
+    def iter_event_chunks(self, filters=None, chunk_size=10000):
+        """Stream every event matching the filters, oldest first, in chunks.
+        
+        Rows are read through a server-side cursor on a dedicated connection,
+        so memory use depends on ``chunk_size`` rather than on the number of
+        matching events.
+        
+        Args:
+            filters (dict, optional): Same filter parameters as get_events
+            chunk_size (int): Rows fetched per chunk
+        
+        Returns:
+            iterator: Lists of rows with id, scid, metric_type, timestamp,
+                      value, threshold and status attributes
+        
+        Raises:
+            ValueError: If a filter is invalid; raised here rather than on
+                        the first chunk, so callers can reject the request
+        """
+        conditions = self._event_conditions(self._normalize_filters(filters))
+        query = (
+            select(Event.id, Event.scid, Event.metric_type, Event.timestamp,
+                   Event.value, Event.threshold, Event.status)
+            .where(*conditions)
+            .order_by(Event.timestamp, Event.id)
+        )
+        return self._stream_chunks(query, chunk_size)
+    
+    def _stream_chunks(self, query, chunk_size):
+        with self.db.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+            for chunk in result.partitions():
+                yield chunk
+    
+    def _count_events(self, session, conditions):
+        """Count the events matching a list of filter conditions."""
+        return session.execute(select(func.count(Event.id)).where(*conditions)).scalar_one()
+    
+    def _event_conditions(self, normalized_filters):
+        """Build the list of filter conditions for an events query."""
+        conditions = []
+        if normalized_filters:
+            if normalized_filters.get('scid'):
+                conditions.append(Event.scid == normalized_filters['scid'])
+            if normalized_filters.get('metric_type'):
+                conditions.append(Event.metric_type == normalized_filters['metric_type'])
+            if normalized_filters.get('status'):
+                conditions.append(Event.status == normalized_filters['status'])
+            if normalized_filters.get('date_from'):
+                conditions.append(Event.timestamp >= normalized_filters['date_from'])
+            if normalized_filters.get('date_to'):
+                conditions.append(Event.timestamp <= normalized_filters['date_to'])
+        return conditions
+    
     def _normalize_filters(self, filters):
         """Normalize and validate filter parameters."""
         if not filters:
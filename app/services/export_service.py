@@ -0,0 +1,189 @@
+"""Bulk export of events as CSV, NDJSON, Arrow or Parquet.
+
+Events are read with a server-side cursor (EventService.iter_event_chunks)
+and every chunk is encoded and handed to the caller before the next one is
+fetched, so an export of any size runs in memory bounded by the chunk size.
+Arrow (IPC stream) and Parquet output need pyarrow; without it only CSV and
+NDJSON are available.
+"""
+
+import csv
+import io
+from app.services.event_service import get_event_service
+from app.utils import get_logger
+from app.utils.json_provider import dumps_bytes
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Columnar formats are optional
+    pa = pq = None
+
+# Initialize logger
+logger = get_logger('services.export')
+
+# Columns of every export, in order
+EXPORT_COLUMNS = ('id', 'scid', 'metric_type', 'timestamp', 'value', 'threshold', 'status')
+
+# Rows fetched and encoded per chunk
+EXPORT_CHUNK_SIZE = 10000
+
+# Largest chunk size a caller may ask for
+MAX_EXPORT_CHUNK_SIZE = 100000
+
+# Media type and file extension of each format
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrow'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+# Formats that need pyarrow
+COLUMNAR_FORMATS = ('arrow', 'parquet')
+
+class ExportService:
+    """Service that streams filtered events in bulk export formats."""
+    
+    def __init__(self):
+        self.event_service = get_event_service()
+    
+    def get_formats(self):
+        """Get the export formats available in this installation.
+        
+        Returns:
+            list: Format names
+        """
+        return [name for name in EXPORT_FORMATS if pa is not None or name not in COLUMNAR_FORMATS]
+    
+    def export(self, fmt, filters=None, chunk_size=EXPORT_CHUNK_SIZE):
+        """Export events matching the filters, oldest first.
+        
+        Args:
+            fmt (str): 'csv', 'ndjson', 'arrow' or 'parquet'
+            filters (dict, optional): Same filter parameters as /api/events
+            chunk_size (int): Rows read and encoded at a time
+        
+        Returns:
+            iterator: Encoded chunks (bytes)
+        
+        Raises:
+            ValueError: If the format is unknown or unavailable, or a filter is
+                        invalid; raised before anything is read
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}', expected one of: {', '.join(EXPORT_FORMATS)}")
+        if fmt not in self.get_formats():
+            raise ValueError(f"The {fmt} export format requires pyarrow")
+        chunk_size = max(1, min(int(chunk_size), MAX_EXPORT_CHUNK_SIZE))
+        
+        chunks = self.event_service.iter_event_chunks(filters, chunk_size)
+        logger.info(f"Exporting events as {fmt} in chunks of {chunk_size}, filters: {filters}")
+        writer = getattr(self, f"_write_{fmt}")
+        return writer(chunks)
+    
+    def _write_csv(self, chunks):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(EXPORT_COLUMNS)
+        for rows in chunks:
+            writer.writerows(
+                (row.id, row.scid, row.metric_type, row.timestamp.isoformat(),
+                 row.value, row.threshold, row.status)
+                for row in rows
+            )
+            yield _drain(buffer)
+        # The header is sent even when nothing matched
+        if buffer.tell():
+            yield _drain(buffer)
+    
+    def _write_ndjson(self, chunks):
+        for rows in chunks:
+            yield b''.join(
+                dumps_bytes({
+                    'id': row.id,
+                    'scid': row.scid,
+                    'metric_type': row.metric_type,
+                    'timestamp': row.timestamp.isoformat(),
+                    'value': row.value,
+                    'threshold': row.threshold,
+                    'status': row.status
+                }) + b'\n'
+                for row in rows
+            )
+    
+    def _write_arrow(self, chunks):
+        sink = _ChunkSink()
+        schema = _arrow_schema()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for rows in chunks:
+                writer.write_batch(_record_batch(rows, schema))
+                yield sink.drain()
+        yield sink.drain()
+    
+    def _write_parquet(self, chunks):
+        # Each chunk becomes a row group; only the footer is written at the end
+        sink = _ChunkSink()
+        schema = _arrow_schema()
+        with pq.ParquetWriter(sink, schema) as writer:
+            for rows in chunks:
+                writer.write_batch(_record_batch(rows, schema))
+                yield sink.drain()
+        yield sink.drain()
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are handed out and forgotten per chunk."""
+    
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self._position
+    
+    def drain(self):
+        """Get everything written since the last drain."""
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+def _drain(buffer):
+    """Get and clear the text written to a StringIO, encoded as UTF-8."""
+    data = buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+def _arrow_schema():
+    return pa.schema([
+        ('id', pa.int64()),
+        ('scid', pa.int64()),
+        ('metric_type', pa.string()),
+        ('timestamp', pa.timestamp('us')),
+        ('value', pa.float64()),
+        ('threshold', pa.float64()),
+        ('status', pa.string()),
+    ])
+
+def _record_batch(rows, schema):
+    """Transpose a chunk of rows into an Arrow record batch."""
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(zip(*rows), schema)],
+        schema=schema
+    )
+
+# Create a singleton instance
+export_service = ExportService()
+
+def get_export_service():
+    """Get the singleton export service instance."""
+    return export_service
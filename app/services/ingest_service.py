@@ -0,0 +1,352 @@
+"""Bulk ingestion of result files dropped into the spool directory.
+
+Producers (MATLAB scripts or anything else) write result files into
+SPOOL_PATH, under a temporary name (a leading dot or a ``.tmp``/``.part``
+suffix) that they rename once the file is complete. Supported formats:
+
+- ``.csv`` with a header row
+- ``.npy`` holding a structured array, one field per column
+- ``.parquet``, when pyarrow is installed
+
+Files need ``scid``, ``metric_type``, ``timestamp`` (UTC; ISO 8601 strings,
+datetime64 or epoch seconds) and ``value`` columns. ``threshold`` and
+``status`` are optional; without ``status`` the samples are evaluated by the
+threshold engine. Files are memory-mapped and loaded in SPOOL_BATCH_SIZE row
+chunks. Each file is recorded in ingest_manifest under its SHA-256, and the
+number of rows loaded is committed together with each chunk, so a file is
+loaded exactly once even if the process stops halfway. Loaded files move to
+``done/`` and files that cannot be parsed to ``failed/``.
+"""
+
+import csv
+import hashlib
+import io
+import mmap
+import os
+import threading
+from datetime import datetime
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from app.config import Config, bump_generation
+from app.database import get_db
+from app.models.ingest import IngestManifest
+from app.services.threshold_engine import get_threshold_engine
+from app.utils import get_logger
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet support is optional
+    pq = None
+
+# Initialize logger
+logger = get_logger('services.ingest')
+
+REQUIRED_COLUMNS = ('scid', 'metric_type', 'timestamp', 'value')
+
+# Suffixes of files a producer is still writing
+PARTIAL_SUFFIXES = ('.tmp', '.part')
+
+class IngestService:
+    """Service that bulk-loads spool files into the events table exactly once."""
+    
+    def __init__(self):
+        self.config = Config()
+        self.db = get_db()
+        self.threshold_engine = get_threshold_engine()
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def _readers(self):
+        readers = {'.csv': self._read_csv, '.npy': self._read_npy}
+        if pq is not None:
+            readers['.parquet'] = self._read_parquet
+        return readers
+    
+    def scan(self):
+        """List the complete files waiting in the spool directory, oldest first.
+        
+        Returns:
+            list: File paths
+        """
+        spool_path = self.config.get_spool_policy()['path']
+        if not os.path.isdir(spool_path):
+            return []
+        
+        readers = self._readers()
+        paths = []
+        for entry in os.scandir(spool_path):
+            name = entry.name
+            if not entry.is_file() or name.startswith('.') or name.endswith(PARTIAL_SUFFIXES):
+                continue
+            if os.path.splitext(name)[1].lower() in readers:
+                paths.append((entry.stat().st_mtime, name, entry.path))
+        return [path for _, _, path in sorted(paths)]
+    
+    def run_once(self):
+        """Ingest every file currently in the spool directory.
+        
+        Returns:
+            dict: Number of files ingested and rows loaded
+        """
+        files = rows = 0
+        with self._run_lock:
+            for path in self.scan():
+                if self._stop.is_set():
+                    break
+                loaded = self.ingest_file(path)
+                if loaded is not None:
+                    files += 1
+                    rows += loaded
+        if files:
+            logger.info(f"Ingested {rows} rows from {files} spool files")
+        return {'files': files, 'rows': rows}
+    
+    def ingest_file(self, path):
+        """Load one spool file into events, resuming after its last committed chunk.
+        
+        Args:
+            path (str): File to ingest
+        
+        Returns:
+            int: Rows loaded by this call, or None if the file was skipped or failed
+        """
+        name = os.path.basename(path)
+        with open(path, 'rb') as f:
+            digest = hashlib.file_digest(f, 'sha256').hexdigest()
+        
+        with self.db.get_session() as session:
+            entry = session.get(IngestManifest, digest)
+            if entry is not None and entry.status == 'DONE':
+                logger.info(f"Skipping {name}: already ingested as {entry.file_name}")
+                self._move(path, 'done')
+                return None
+            if entry is None:
+                session.add(IngestManifest(
+                    sha256=digest,
+                    file_name=name,
+                    size=os.path.getsize(path),
+                    rows_loaded=0,
+                    status='LOADING',
+                    started_at=datetime.utcnow()
+                ))
+                try:
+                    session.commit()
+                except IntegrityError:
+                    # Another ingester claimed the same file first
+                    return None
+                start = 0
+            else:
+                start = entry.rows_loaded
+        
+        if start:
+            logger.info(f"Resuming {name} after {start} rows")
+        
+        reader = self._readers()[os.path.splitext(name)[1].lower()]
+        batch_size = self.config.get_spool_policy()['batch_size']
+        position = start
+        try:
+            for columns in reader(path, start, batch_size):
+                rows = max((len(column) for column in columns.values()), default=0)
+                results = self._to_results(columns)
+                with self.db.get_session() as session:
+                    if results:
+                        self.db.insert_triggers(session, results)
+                    position += rows
+                    session.execute(
+                        update(IngestManifest)
+                        .where(IngestManifest.sha256 == digest)
+                        .values(rows_loaded=position)
+                    )
+                    session.commit()
+                bump_generation()
+        except (ValueError, KeyError, TypeError, csv.Error) as e:
+            logger.error(f"Failed to ingest {name} at row {position}: {str(e)}")
+            self._finish(digest, 'FAILED', str(e)[:500])
+            self._move(path, 'failed')
+            return None
+        
+        self._finish(digest, 'DONE')
+        self._move(path, 'done')
+        logger.info(f"Ingested {position - start} rows from {name}")
+        return position - start
+    
+    def _finish(self, digest, status, error=None):
+        with self.db.get_session() as session:
+            session.execute(
+                update(IngestManifest)
+                .where(IngestManifest.sha256 == digest)
+                .values(status=status, error=error, finished_at=datetime.utcnow())
+            )
+            session.commit()
+    
+    def _move(self, path, folder):
+        target_dir = os.path.join(os.path.dirname(path), folder)
+        os.makedirs(target_dir, exist_ok=True)
+        os.replace(path, os.path.join(target_dir, os.path.basename(path)))
+    
+    def _read_npy(self, path, start, batch_size):
+        """Yield column chunks of a structured .npy array, memory-mapped."""
+        array = np.load(path, mmap_mode='r', allow_pickle=False)
+        if array.dtype.names is None:
+            raise ValueError("NPY spool files must hold a structured array with named fields")
+        for offset in range(start, len(array), batch_size):
+            chunk = array[offset:offset + batch_size]
+            yield {name: np.asarray(chunk[name]) for name in array.dtype.names}
+    
+    def _read_csv(self, path, start, batch_size):
+        """Yield column chunks of a CSV file with a header row, memory-mapped."""
+        if os.path.getsize(path) == 0:
+            return
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            reader = csv.reader(io.TextIOWrapper(_MappedFile(mapped), encoding='utf-8', newline=''))
+            header = [column.strip() for column in next(reader, [])]
+            rows = (row for row in reader if row)
+            for _ in range(start):
+                if next(rows, None) is None:
+                    return
+            
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    yield _csv_columns(header, batch)
+                    batch = []
+            if batch:
+                yield _csv_columns(header, batch)
+    
+    def _read_parquet(self, path, start, batch_size):
+        """Yield column chunks of a Parquet file, memory-mapped."""
+        offset = 0
+        for batch in pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=batch_size):
+            if offset + batch.num_rows <= start:
+                offset += batch.num_rows
+                continue
+            if offset < start:
+                batch = batch.slice(start - offset)
+            offset += batch.num_rows
+            yield {name: batch.column(name).to_numpy(zero_copy_only=False) for name in batch.schema.names}
+    
+    def _to_results(self, columns):
+        """Convert a chunk of columns into event dicts for Database.insert_triggers."""
+        missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        
+        scids = np.asarray(columns['scid']).astype(np.int64)
+        metric_types = _strings(columns['metric_type'])
+        values = np.asarray(columns['value']).astype(np.float64)
+        timestamps = _datetimes(columns['timestamp'])
+        if np.isnat(timestamps).any() or np.isnan(values).any():
+            raise ValueError("Missing timestamp or value")
+        
+        if 'status' in columns:
+            statuses = _strings(columns['status'])
+            if 'threshold' in columns:
+                thresholds = np.asarray(columns['threshold']).astype(np.float64)
+            else:
+                configured = self.config.get_thresholds()
+                names, inverse = np.unique(metric_types, return_inverse=True)
+                thresholds = np.array([float(configured.get(name, 0)) for name in names])[inverse]
+            keep = slice(None)
+        else:
+            # Map metric names to rule indexes once per distinct name
+            rules = self.threshold_engine.get_rules()
+            names, inverse = np.unique(metric_types, return_inverse=True)
+            metric_idx = np.array([rules.metric_index.get(name, -1) for name in names], dtype=np.int64)[inverse]
+            keep = metric_idx >= 0
+            if not keep.all():
+                unknown = sorted(str(name) for name in names[np.unique(inverse[~keep])])
+                logger.warning(f"Skipping {int((~keep).sum())} samples of unconfigured metrics: {unknown}")
+            breach, thresholds = self.threshold_engine.evaluate(scids[keep], metric_idx[keep], values[keep],
+                                                                rules=rules)
+            statuses = np.where(breach, 'BREACH', 'NORMAL')
+        
+        return [{
+            'scid': scid,
+            'metric_type': metric_type,
+            'timestamp': timestamp,
+            'value': value,
+            'threshold': threshold,
+            'status': status
+        } for scid, metric_type, timestamp, value, threshold, status in zip(
+            scids[keep].tolist(), metric_types[keep].tolist(), timestamps[keep].tolist(),
+            values[keep].tolist(), thresholds.tolist(), statuses.tolist()
+        )]
+    
+    def start(self, interval=None):
+        """Scan the spool directory in a background thread every ``interval`` seconds.
+        
+        Args:
+            interval (int, optional): Seconds between scans, defaults to SPOOL_INTERVAL
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        interval = interval or self.config.get_spool_policy()['interval']
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_forever, args=(interval,),
+                                        name='spool-ingest', daemon=True)
+        self._thread.start()
+        logger.info(f"Started spool ingestion every {interval} seconds")
+    
+    def stop(self):
+        """Stop the background thread after its current chunk."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+    
+    def _run_forever(self, interval):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Error ingesting spool files: {str(e)}", exc_info=True)
+            self._stop.wait(interval)
+
+class _MappedFile(io.RawIOBase):
+    """Read-only file object over an mmap, so text wrappers can stream it."""
+    
+    def __init__(self, mapped):
+        self._mapped = mapped
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        data = self._mapped.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+def _csv_columns(header, rows):
+    """Transpose CSV rows into a dict of column arrays."""
+    for row in rows:
+        if len(row) != len(header):
+            raise ValueError(f"Expected {len(header)} columns, found {len(row)}")
+    columns = list(zip(*rows))
+    return {name: np.array(column) for name, column in zip(header, columns)}
+
+def _strings(column):
+    """Convert a column of bytes, objects or strings to a unicode array."""
+    column = np.asarray(column)
+    if column.dtype.kind == 'S':
+        return np.char.decode(column, 'utf-8')
+    return column.astype(str)
+
+def _datetimes(column):
+    """Convert a timestamp column to naive UTC datetime64[us]."""
+    column = np.asarray(column)
+    if column.dtype.kind == 'M':
+        return column.astype('datetime64[us]')
+    if column.dtype.kind in 'iuf':
+        return (column.astype(np.float64) * 1e6).astype(np.int64).astype('datetime64[us]')
+    # ISO 8601 strings; a trailing Z is accepted as UTC
+    return np.char.rstrip(_strings(column), 'Z').astype('datetime64[us]')
+
+# Create a singleton instance
+ingest_service = IngestService()
+
+def get_ingest_service():
+    """Get the singleton spool ingest service instance."""
+    return ingest_service
@@ -0,0 +1,227 @@
+"""Pool of long-lived MATLAB engines reused across monitoring cycles."""
+
+import atexit
+import datetime
+import json
+import queue
+import random
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from app.utils import get_logger
+
+try:
+    import matlab.engine
+except ImportError:  # MATLAB Engine API for Python is not installed
+    matlab = None
+
+# Initialize logger
+logger = get_logger('services.matlab_pool')
+
+class FakeMatlabEngine:
+    """Stand-in for a MATLAB engine used when MATLAB is not installed.
+
+    Answers ``sample_<metric>_monitor(scid)`` calls with generated JSON in the
+    same shape the real scripts return, so the pool and everything above it
+    can run in simulation mode and in tests.
+    """
+
+    def __init__(self, payloads=None, thresholds=None):
+        self.payloads = payloads or [101]
+        self.thresholds = thresholds or {}
+        self.alive = True
+
+    def addpath(self, path, nargout=0):
+        """Accept the scripts path like the real engine does."""
+        return None
+
+    def eval(self, expression, nargout=0):
+        """Evaluate a health-check expression."""
+        if not self.alive:
+            raise RuntimeError("MATLAB engine has terminated")
+        return None
+
+    def quit(self):
+        """Terminate the engine."""
+        self.alive = False
+
+    def __getattr__(self, name):
+        if not (name.startswith('sample_') and name.endswith('_monitor')):
+            raise AttributeError(name)
+        metric_type = name[len('sample_'):-len('_monitor')]
+
+        def monitor(scid=0, nargout=1, background=False):
+            if background:
+                future = Future()
+                future.set_result(monitor(scid, nargout=nargout))
+                return future
+            if not self.alive:
+                raise RuntimeError("MATLAB engine has terminated")
+            threshold = self.thresholds.get(metric_type, 25.0)
+            if isinstance(scid, (list, tuple)):
+                scids = [int(payload_id) for payload_id in scid]
+            else:
+                scids = [int(scid)] if scid else self.payloads
+            timestamp = datetime.datetime.now(datetime.UTC).strftime('%Y-%m-%dT%H:%M:%S')
+            results = []
+            for payload_id in scids:
+                value = random.uniform(0.8, 1.2) * threshold
+                results.append({
+                    'timestamp': timestamp,
+                    'scid': payload_id,
+                    'metric_type': metric_type,
+                    'value': value,
+                    'threshold': threshold,
+                    'status': 'BREACH' if value > threshold else 'NORMAL'
+                })
+            return json.dumps({'results': results})
+
+        return monitor
+
+class MatlabEnginePool:
+    """Fixed-size pool of MATLAB engines that are started once and reused.
+
+    Engines are health-checked when they are checked out and after any
+    failed call; an engine that no longer responds is quit and replaced.
+    """
+
+    def __init__(self, size, scripts_path, engine_factory=None):
+        """Initialize the pool.
+
+        Args:
+            size (int): Number of engines to keep running
+            scripts_path (str): Directory added to each engine's MATLAB path
+            engine_factory (callable, optional): Returns a new engine. Defaults
+                                                 to ``matlab.engine.start_matlab``.
+        """
+        self.size = size
+        self.scripts_path = scripts_path
+        self.engine_factory = engine_factory or self._start_matlab
+        self._engines = queue.Queue()
+        self._lock = threading.Lock()
+        self.started = False
+
+    @staticmethod
+    def _start_matlab():
+        if matlab is None:
+            raise RuntimeError("MATLAB Engine API for Python is not installed")
+        return matlab.engine.start_matlab()
+
+    def start(self):
+        """Start all engines in the pool if they are not already running."""
+        with self._lock:
+            if self.started:
+                return
+            for _ in range(self.size):
+                self._engines.put(self._new_engine())
+            self.started = True
+            logger.info(f"Started MATLAB engine pool with {self.size} engines")
+
+    def _new_engine(self):
+        engine = self.engine_factory()
+        engine.addpath(self.scripts_path, nargout=0)
+        return engine
+
+    def _is_healthy(self, engine):
+        try:
+            engine.eval('1;', nargout=0)
+            return True
+        except Exception:
+            return False
+
+    def _replace(self, engine):
+        logger.warning("MATLAB engine is unresponsive, restarting it")
+        try:
+            engine.quit()
+        except Exception:
+            pass
+        return self._new_engine()
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        """Check out a healthy engine for the duration of the block.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free engine
+        """
+        self.start()
+        try:
+            engine = self._engines.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No MATLAB engine became available within {timeout} seconds")
+
+        try:
+            if not self._is_healthy(engine):
+                engine = self._replace(engine)
+            yield engine
+        except TimeoutError:
+            # A hung call may leave the engine busy indefinitely
+            engine = self._replace(engine)
+            raise
+        except Exception:
+            # A script error leaves the engine usable; a crash does not
+            if not self._is_healthy(engine):
+                engine = self._replace(engine)
+            raise
+        finally:
+            self._engines.put(engine)
+
+    def call(self, function_name, *args, timeout=None):
+        """Call a MATLAB function on a pooled engine and return its output.
+
+        Args:
+            function_name (str): MATLAB function to call
+            *args: Arguments passed to the function
+            timeout (float, optional): Seconds to wait for a free engine and,
+                                       separately, for the call to finish
+        """
+        with self.acquire(timeout=timeout) as engine:
+            future = getattr(engine, function_name)(*args, nargout=1, background=True)
+            try:
+                return future.result(timeout=timeout)
+            except TimeoutError:
+                future.cancel()
+                raise TimeoutError(f"MATLAB function {function_name} timed out after {timeout} seconds")
+
+    def shutdown(self):
+        """Quit every engine in the pool."""
+        with self._lock:
+            while not self._engines.empty():
+                try:
+                    self._engines.get_nowait().quit()
+                except Exception:
+                    pass
+            self.started = False
+
+def matlab_vector(values):
+    """Convert a list of numbers into a MATLAB row vector argument.
+
+    Falls back to the plain list when MATLAB is not installed, which is what
+    FakeMatlabEngine expects.
+    """
+    if matlab is None:
+        return list(values)
+    return matlab.double([float(value) for value in values])
+
+# Process-wide pool shared by every MatlabInterface instance
+_engine_pool = None
+_engine_pool_lock = threading.Lock()
+
+def get_engine_pool(config):
+    """Get the process-wide MATLAB engine pool, creating it on first use."""
+    global _engine_pool
+    with _engine_pool_lock:
+        if _engine_pool is None:
+            engine_factory = None
+            if config.is_simulation_mode():
+                payloads = [p['scid'] for p in config.get_payloads()]
+                thresholds = config.get_thresholds()
+                engine_factory = lambda: FakeMatlabEngine(payloads, thresholds)
+                logger.info("Using fake MATLAB engines")
+            _engine_pool = MatlabEnginePool(
+                config.get_matlab_engine_pool_size(),
+                config.get_matlab_scripts_path(),
+                engine_factory=engine_factory
+            )
+            atexit.register(_engine_pool.shutdown)
+        return _engine_pool
@@ -1,40 +1,80 @@
 """MATLAB interface service for interacting with MATLAB engine."""
 
 import subprocess
-import json
+import io
 import os
 import datetime
 import random
-import matlab.engine
-from app.config import Config
+import signal
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from app.config import get_config
+from app.services.matlab_engine_pool import get_engine_pool, matlab_vector
 from app.utils import get_logger
+from app.utils.ndjson import iter_records
 
 # Initialize logger
 logger = get_logger('services.matlab')
 
+# Results handed to the caller per chunk while a script is still running
+STREAM_CHUNK_SIZE = 500
+
+# Lines of a script's stderr kept for its error message
+STDERR_TAIL_LINES = 50
+
 class MatlabInterface:
     """Interface for interacting with MATLAB engine."""
     
     def __init__(self, config=None):
         """Initialize MATLAB interface."""
-        self.config = config or Config()
+        self.config = config or get_config()
         self.matlab_path = self.config.get_matlab_scripts_path()
         self.use_simulation = self.config.is_simulation_mode()
         logger.info("use_simulation: " + str(self.use_simulation))
+        self.max_workers = self.config.get_matlab_max_workers()
+        self.script_timeout = self.config.get_matlab_script_timeout()
+        self.execution_mode = self.config.get_matlab_execution_mode()
         os.makedirs(self.matlab_path, exist_ok=True)
-        self.engine = None
-        self.initialized = False    
+        self.engine_pool = None
+        self._processes = set()
+        self._processes_lock = threading.Lock()
+        self._shard_executor = None
+        self._shard_executor_lock = threading.Lock()
   
     def run_script(self, script_name, payload_id=None):
-        """Run a MATLAB script.
+        """Run a MATLAB script and collect all of its results.
         
         Args:
             script_name (str): Name of the script to run
-            payload_id (str, optional): Payload ID to pass to the script
+            payload_id (int | list, optional): Payload ID, or list of payload IDs,
+                                               passed as the script's ``scid`` argument
             
         Returns:
             dict: Script execution results
         """
+        results = []
+        self.stream_script(script_name, payload_id, results.extend)
+        return {'results': results}
+    
+    def stream_script(self, script_name, payload_id=None, on_results=None, chunk_size=STREAM_CHUNK_SIZE):
+        """Run a MATLAB script, handing its results over while it is still running.
+        
+        The script prints one JSON record per line. Lines are parsed as they
+        arrive and passed to ``on_results`` in chunks of ``chunk_size``, so
+        memory stays bounded however much the script produces. Non-JSON
+        output is ignored and unparseable lines are logged and skipped.
+        
+        Args:
+            script_name (str): Name of the script to run
+            payload_id (int | list, optional): Payload ID, or list of payload IDs,
+                                               passed as the script's ``scid`` argument
+            on_results (callable): Called with each chunk of normalized results
+            chunk_size (int): Results per chunk
+            
+        Returns:
+            int: Number of results handed over
+        """
         try:
             script_path = os.path.join(self.matlab_path, script_name)
             if not os.path.exists(script_path):
@@ -42,29 +82,111 @@ class MatlabInterface:
             
             if self.use_simulation:
                 logger.info(f"Simulation mode: Would run {script_name} with payload {payload_id}")
-                return self._simulate_script_results(script_name, payload_id)
+                results = self._normalize_results(self._simulate_script_results(script_name, payload_id))
+                if results:
+                    on_results(results)
+                return len(results)
             
-            # Run the MATLAB script
-            cmd = ["matlab", "-batch", f"run('{script_path}')"]
+            # Call the script's function so the payload reaches its scid argument;
+            # with nargout == 0 the script prints its records to stdout. The
+            # trailing semicolon stops MATLAB from also printing the returned
+            # document as "ans = ..." in one huge line after the records
+            function_name = os.path.splitext(script_name)[0]
+            scripts_dir = os.path.abspath(self.matlab_path).replace("'", "''")
+            cmd = ["matlab", "-batch",
+                   f"addpath('{scripts_dir}'); {function_name}({self._scid_argument(payload_id)});"]
             logger.info("cmd: " + str(cmd))
-            if payload_id:
-                cmd.extend(["-payload", payload_id])
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
-           
-            if result.returncode != 0:
-                raise RuntimeError(f"Script execution failed: {result.stderr}")
+            # Start in a new session so a hung script can be killed with its children
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                       text=True, bufsize=1, start_new_session=True)
+            with self._processes_lock:
+                self._processes.add(process)
+            
+            # Drain stderr in the background so the script never blocks on a full
+            # pipe, keeping only the tail for error messages
+            stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+            stderr_thread = threading.Thread(target=stderr_tail.extend, args=(process.stderr,), daemon=True)
+            stderr_thread.start()
+            
+            # Kill the MATLAB process if it hangs so it does not outlive the cycle
+            timed_out = threading.Event()
+            def expire():
+                timed_out.set()
+                self._kill_process(process)
+            timer = threading.Timer(self.script_timeout, expire)
+            timer.start()
             
-            # Parse the JSON output from MATLAB
+            count = 0
             try:
-                return json.loads(result.stdout)
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse MATLAB output: {result.stdout}")
-                raise
+                chunk = []
+                for record in iter_records(process.stdout, on_error=self._parse_error_reporter(script_name)):
+                    chunk.append(record)
+                    if len(chunk) >= chunk_size:
+                        on_results(self._normalize_results(chunk))
+                        count += len(chunk)
+                        chunk = []
+                if chunk:
+                    on_results(self._normalize_results(chunk))
+                    count += len(chunk)
+                process.wait()
+                stderr_thread.join()
+            finally:
+                timer.cancel()
+                if process.poll() is None:
+                    self._kill_process(process)
+                    process.wait()
+                with self._processes_lock:
+                    self._processes.discard(process)
+            
+            if timed_out.is_set():
+                raise TimeoutError(f"Script {script_name} timed out after {self.script_timeout} seconds")
+            if process.returncode != 0:
+                raise RuntimeError(f"Script execution failed: {''.join(stderr_tail)}")
+            return count
         except Exception as e:
             logger.error(f"Error running script {script_name}: {str(e)}", exc_info=True)
             raise
     
+    @staticmethod
+    def _parse_error_reporter(source):
+        """Build an ``iter_records`` error callback that logs bad lines from ``source``."""
+        def report(line_number, message, snippet):
+            logger.warning(f"Skipping unparseable line {line_number} from {source}: {message}: {snippet}")
+        return report
+    
+    @staticmethod
+    def _scid_argument(payload_id):
+        """Format a payload ID or list of payload IDs as a MATLAB argument."""
+        if payload_id is None:
+            return ''
+        if isinstance(payload_id, (list, tuple)):
+            return '[' + ' '.join(str(int(scid)) for scid in payload_id) + ']'
+        return str(int(payload_id))
+    
+    def run_function(self, metric_type, scid=0):
+        """Call a metric's monitor function on a warm pooled MATLAB engine.
+        
+        Args:
+            metric_type (str): Metric whose ``sample_<metric>_monitor`` function to call
+            scid (int | list, optional): Payload ID, or list of payload IDs, to
+                                         monitor; 0 for all payloads
+            
+        Returns:
+            dict: Function results
+        """
+        function_name = f"sample_{metric_type}_monitor"
+        try:
+            if self.engine_pool is None:
+                self.engine_pool = get_engine_pool(self.config)
+            argument = matlab_vector(scid) if isinstance(scid, (list, tuple)) else float(scid)
+            output = self.engine_pool.call(function_name, argument, timeout=self.script_timeout)
+            return {'results': list(iter_records(io.StringIO(output),
+                                                 on_error=self._parse_error_reporter(function_name)))}
+        except Exception as e:
+            logger.error(f"Error calling MATLAB function {function_name}: {str(e)}", exc_info=True)
+            raise
+    
     def _simulate_script_results(self, script_name, payload_id=None):
         """Simulate script results for testing.
         
@@ -76,20 +198,145 @@ class MatlabInterface:
             dict: Simulated results
         """
         # Generate some random data for testing
+        payload_ids = payload_id if isinstance(payload_id, (list, tuple)) else [payload_id or "101"]
         return {
             "results": [{
                 "timestamp": datetime.datetime.now(datetime.UTC),
-                "scid": payload_id or "101",
+                "scid": scid,
                 "metric_type": script_name.split('_')[1],
                 "value": random.uniform(20, 30),
                 "threshold": 25.0,
                 "status": "NORMAL"
-            }]
+            } for scid in payload_ids]
         }
     
+    def cancel_running_scripts(self):
+        """Kill any MATLAB processes that are still running."""
+        with self._processes_lock:
+            processes = list(self._processes)
+        for process in processes:
+            if process.poll() is None:
+                logger.warning(f"Cancelling MATLAB process {process.pid}")
+                self._kill_process(process)
+    
+    def _kill_process(self, process):
+        """Kill a MATLAB process along with any children it started."""
+        try:
+            if os.name == 'posix':
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            process.kill()
+    
+    def _normalize_results(self, metric_results):
+        """Extract the result list from a script's output and parse timestamps.
+        
+        Args:
+            metric_results (dict | list): Raw script output
+            
+        Returns:
+            list: Monitoring results with datetime timestamps
+        """
+        if isinstance(metric_results, dict) and 'results' in metric_results:
+            metric_results = metric_results['results']
+        if not isinstance(metric_results, list):
+            return []
+        
+        # Convert string timestamps to datetime objects
+        for result in metric_results:
+            if isinstance(result.get('timestamp'), str):
+                result['timestamp'] = datetime.datetime.fromisoformat(result['timestamp'].replace('Z', '+00:00'))
+        return metric_results
+    
+    def _payload_shards(self):
+        """Split the configured payloads into groups of MATLAB_SHARD_SIZE scids.
+        
+        Returns:
+            list: Lists of scids, or [None] to run each script once for all payloads
+        """
+        shard_size = self.config.get_matlab_shard_size()
+        scids = [payload['scid'] for payload in self.config.get_payloads() if 'scid' in payload]
+        if not shard_size or not scids:
+            return [None]
+        return [scids[i:i + shard_size] for i in range(0, len(scids), shard_size)]
+    
+    def _get_shard_executor(self):
+        """Get the worker pool shared by every sharded metric run."""
+        with self._shard_executor_lock:
+            if self._shard_executor is None:
+                self._shard_executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                          thread_name_prefix='matlab-shard')
+            return self._shard_executor
+    
+    def _run_shard(self, metric_type, scids, on_results):
+        """Run one metric's monitor for a group of payloads, or all of them.
+        
+        Returns:
+            int: Number of results handed to ``on_results``
+        """
+        if self.execution_mode == 'engine':
+            results = self._normalize_results(self.run_function(metric_type, scids or 0))
+            if results:
+                on_results(results)
+            return len(results)
+        return self.stream_script(f"sample_{metric_type}_monitor.m", scids, on_results)
+    
+    def monitor_metric(self, metric_type):
+        """Run one metric's monitor script or engine function.
+        
+        Args:
+            metric_type (str): Metric to monitor
+            
+        Returns:
+            list: Monitoring results with datetime timestamps
+        """
+        results = []
+        self.stream_metric(metric_type, results.extend)
+        return results
+    
+    def stream_metric(self, metric_type, on_results):
+        """Run one metric's monitor, handing results over in chunks as they arrive.
+        
+        With MATLAB_SHARD_SIZE set, the payloads are split into groups that
+        run in parallel on a pool of MATLAB_MAX_WORKERS threads shared by
+        every metric, so ``on_results`` may be called from several threads.
+        A failing group is logged and skipped; the metric only fails if every
+        group does.
+        
+        Args:
+            metric_type (str): Metric to monitor
+            on_results (callable): Called with each chunk of normalized results
+            
+        Returns:
+            int: Number of results handed over
+        """
+        shards = self._payload_shards()
+        if len(shards) == 1:
+            return self._run_shard(metric_type, shards[0], on_results)
+        
+        executor = self._get_shard_executor()
+        futures = {executor.submit(self._run_shard, metric_type, shard, on_results): shard for shard in shards}
+        count = 0
+        failures = 0
+        for future in as_completed(futures):
+            try:
+                count += future.result()
+            except Exception as e:
+                failures += 1
+                logger.error(f"Error monitoring {metric_type} for payloads {futures[future]}: {str(e)}")
+                if failures == len(futures):
+                    raise
+        return count
+    
     def monitor_all_metrics(self):
         """Monitor all configured metrics.
         
+        Scripts run concurrently on a bounded worker pool of
+        MATLAB_MAX_WORKERS threads, either as ``matlab -batch`` processes or,
+        in ``engine`` execution mode, as calls on the warm engine pool. Results are merged as each script
+        finishes, so a slow or failing metric does not hold up the others.
+        
         Returns:
             list: List of monitoring results for each metric
         """
@@ -98,28 +345,23 @@ class MatlabInterface:
             metrics = self.config.get_metrics()
             results = []
             
-            # Run monitoring for each metric
-            for metric_type in metrics:
-                try:
-                    metric_results = self.run_script(f"sample_{metric_type}_monitor.m")
-                    if isinstance(metric_results, dict) and 'results' in metric_results:
-                        # Convert string timestamps to datetime objects
-                        for result in metric_results['results']:
-                            if isinstance(result.get('timestamp'), str):
-                                result['timestamp'] = datetime.datetime.fromisoformat(result['timestamp'].replace('Z', '+00:00'))
-                        results.extend(metric_results['results'])
-                    elif isinstance(metric_results, list):
-                        # Convert string timestamps to datetime objects
-                        for result in metric_results:
-                            if isinstance(result.get('timestamp'), str):
-                                result['timestamp'] = datetime.datetime.fromisoformat(result['timestamp'].replace('Z', '+00:00'))
-                        results.extend(metric_results)
-                except Exception as e:
-                    logger.error(f"Error monitoring metric {metric_type}: {str(e)}")
-                    continue
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='matlab') as executor:
+                futures = {
+                    executor.submit(self.monitor_metric, metric_type): metric_type
+                    for metric_type in metrics
+                }
+                
+                for future in as_completed(futures):
+                    metric_type = futures[future]
+                    try:
+                        results.extend(future.result())
+                    except Exception as e:
+                        logger.error(f"Error monitoring metric {metric_type}: {str(e)}")
+                        continue
             return results
         except Exception as e:
             logger.error(f"Error monitoring metrics: {str(e)}", exc_info=True)
+            self.cancel_running_scripts()
             raise
     
 # Create a singleton instance
@@ -1,71 +1,121 @@
 from datetime import datetime
+import numpy as np
 from app.database import get_db
-from app.models.event import Event
+from app.services.status_matrix import get_status_matrix_builder
+from app.services.threshold_engine import get_threshold_engine
 from app.utils import get_logger
-from app.config import Config
 
 # Initialize logger
 logger = get_logger('services.monitor')
-config = Config()
 
 class MonitorService:
     """Service for handling monitoring and threshold checking."""
     
     def __init__(self):
         self.db = get_db()
+        self.threshold_engine = get_threshold_engine()
     
     def check_metrics(self, metrics_data):
-        """Check metrics against thresholds and log events."""
+        """Check metrics against thresholds and log events.
+        
+        Args:
+            metrics_data (list): Dicts with scid, metric_type, value and an
+                                 optional timestamp (datetime or ISO 8601
+                                 string), in time order
+        
+        Returns:
+            list: Logged events as dicts
+        """
         try:
-            events = []
+            rules = self.threshold_engine.get_rules()
+            scids, metric_types, values, timestamps = [], [], [], []
             
             for metric_data in metrics_data:
-                # Make sure scid is an integer
+                metric_type = metric_data.get('metric_type')
+                value = metric_data.get('value')
                 try:
                     scid = int(metric_data.get('scid'))
-                    metric_data['scid'] = scid  # Update the dict with integer value
                 except (ValueError, TypeError):
-                    scid = metric_data.get('scid')
-                
-                metric_type = metric_data.get('metric_type')
-                value = metric_data.get('value')
+                    scid = None
                 
                 if not all([scid, metric_type, value]):
                     logger.warning(f"Missing required metric data: {metric_data}")
                     continue
                 
-                # Get threshold from config
-                threshold = config.get_threshold(metric_type)
-                if threshold is None:
+                if metric_type not in rules.metric_index:
                     logger.warning(f"No threshold configured for metric type: {metric_type}")
                     continue
                 
-                # Determine status
-                status = 'BREACH' if value > threshold else 'NORMAL'
-                
-                # Create event
-                event = Event(
-                    scid=scid,
-                    metric_type=metric_type,
-                    timestamp=datetime.utcnow(),
-                    value=value,
-                    threshold=threshold,
-                    status=status
-                )
-                
-                # Save event to database
-                with self.db.get_session() as session:
-                    session.add(event)
-                    session.commit()
+                # Convert string timestamps to datetime objects
+                timestamp = metric_data.get('timestamp')
+                if isinstance(timestamp, str):
+                    try:
+                        timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                    except ValueError:
+                        logger.warning(f"Invalid timestamp format: {timestamp}")
+                        continue
                 
-                events.append(event)
-                logger.info(f"Logged {status} event for SCID {scid}, {metric_type}: {value} > {threshold}")
+                scids.append(scid)
+                metric_types.append(metric_type)
+                values.append(value)
+                timestamps.append(timestamp)
             
-            return events
+            return self.check_samples(scids, metric_types, values, timestamps, rules=rules)
         except Exception as e:
             logger.error(f"Error checking metrics: {str(e)}", exc_info=True)
             raise
     
+    def check_samples(self, scids, metric_types, values, timestamps=None, rules=None):
+        """Evaluate a batch of samples and log them as events in one transaction.
+        
+        Args:
+            scids (array-like): Spacecraft ID of each sample
+            metric_types (array-like): Metric type names, or metric indexes into
+                                       ``rules``
+            values (array-like): Sample values
+            timestamps (list, optional): Sample datetimes; missing ones default
+                                         to the current UTC time
+            rules (ThresholdRules, optional): Snapshot from
+                                              ThresholdEngine.get_rules that
+                                              integer indexes were taken from;
+                                              the current rules if omitted
+        
+        Returns:
+            list: Logged events as dicts
+        """
+        scids = np.asarray(scids, dtype=np.int64)
+        if not len(scids):
+            return []
+        
+        rules = rules or self.threshold_engine.get_rules()
+        metric_idx = np.asarray(metric_types)
+        if metric_idx.dtype.kind not in 'iu':
+            metric_idx = rules.indexes(metric_types)
+        
+        values = np.asarray(values, dtype=np.float64)
+        breach, thresholds = self.threshold_engine.evaluate(scids, metric_idx, values, rules=rules)
+        
+        now = datetime.utcnow()
+        if timestamps is None:
+            timestamps = [now] * len(values)
+        # Label with the snapshot the indexes belong to, even if the config was reloaded since
+        names = rules.metric_types
+        events = [{
+            'scid': scid,
+            'metric_type': names[index],
+            'timestamp': timestamp or now,
+            'value': value,
+            'threshold': threshold,
+            'status': 'BREACH' if is_breach else 'NORMAL'
+        } for scid, index, value, threshold, is_breach, timestamp in zip(
+            scids.tolist(), metric_idx.tolist(), values.tolist(),
+            thresholds.tolist(), breach.tolist(), timestamps
+        )]
+        
+        self.db.log_triggers(events)
+        logger.info(f"Checked {len(events)} samples, {int(breach.sum())} breaches")
+        return events
+    
     def log_monitoring_results(self, results):
         """Log monitoring results to the database.
         
@@ -94,17 +144,10 @@ class MonitorService:
                         logger.error(f"Invalid timestamp format: {timestamp}")
                         continue
                 
-                # Log to database via the db.log_trigger method
-                self.db.log_trigger(
-                    scid=result['scid'],
-                    metric_type=result['metric_type'],
-                    timestamp=timestamp,
-                    value=result['value'],
-                    threshold=result['threshold'],
-                    status=result['status']
-                )
-                
-                events.append(result)
+                events.append({**result, 'timestamp': timestamp})
+            
+            # Log the whole batch to the database in one transaction
+            self.db.log_triggers(events)
             
             logger.info(f"Successfully logged {len(events)} events")
             return events
@@ -114,97 +157,16 @@ class MonitorService:
             raise
     
     def get_current_status(self, filters=None):
-        """Get current status for all payloads and metrics."""
-        try:
-            # Get latest statuses from database
-            latest_statuses = self.db.get_latest_statuses(filters=filters)
-            logger.info(f"Found {len(latest_statuses)} latest statuses")
-            
-            # Get all payloads and metrics from config
-            payloads = config.get_payloads()
-            metrics = config.get_metrics()
-            
-            logger.info(f"Config loaded: {len(payloads)} payloads and {len(metrics)} metrics")
-            
-            # Create status matrix
-            status_matrix = {}
-            for payload in payloads:
-                scid = payload['scid']
-                status_matrix[scid] = {
-                    'name': payload['name'],
-                    'metrics': {}
-                }
-                
-                # Initialize all metrics as NORMAL
-                for metric_name, metric_config in metrics.items():
-                    threshold = metric_config.get('threshold', 0)
-                    status_matrix[scid]['metrics'][metric_name] = {
-                        'status': 'NORMAL',
-                        'threshold': threshold,
-                        'count': 0
-                    }
-                    logger.debug(f"Initialized metric {metric_name} for payload {scid} with threshold {threshold}")
-            
-            # Log the set of SCIDs and metric types available in the status matrix
-            scids_in_matrix = set(status_matrix.keys())
-            metric_types_in_matrix = set()
-            for payload_data in status_matrix.values():
-                metric_types_in_matrix.update(payload_data['metrics'].keys())
-            
-            logger.info(f"Status matrix initialized with SCIDs: {scids_in_matrix}")
-            logger.info(f"Status matrix initialized with metric types: {metric_types_in_matrix}")
-            
-            # Update status matrix with latest statuses
-            for status in latest_statuses:
-                scid = status.scid
-                metric_type = status.metric_type
-                
-                # Convert to int if the scid is numeric 
-                # (sometimes the database might return it as a string)
-                try:
-                    scid = int(scid)
-                except (ValueError, TypeError):
-                    pass
-                    
-                if scid in status_matrix and metric_type in status_matrix[scid]['metrics']:
-                    status_matrix[scid]['metrics'][metric_type]['status'] = status.status
-                    logger.debug(f"Updated status for {scid} {metric_type}: {status.status}")
-                else:
-                    logger.warning(f"SCID {scid} or metric {metric_type} not found in status matrix")
-            
-            # Get breach counts
-            breach_counts = self.db.get_breach_counts(filters=filters)
-            logger.info(f"Found {len(breach_counts)} breach count records")
-            
-            # Log all breach counts for debugging
-            for breach in breach_counts:
-                logger.info(f"Breach count: SCID {breach.scid}, metric {breach.metric_type}, count {breach.count}")
-            
-            # Update breach counts in status matrix
-            for breach in breach_counts:
-                scid = breach.scid
-                metric_type = breach.metric_type
-                count = breach.count
-                
-                # Convert to int if the scid is numeric
-                try:
-                    scid = int(scid)
-                except (ValueError, TypeError):
-                    pass
-                    
-                if scid in status_matrix and metric_type in status_matrix[scid]['metrics']:
-                    status_matrix[scid]['metrics'][metric_type]['count'] = count
-                    # If there are breaches, ensure the status is set to BREACH
-                    if count > 0:
-                        status_matrix[scid]['metrics'][metric_type]['status'] = 'BREACH'
-                    logger.debug(f"Updated breach count for {scid} {metric_type}: {count}")
-                else:
-                    logger.warning(f"For breach count: SCID {scid} or metric {metric_type} not found in status matrix")
-            
-            return status_matrix
-        except Exception as e:
-            logger.error(f"Error getting current status: {str(e)}", exc_info=True)
-            raise
+        """Get current status for all payloads and metrics.
+        
+        Args:
+            filters (dict, optional): ``date_from`` and ``date_to`` (YYYY-MM-DD)
+        
+        Returns:
+            dict: {scid: {'name', 'metrics': {metric_type: {'status', 'threshold', 'count'}}}}
+        """
+        filters = filters or {}
+        return get_status_matrix_builder().build(filters.get('date_from'), filters.get('date_to')).to_dict()
 
 # Create a singleton instance
 monitor_service = MonitorService()
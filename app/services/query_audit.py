@@ -0,0 +1,103 @@
+"""Query plan audit for the hot dashboard and event list queries.
+
+Explains the queries the services actually issue (``EXPLAIN QUERY PLAN`` on
+SQLite, ``EXPLAIN`` on PostgreSQL) and flags any that fall back to a full
+table scan instead of using an index.
+"""
+
+import re
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app.database import get_db
+from app.database.pagination import apply_keyset, encode_cursor
+from app.models.event import EVENT_COLUMNS, Event
+from app.services.event_service import get_event_service
+from app.utils import get_logger
+
+# Initialize logger
+logger = get_logger('services.query_audit')
+
+# Tables bounded by payloads x metrics, where reading every row is expected
+BOUNDED_TABLES = ('latest_status',)
+
+# Dialects whose query plans explain_hot_queries understands
+SUPPORTED_DIALECTS = ('sqlite', 'postgresql')
+
+# A PostgreSQL sequential scan node and the table it reads
+PG_SEQ_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+def _hot_queries(db, session):
+    """Yield (name, query) for each query the services run on hot paths."""
+    event_service = get_event_service()
+    date_to = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    date_from = date_to - timedelta(days=61)
+    date_filters = {'date_from': date_from.strftime('%Y-%m-%d'), 'date_to': date_to.strftime('%Y-%m-%d')}
+    cursor = encode_cursor('timestamp', 'DESC', date_to, 1, 'next')
+
+    def events(filters, sort_by='timestamp', sort_order='DESC', cursor=None):
+        conditions = event_service._event_conditions(event_service._normalize_filters(filters))
+        query, _ = apply_keyset(select(*EVENT_COLUMNS), Event, sort_by, sort_order, cursor, conditions)
+        return query.limit(26)
+
+    yield 'events: date range', events(date_filters)
+    yield 'events: date range, next page', events(date_filters, cursor=cursor)
+    yield 'events: payload and metric', events({**date_filters, 'scid': 101, 'metric_type': 'thermal'})
+    yield 'events: payload', events({**date_filters, 'scid': 101})
+    yield 'events: status', events({**date_filters, 'status': 'BREACH'})
+    yield 'breach history', event_service._breach_history_query(101, 'thermal', date_from, date_to)
+    yield 'latest statuses', db.latest_status_query(session, date_filters)
+    yield 'breach counts', db.breach_counts_query(session, date_filters)
+    yield 'status matrix', db.status_cells_query(date_filters)
+
+def _sqlite_plan(connection, sql):
+    """Get SQLite's plan lines and whether any of them is a table scan."""
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    plan = [row[-1] for row in rows]
+    # "SCAN <table>" without an index is a full table scan
+    scans = any(
+        line.startswith('SCAN ') and 'INDEX' not in line
+        and line.split()[1] not in BOUNDED_TABLES
+        for line in plan
+    )
+    return plan, scans
+
+def _postgresql_plan(connection, sql):
+    """Get PostgreSQL's plan lines and whether any of them is a sequential scan."""
+    rows = connection.exec_driver_sql(f"EXPLAIN {sql}").fetchall()
+    plan = [row[0].strip() for row in rows]
+    scans = any(
+        match.group(1) not in BOUNDED_TABLES
+        for match in (PG_SEQ_SCAN.search(line) for line in plan)
+        if match
+    )
+    return plan, scans
+
+def explain_hot_queries(db=None):
+    """Explain each hot query and report whether it avoids a table scan.
+
+    Args:
+        db (Database, optional): Database to explain against, the app database by default
+
+    Returns:
+        list: Dicts with name, plan (list of plan lines) and uses_index
+
+    Raises:
+        ValueError: If the database dialect is not in SUPPORTED_DIALECTS
+    """
+    db = db or get_db()
+    dialect = db.engine.dialect
+    if dialect.name not in SUPPORTED_DIALECTS:
+        raise ValueError(f"Query plan audit does not support the {dialect.name} dialect")
+    explain = _sqlite_plan if dialect.name == 'sqlite' else _postgresql_plan
+
+    report = []
+    with db.get_session() as session:
+        for name, query in _hot_queries(db, session):
+            # ORM queries wrap a statement; Core selects are one
+            statement = getattr(query, 'statement', query)
+            sql = str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+            plan, scans = explain(session.connection(), sql)
+            report.append({'name': name, 'plan': plan, 'uses_index': not scans})
+            if scans:
+                logger.warning(f"Query '{name}' scans a table: {plan}")
+    return report
@@ -0,0 +1,217 @@
+"""Time-based retention for the events table.
+
+Raw NORMAL events are kept for RETENTION_RAW_DAYS and BREACH events for
+RETENTION_BREACH_DAYS. Older events are exported to gzip-compressed NDJSON
+archives, folded into the hourly min/max/mean rollup and then deleted, one
+small batch per transaction so ingestion and dashboard reads never wait long
+for the write lock. latest_status and breach_daily_counts are left intact.
+"""
+
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import case, delete, select
+from app.config import Config, bump_generation
+from app.database import get_db
+from app.models.event import Event, BreachHistory
+from app.models.rollup import EventHourlyRollup
+from app.utils import get_logger
+
+# Initialize logger
+logger = get_logger('services.retention')
+
+# Seconds to pause between batches so other writers can take the lock
+BATCH_PAUSE = 0.05
+
+class RetentionService:
+    """Service that expires, downsamples and archives old events."""
+    
+    def __init__(self):
+        self.config = Config()
+        self.db = get_db()
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def get_cutoffs(self, now=None):
+        """Get the timestamp before which events of each status expire.
+        
+        Args:
+            now (datetime, optional): Reference time, defaults to the current UTC time
+        
+        Returns:
+            dict: Cutoff datetime keyed by status ('NORMAL' and 'BREACH')
+        """
+        policy = self.config.get_retention_policy()
+        now = now or datetime.utcnow()
+        return {
+            'NORMAL': now - timedelta(days=policy['raw_days']),
+            'BREACH': now - timedelta(days=policy['breach_days'])
+        }
+    
+    def run_once(self, max_batches=None, now=None):
+        """Expire every event past its retention period.
+        
+        Args:
+            max_batches (int, optional): Stop after this many batches per status,
+                                         leaving the rest for the next run
+            now (datetime, optional): Reference time for the cutoffs
+        
+        Returns:
+            dict: Number of events removed keyed by status
+        """
+        policy = self.config.get_retention_policy()
+        removed = {}
+        
+        with self._run_lock:
+            for status, cutoff in self.get_cutoffs(now).items():
+                removed[status] = 0
+                batches = 0
+                while max_batches is None or batches < max_batches:
+                    count = self._expire_batch(status, cutoff, policy['batch_size'], policy['archive_path'])
+                    if not count:
+                        break
+                    removed[status] += count
+                    batches += 1
+                    if self._stop.wait(BATCH_PAUSE):
+                        break
+        
+        if any(removed.values()):
+            bump_generation()
+            logger.info(f"Retention removed {removed['NORMAL']} NORMAL and {removed['BREACH']} BREACH events")
+        return removed
+    
+    def _expire_batch(self, status, cutoff, batch_size, archive_path):
+        """Archive, roll up and delete the oldest batch of expired events."""
+        with self.db.get_session() as session:
+            rows = session.execute(
+                select(Event.id, Event.scid, Event.metric_type, Event.timestamp,
+                       Event.value, Event.threshold, Event.status)
+                .where(Event.status == status, Event.timestamp < cutoff)
+                .order_by(Event.timestamp, Event.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return 0
+            
+            # The archive is synced to disk before the rows are deleted, so a
+            # crash can only repeat rows in an archive, never lose them
+            if archive_path:
+                self._archive(rows, archive_path)
+            
+            self._merge_hourly(session, rows)
+            
+            event_ids = [row.id for row in rows]
+            if status == 'BREACH':
+                session.execute(delete(BreachHistory).where(BreachHistory.event_id.in_(event_ids)))
+            session.execute(delete(Event).where(Event.id.in_(event_ids)))
+            session.commit()
+        
+        return len(rows)
+    
+    def _archive(self, rows, archive_path):
+        """Append rows to one gzip NDJSON archive per event day."""
+        os.makedirs(archive_path, exist_ok=True)
+        
+        by_day = {}
+        for row in rows:
+            by_day.setdefault(row.timestamp.date(), []).append(row)
+        
+        for day, day_rows in by_day.items():
+            path = os.path.join(archive_path, f"events-{day.isoformat()}.ndjson.gz")
+            lines = ''.join(
+                json.dumps({
+                    'id': row.id,
+                    'scid': row.scid,
+                    'metric_type': row.metric_type,
+                    'timestamp': row.timestamp.isoformat(),
+                    'value': row.value,
+                    'threshold': row.threshold,
+                    'status': row.status
+                }) + '\n'
+                for row in day_rows
+            )
+            # Each append adds a gzip member; readers treat them as one stream
+            with open(path, 'ab') as f:
+                with gzip.GzipFile(fileobj=f, mode='ab') as archive:
+                    archive.write(lines.encode())
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def _merge_hourly(self, session, rows):
+        """Fold rows into their (scid, metric, hour) buckets in event_hourly_rollups."""
+        buckets = {}
+        for row in rows:
+            key = (row.scid, row.metric_type, row.timestamp.replace(minute=0, second=0, microsecond=0))
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = {
+                    'scid': key[0],
+                    'metric_type': key[1],
+                    'hour': key[2],
+                    'count': 0,
+                    'breach_count': 0,
+                    'min_value': row.value,
+                    'max_value': row.value,
+                    'sum_value': 0.0
+                }
+            bucket['count'] += 1
+            bucket['breach_count'] += row.status == 'BREACH'
+            bucket['min_value'] = min(bucket['min_value'], row.value)
+            bucket['max_value'] = max(bucket['max_value'], row.value)
+            bucket['sum_value'] += row.value
+        
+        stmt = self.db._upsert(EventHourlyRollup)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EventHourlyRollup.scid, EventHourlyRollup.metric_type, EventHourlyRollup.hour],
+            set_={
+                'count': EventHourlyRollup.count + excluded.count,
+                'breach_count': EventHourlyRollup.breach_count + excluded.breach_count,
+                'min_value': case((excluded.min_value < EventHourlyRollup.min_value, excluded.min_value),
+                                  else_=EventHourlyRollup.min_value),
+                'max_value': case((excluded.max_value > EventHourlyRollup.max_value, excluded.max_value),
+                                  else_=EventHourlyRollup.max_value),
+                'sum_value': EventHourlyRollup.sum_value + excluded.sum_value
+            }
+        )
+        session.execute(stmt, list(buckets.values()))
+    
+    def start(self, interval=None):
+        """Run retention in a background thread every ``interval`` seconds.
+        
+        Args:
+            interval (int, optional): Seconds between runs, defaults to RETENTION_INTERVAL
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        interval = interval or self.config.get_retention_policy()['interval']
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_forever, args=(interval,),
+                                        name='retention', daemon=True)
+        self._thread.start()
+        logger.info(f"Started background retention every {interval} seconds")
+    
+    def stop(self):
+        """Stop the background thread after its current batch."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+    
+    def _run_forever(self, interval):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Error running retention: {str(e)}", exc_info=True)
+            self._stop.wait(interval)
+
+# Create a singleton instance
+retention_service = RetentionService()
+
+def get_retention_service():
+    """Get the singleton retention service instance."""
+    return retention_service
@@ -0,0 +1,157 @@
+"""Fixed-rate scheduler for metric monitors.
+
+Each metric runs every ``interval`` seconds from its metrics config entry
+(REFRESH_INTERVAL when it has none). Due times are kept in a heap and advance
+by whole intervals from the previous due time, not from when a run finished,
+so slow runs never push the schedule back. A metric whose previous run is
+still in flight when it comes due skips that tick instead of piling up, and
+the delay between due time and the run starting on a worker thread is
+reported as schedule lag, so time spent queued behind other runs counts.
+"""
+
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.config import get_config
+from app.database import get_db
+from app.services.matlab_interface import get_matlab
+from app.utils import get_logger
+
+# Initialize logger
+logger = get_logger('services.scheduler')
+
+# Longest sleep between checks of the config for added or removed metrics
+MAX_WAIT = 5.0
+
+# Shortest allowed interval in seconds
+MIN_INTERVAL = 1.0
+
+# Lag, as a fraction of the metric's interval, above which a run is logged as late
+LAG_WARNING_RATIO = 0.1
+
+class MonitorScheduler:
+    """Runs every configured metric on its own fixed-rate schedule."""
+    
+    def __init__(self, config=None):
+        self.config = config or get_config()
+        self._lock = threading.Lock()
+        self._running = set()
+        self._stats = {}
+    
+    def get_stats(self):
+        """Get per-metric run statistics.
+        
+        Returns:
+            dict: Keyed by metric type, with ``runs``, ``skipped``, ``failures``,
+                  ``last_lag``, ``max_lag`` and ``last_duration`` (seconds)
+        """
+        with self._lock:
+            return {metric_type: dict(stats) for metric_type, stats in self._stats.items()}
+    
+    def run(self, stop_event=None):
+        """Schedule metrics until ``stop_event`` is set.
+        
+        Runs share a pool of MATLAB_MAX_WORKERS threads. Every metric is due
+        immediately on start.
+        
+        Args:
+            stop_event (threading.Event, optional): Set to stop scheduling; runs
+                                                    in flight are waited for
+        """
+        stop_event = stop_event or threading.Event()
+        heap = []
+        scheduled = set()
+        
+        logger.info("Starting metric scheduler")
+        with ThreadPoolExecutor(max_workers=self.config.get_matlab_max_workers(),
+                                thread_name_prefix='monitor') as executor:
+            while not stop_event.is_set():
+                now = time.monotonic()
+                metrics = self.config.get_metrics()
+                
+                # Pick up metrics added to the config since the last pass
+                for metric_type in metrics:
+                    if metric_type not in scheduled:
+                        scheduled.add(metric_type)
+                        heapq.heappush(heap, (now, metric_type))
+                
+                if not heap:
+                    stop_event.wait(MAX_WAIT)
+                    continue
+                
+                due, metric_type = heap[0]
+                if due > now:
+                    stop_event.wait(min(due - now, MAX_WAIT))
+                    continue
+                heapq.heappop(heap)
+                
+                # Metrics removed from the config drop out of the schedule
+                if metric_type not in metrics:
+                    scheduled.discard(metric_type)
+                    continue
+                
+                interval = max(self.config.get_metric_interval(metric_type), MIN_INTERVAL)
+                with self._lock:
+                    stats = self._stats.setdefault(metric_type, {
+                        'runs': 0, 'skipped': 0, 'failures': 0,
+                        'last_lag': 0.0, 'max_lag': 0.0, 'last_duration': None
+                    })
+                    overlapping = metric_type in self._running
+                    if overlapping:
+                        stats['skipped'] += 1
+                    else:
+                        self._running.add(metric_type)
+                
+                if overlapping:
+                    logger.warning(f"Skipping {metric_type}: previous run still in progress")
+                else:
+                    executor.submit(self._run_metric, metric_type, due, interval)
+                
+                # Advance by whole intervals; ticks already missed are skipped
+                missed = int((now - due) // interval)
+                if missed:
+                    with self._lock:
+                        stats['skipped'] += missed
+                    logger.warning(f"Metric {metric_type} missed {missed} scheduled runs")
+                heapq.heappush(heap, (due + (missed + 1) * interval, metric_type))
+        logger.info("Metric scheduler stopped")
+    
+    def _run_metric(self, metric_type, due, interval):
+        """Run one metric, logging its results in chunks as the script produces them.
+        
+        Args:
+            metric_type (str): Metric to run
+            due (float): Monotonic time the run was scheduled for
+            interval (float): The metric's interval in seconds
+        """
+        start = time.monotonic()
+        lag = start - due
+        with self._lock:
+            stats = self._stats[metric_type]
+            stats['last_lag'] = lag
+            stats['max_lag'] = max(stats['max_lag'], lag)
+        if lag > interval * LAG_WARNING_RATIO:
+            logger.warning(f"Metric {metric_type} started {lag:.1f}s behind schedule")
+        
+        failed = False
+        try:
+            count = get_matlab().stream_metric(metric_type, get_db().log_triggers)
+            logger.info(f"Monitored {metric_type}: {count} results, lag {lag:.2f}s")
+        except Exception as e:
+            failed = True
+            logger.error(f"Error monitoring metric {metric_type}: {str(e)}")
+        finally:
+            with self._lock:
+                self._running.discard(metric_type)
+                stats = self._stats[metric_type]
+                stats['runs'] += 1
+                stats['failures'] += failed
+                stats['last_duration'] = time.monotonic() - start
+
+# Create a singleton instance
+scheduler = MonitorScheduler()
+
+def get_scheduler():
+    """Get the singleton metric scheduler instance."""
+    return scheduler
@@ -0,0 +1,178 @@
+"""Fan-out of live status matrix updates to dashboard streams.
+
+One watcher thread polls the ingestion generation. When it changes, the status
+matrix is rebuilt once per date window that has subscribers, diffed against
+the previous matrix and the changed cells are queued for every subscriber of
+that window, however many browser tabs are open.
+"""
+
+import queue
+import threading
+import time
+from datetime import datetime
+from app.config import get_config, get_generation
+from app.services.status_matrix import get_status_matrix_builder
+from app.utils import get_logger
+
+# Initialize logger
+logger = get_logger('services.status_broker')
+
+# Seconds between checks of the ingestion generation
+POLL_INTERVAL = 1.0
+
+# Updates buffered per subscriber before it is considered stalled and dropped
+SUBSCRIBER_QUEUE_SIZE = 16
+
+def _message(generation, cells, full=False):
+    return {
+        'generation': generation,
+        'full': full,
+        'timestamp': datetime.utcnow().isoformat(),
+        'cells': [
+            {'scid': scid, 'metric_type': metric_type, 'status': status, 'count': count}
+            for (scid, metric_type), (status, count) in cells.items()
+        ]
+    }
+
+class StatusBroker:
+    """Publishes status matrix deltas to subscribers after each ingestion."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (date_from, date_to) -> {'generation', 'cells', 'subscribers'}
+        self._windows = {}
+        self._subscribers = 0
+        self._thread = None
+    
+    def subscribe(self, date_from, date_to, since=None):
+        """Subscribe to updates of the status matrix for one date window.
+        
+        Args:
+            date_from (str): Start date (YYYY-MM-DD)
+            date_to (str): End date (YYYY-MM-DD)
+            since (int, optional): Generation the caller last rendered. If the
+                                   matrix has moved on since, the first message
+                                   carries every cell.
+        
+        Returns:
+            queue.Queue: Messages for this subscriber, or None when
+                         STREAM_MAX_CONNECTIONS subscriptions are already open.
+                         A None message means the subscription was dropped
+                         and should be reopened.
+        """
+        limit = get_config().get_stream_max_connections()
+        with self._lock:
+            if limit and self._subscribers >= limit:
+                logger.warning(f"Refusing stream subscription, {self._subscribers} of {limit} already open")
+                return None
+            self._subscribers += 1
+        
+        try:
+            key = (date_from, date_to)
+            subscription = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+            cells = None
+            while True:
+                with self._lock:
+                    window = self._windows.get(key)
+                    if window is None and cells is not None:
+                        window = self._windows[key] = {
+                            'generation': generation,
+                            'cells': cells,
+                            'subscribers': set()
+                        }
+                    if window is not None:
+                        window['subscribers'].add(subscription)
+                        if since is not None and since != window['generation']:
+                            subscription.put_nowait(_message(window['generation'], window['cells'], full=True))
+                        break
+                # Build the first matrix outside the lock, then look again: a
+                # concurrent subscriber to the same window may have won the race
+                generation = get_generation()
+                cells = self._load_cells(key)
+        except Exception:
+            with self._lock:
+                self._subscribers -= 1
+            raise
+        self._ensure_watcher()
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        """Remove a subscription, forgetting windows nobody watches.
+        
+        Frees its connection slot, including for subscriptions the broker
+        already dropped because they stalled.
+        """
+        with self._lock:
+            self._subscribers -= 1
+            for key, window in list(self._windows.items()):
+                window['subscribers'].discard(subscription)
+                if not window['subscribers']:
+                    del self._windows[key]
+    
+    def get_subscriber_count(self):
+        """Get the number of open subscriptions in this process."""
+        with self._lock:
+            return self._subscribers
+    
+    def _load_cells(self, key):
+        date_from, date_to = key
+        return get_status_matrix_builder().build(date_from, date_to).cells()
+    
+    def _ensure_watcher(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._watch, name='status-broker', daemon=True)
+                self._thread.start()
+    
+    def _watch(self):
+        generation = get_generation()
+        while True:
+            time.sleep(POLL_INTERVAL)
+            current = get_generation()
+            if current == generation:
+                continue
+            generation = current
+            try:
+                self.publish(generation)
+            except Exception as e:
+                logger.error(f"Error publishing status updates: {str(e)}", exc_info=True)
+    
+    def publish(self, generation):
+        """Diff every watched window against the database and queue the changes.
+        
+        Args:
+            generation (int): Ingestion generation the update belongs to
+        """
+        with self._lock:
+            keys = list(self._windows)
+        
+        for key in keys:
+            cells = self._load_cells(key)
+            with self._lock:
+                window = self._windows.get(key)
+                if window is None:
+                    continue
+                changed = {
+                    cell: value for cell, value in cells.items()
+                    if window['cells'].get(cell) != value
+                }
+                window['cells'] = cells
+                window['generation'] = generation
+                message = _message(generation, changed)
+                for subscription in list(window['subscribers']):
+                    try:
+                        subscription.put_nowait(message)
+                    except queue.Full:
+                        # A stalled client is dropped; its browser reconnects
+                        window['subscribers'].discard(subscription)
+                        with subscription.mutex:
+                            subscription.queue.clear()
+                        subscription.put_nowait(None)
+            logger.debug("Published %s changed cells for window %s", len(changed), key)
+
+# Create a singleton instance
+status_broker = StatusBroker()
+
+def get_status_broker():
+    """Get the singleton status broker instance."""
+    return status_broker
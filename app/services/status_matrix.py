@@ -0,0 +1,191 @@
+"""Array-backed dashboard status matrix.
+
+The dashboard, the status stream and the legacy nested-dict API all read the
+same payload x metric matrix. StatusMatrixBuilder loads it with a single
+query (latest statuses UNION ALL windowed breach counts) into two NumPy
+arrays, and memoizes it per (date_from, date_to) until the next ingestion, so
+every page render and stream update for a window shares one build.
+"""
+
+import numpy as np
+from app.config import get_config, memoize
+from app.database import get_db
+from app.utils import get_logger
+
+# Initialize logger
+logger = get_logger('services.status_matrix')
+
+# Status names of the codes in StatusMatrix.status; other statuses found in
+# the database are appended per matrix
+STATUSES = ('NORMAL', 'BREACH')
+
+# Code of the BREACH status
+BREACH = STATUSES.index('BREACH')
+
+class StatusMatrix:
+    """Status and breach count of every configured metric for every payload.
+    
+    Rows are metrics and columns are payloads, both in config order.
+    Matrices are cached and shared between requests and must not be modified.
+    """
+    
+    def __init__(self, scids, names, metric_types, thresholds, statuses, status, counts):
+        self.scids = scids
+        self.names = names
+        self.metric_types = metric_types
+        self.thresholds = thresholds
+        self.statuses = statuses
+        # int8 codes into self.statuses, shape (metrics, payloads)
+        self.status = status
+        # int64 breach counts within the window, shape (metrics, payloads)
+        self.counts = counts
+    
+    def payloads(self):
+        """Get the matrix columns.
+        
+        Returns:
+            list: (scid, name) tuples
+        """
+        return list(zip(self.scids, self.names))
+    
+    def rows(self):
+        """Iterate over the matrix one metric at a time.
+        
+        Yields:
+            tuple: (metric_type, threshold, cells) where cells is a list of
+                   (scid, status, count) tuples, one per payload
+        """
+        statuses = self.statuses
+        for metric_type, threshold, status, counts in zip(
+            self.metric_types, self.thresholds, self.status.tolist(), self.counts.tolist()
+        ):
+            yield metric_type, threshold, [
+                (scid, statuses[code], count)
+                for scid, code, count in zip(self.scids, status, counts)
+            ]
+    
+    def totals(self):
+        """Get the breach count of each metric summed over all payloads.
+        
+        Returns:
+            list: Counts in metric order
+        """
+        return self.counts.sum(axis=1).tolist()
+    
+    def summary(self):
+        """Summarize the matrix.
+        
+        Returns:
+            dict: Number of payloads and metrics, total breaches and cells in breach
+        """
+        return {
+            'payloads': len(self.scids),
+            'metrics': len(self.metric_types),
+            'breaches': int(self.counts.sum()),
+            'breach_cells': int((self.status == BREACH).sum())
+        }
+    
+    def cells(self):
+        """Flatten the matrix into {(scid, metric_type): (status, count)}."""
+        cells = {}
+        for metric_type, _, row in self.rows():
+            for scid, status, count in row:
+                cells[(scid, metric_type)] = (status, count)
+        return cells
+    
+    def to_dict(self):
+        """Convert to the nested {scid: {'name', 'metrics': {metric: cell}}} dict.
+        
+        Returns:
+            dict: A new dict, safe for the caller to modify
+        """
+        matrix = {
+            scid: {'name': name, 'metrics': {}}
+            for scid, name in self.payloads()
+        }
+        for metric_type, threshold, row in self.rows():
+            for scid, status, count in row:
+                matrix[scid]['metrics'][metric_type] = {
+                    'status': status,
+                    'threshold': threshold,
+                    'count': count
+                }
+        return matrix
+
+class StatusMatrixBuilder:
+    """Builds status matrices from the latest_status and breach_daily_counts tables."""
+    
+    def __init__(self, config=None):
+        self.config = config or get_config()
+        self.db = get_db()
+    
+    @memoize(timeout=300)
+    def build(self, date_from=None, date_to=None):
+        """Build the status matrix for a date window.
+        
+        Cells without a latest status in the window are NORMAL; cells with
+        breaches in the window are BREACH whatever their latest status.
+        
+        Args:
+            date_from (str, optional): Start date (YYYY-MM-DD)
+            date_to (str, optional): End date (YYYY-MM-DD), exclusive
+        
+        Returns:
+            StatusMatrix: Shared between callers; must not be modified
+        """
+        try:
+            payloads = self.config.get_payloads()
+            metrics = self.config.get_metrics()
+            scids = [payload['scid'] for payload in payloads]
+            column = {scid: j for j, scid in enumerate(scids)}
+            row = {metric_type: i for i, metric_type in enumerate(metrics)}
+            
+            statuses = list(STATUSES)
+            codes = {name: code for code, name in enumerate(statuses)}
+            status = np.zeros((len(row), len(column)), dtype=np.int8)
+            counts = np.zeros((len(row), len(column)), dtype=np.int64)
+            
+            cells = self.db.get_status_cells(
+                filters={'date_from': date_from, 'date_to': date_to}
+            )
+            unknown = 0
+            for scid, metric_type, name, count in cells:
+                i = row.get(metric_type)
+                j = column.get(scid)
+                if i is None or j is None:
+                    unknown += 1
+                    continue
+                if name is None:
+                    counts[i, j] = count
+                    continue
+                if name not in codes:
+                    codes[name] = len(statuses)
+                    statuses.append(name)
+                status[i, j] = codes[name]
+            
+            # Breaches within the window override the latest status
+            status[counts > 0] = BREACH
+            
+            if unknown:
+                logger.warning(f"Ignored {unknown} status rows for payloads or metrics missing from the config")
+            logger.info(f"Built status matrix for {len(column)} payloads x {len(row)} metrics from {len(cells)} rows")
+            
+            return StatusMatrix(
+                scids=scids,
+                names=[payload['name'] for payload in payloads],
+                metric_types=list(metrics),
+                thresholds=[metric_config.get('threshold', 0) for metric_config in metrics.values()],
+                statuses=statuses,
+                status=status,
+                counts=counts
+            )
+        except Exception as e:
+            logger.error(f"Error building status matrix: {str(e)}", exc_info=True)
+            raise
+
+# Create a singleton instance
+status_matrix_builder = StatusMatrixBuilder()
+
+def get_status_matrix_builder():
+    """Get the singleton status matrix builder instance."""
+    return status_matrix_builder
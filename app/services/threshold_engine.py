@@ -0,0 +1,217 @@
+"""Vectorized threshold evaluation.
+
+Samples are evaluated as NumPy arrays of (scid, metric index, value), so a
+batch of high-rate telemetry costs a handful of array operations rather than
+a Python branch and config lookup per sample. Each metric in the metrics
+config may define:
+
+- ``threshold``: upper bound, breached when the value is above it
+- ``lower``: lower bound, breached when the value is below it
+- ``hysteresis``: once breached, the value must come back inside the bounds
+  by this margin before the breach clears
+- ``debounce``: number of consecutive breaching samples needed before a
+  sample is reported as BREACH
+
+Hysteresis and debounce state is kept per (scid, metric) between batches,
+and forgotten for a metric when its rule changes. Samples of one
+(scid, metric) must be passed in time order.
+
+Metric indexes belong to one ThresholdRules snapshot; a config reload builds
+a new snapshot whose indexes may differ. Callers that map names to indexes
+themselves pass the snapshot they used to ``evaluate``.
+"""
+
+import threading
+import numpy as np
+from app.config import get_config
+from app.utils import get_logger
+
+# Initialize logger
+logger = get_logger('services.threshold_engine')
+
+# Keys of a metric's config that affect its evaluation
+RULE_KEYS = ('threshold', 'lower', 'hysteresis', 'debounce')
+
+class ThresholdRules:
+    """Rule arrays for one version of the metrics config, indexed by metric."""
+    
+    def __init__(self, metrics):
+        names = list(metrics)
+        self.metrics = metrics
+        self.metric_types = names
+        self.metric_index = {name: i for i, name in enumerate(names)}
+        self.upper = np.array([float(metrics[name].get('threshold', 0)) for name in names], dtype=np.float64)
+        self.lower = np.array([float(metrics[name].get('lower', -np.inf)) for name in names], dtype=np.float64)
+        self.hysteresis = np.array([float(metrics[name].get('hysteresis', 0)) for name in names], dtype=np.float64)
+        self.debounce = np.array([max(1, int(metrics[name].get('debounce', 1))) for name in names], dtype=np.int64)
+    
+    def rule(self, metric_type):
+        """Get the settings of a metric that affect its evaluation, or None if it is not configured."""
+        if metric_type not in self.metrics:
+            return None
+        return tuple(self.metrics[metric_type].get(key) for key in RULE_KEYS)
+    
+    def indexes(self, metric_types):
+        """Map metric type names to indexes into this snapshot's arrays.
+        
+        Args:
+            metric_types (iterable): Metric type names
+        
+        Returns:
+            numpy.ndarray: Index of each name
+        
+        Raises:
+            ValueError: If a name is not configured
+        """
+        try:
+            return np.array([self.metric_index[name] for name in metric_types], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"No threshold configured for metric type: {e.args[0]}")
+
+class ThresholdEngine:
+    """Evaluates batches of samples against the configured metric rules."""
+    
+    def __init__(self, config=None):
+        self.config = config or get_config()
+        self._lock = threading.Lock()
+        self._rules = None
+        # (scid, metric_type) -> (in breach, consecutive breaching samples)
+        self._state = {}
+    
+    def _load_rules(self):
+        """Get the current rules, rebuilding them when the config has been reloaded.
+        
+        Must be called with the lock held. State of metrics whose rules
+        changed or were removed is forgotten, so it is not carried over
+        into evaluation under different bounds.
+        """
+        metrics = self.config.get_metrics()
+        previous = self._rules
+        if previous is not None and metrics is previous.metrics:
+            return previous
+        
+        rules = ThresholdRules(metrics)
+        if previous is not None:
+            changed = {name for name in previous.metric_types if previous.rule(name) != rules.rule(name)}
+            if changed:
+                self._state = {key: state for key, state in self._state.items() if key[1] not in changed}
+                logger.info(f"Threshold rules changed for {sorted(changed)}, reset their breach state")
+        self._rules = rules
+        logger.debug("Loaded threshold rules for %s metrics", len(rules.metric_types))
+        return rules
+    
+    def get_rules(self):
+        """Get the current rule snapshot.
+        
+        Returns:
+            ThresholdRules: Rules whose indexes ``evaluate`` accepts with ``rules=``
+        """
+        with self._lock:
+            return self._load_rules()
+    
+    def get_metric_index(self):
+        """Get the array index of each configured metric type in the current rules.
+        
+        Returns:
+            dict: Index keyed by metric type
+        """
+        return self.get_rules().metric_index
+    
+    def evaluate(self, scids, metric_idx, values, rules=None):
+        """Evaluate a batch of samples.
+        
+        Args:
+            scids (array-like): Spacecraft ID of each sample
+            metric_idx (array-like): Index of each sample's metric in ``rules``
+            values (array-like): Sample values
+            rules (ThresholdRules, optional): Snapshot the indexes were taken
+                                              from (see get_rules); the current
+                                              rules if omitted. If the config
+                                              was reloaded since, the indexes
+                                              are mapped to the new rules by name.
+        
+        Returns:
+            tuple: (breach, threshold) arrays in input order; ``breach`` is a
+                   boolean array and ``threshold`` holds the bound each sample
+                   was compared against
+        
+        Raises:
+            ValueError: If a sample's metric is no longer configured
+        """
+        scids = np.asarray(scids, dtype=np.int64)
+        metric_idx = np.asarray(metric_idx, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.float64)
+        
+        with self._lock:
+            current = self._load_rules()
+            if rules is not None and rules is not current:
+                # Indexes of an older snapshot; translate them through the metric names
+                used = np.unique(metric_idx)
+                mapping = np.full(len(rules.metric_types), -1, dtype=np.int64)
+                mapping[used] = current.indexes([rules.metric_types[i] for i in used])
+                metric_idx = mapping[metric_idx]
+            rules = current
+            
+            # Group samples by (scid, metric), keeping time order within a group
+            order = np.lexsort((np.arange(n), metric_idx, scids))
+            s = scids[order]
+            m = metric_idx[order]
+            v = values[order]
+            upper = rules.upper[m]
+            lower = rules.lower[m]
+            margin = rules.hysteresis[m]
+            
+            starts = np.ones(n, dtype=bool)
+            starts[1:] = (s[1:] != s[:-1]) | (m[1:] != m[:-1])
+            start_idx = np.flatnonzero(starts)
+            group = np.cumsum(starts) - 1
+            group_start = start_idx[group]
+            end_idx = np.append(start_idx[1:] - 1, n - 1)
+            
+            # State carried over from earlier batches, one entry per group
+            metric_types = rules.metric_types
+            carried = [self._state.get((int(s[i]), metric_types[m[i]]), (False, 0)) for i in start_idx]
+            prev_active = np.array([state[0] for state in carried], dtype=bool)
+            prev_run = np.array([state[1] for state in carried], dtype=np.int64)
+            
+            # Hysteresis: a sample outside the bounds enters breach, one inside the
+            # narrowed bounds clears it, anything in between keeps the previous state
+            outside = (v > upper) | (v < lower)
+            inside = (v <= upper - margin) & (v >= lower + margin)
+            position = np.arange(n)
+            last_decided = np.maximum.accumulate(np.where(outside | inside, position, -1))
+            from_batch = last_decided >= group_start
+            active = np.where(from_batch, outside[np.maximum(last_decided, 0)], prev_active[group])
+            
+            # Debounce: count consecutive active samples, continuing the previous batch's run
+            last_reset = np.maximum.accumulate(np.where(active, -1, position))
+            run = np.where(last_reset >= group_start,
+                           position - last_reset,
+                           position - group_start + 1 + prev_run[group])
+            run[~active] = 0
+            breach = active & (run >= rules.debounce[m])
+            
+            for i in end_idx:
+                self._state[(int(s[i]), metric_types[m[i]])] = (bool(active[i]), int(run[i]))
+        
+        threshold = np.where(v < lower, lower, upper)
+        result_breach = np.empty(n, dtype=bool)
+        result_threshold = np.empty(n, dtype=np.float64)
+        result_breach[order] = breach
+        result_threshold[order] = threshold
+        return result_breach, result_threshold
+    
+    def reset(self):
+        """Forget hysteresis and debounce state."""
+        with self._lock:
+            self._state.clear()
+
+# Create a singleton instance
+threshold_engine = ThresholdEngine()
+
+def get_threshold_engine():
+    """Get the singleton threshold engine instance."""
+    return threshold_engine
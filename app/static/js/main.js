@@ -55,7 +55,7 @@ function showError(message) {
 
 // Event table management
 const eventTable = {
-    currentPage: 1,
+    currentCursor: null,
     currentSortBy: 'timestamp',
     currentSortOrder: 'desc',
     
@@ -68,7 +68,7 @@ const eventTable = {
     
     parseUrlParams: function() {
         const params = new URLSearchParams(window.location.search);
-        this.currentPage = parseInt(params.get('page') || '1');
+        this.currentCursor = params.get('cursor');
         this.currentSortBy = params.get('sort_by') || 'timestamp';
         this.currentSortOrder = params.get('sort_order') || 'desc';
     },
@@ -81,7 +81,9 @@ const eventTable = {
         const formData = new FormData(filterForm);
         const params = new URLSearchParams(formData);
         
-        params.set('page', this.currentPage);
+        if (this.currentCursor) {
+            params.set('cursor', this.currentCursor);
+        }
         params.set('sort_by', this.currentSortBy);
         params.set('sort_order', this.currentSortOrder);
         
@@ -95,7 +97,7 @@ const eventTable = {
         if (filterForm) {
             filterForm.addEventListener('submit', (e) => {
                 e.preventDefault();
-                this.currentPage = 1; // Reset to page 1 when filtering
+                this.currentCursor = null; // Back to the first page when filtering
                 this.loadEvents();
             });
         }
@@ -106,7 +108,7 @@ const eventTable = {
             pagination.addEventListener('click', (e) => {
                 if (e.target.tagName === 'A') {
                     e.preventDefault();
-                    this.currentPage = parseInt(e.target.dataset.page);
+                    this.currentCursor = e.target.dataset.cursor || null;
                     this.loadEvents();
                 }
             });
@@ -126,6 +128,7 @@ const eventTable = {
                 
                 this.currentSortBy = sortBy;
                 this.currentSortOrder = newOrder;
+                this.currentCursor = null; // Cursors are tied to a sort order
                 this.loadEvents();
             });
         });
@@ -149,7 +152,10 @@ const eventTable = {
             }
             
             // Add pagination and sorting
-            params.append('page', this.currentPage);
+            params.append('paginate', 'cursor');
+            if (this.currentCursor) {
+                params.append('cursor', this.currentCursor);
+            }
             params.append('sort_by', this.currentSortBy);
             params.append('sort_order', this.currentSortOrder);
             
@@ -171,7 +177,7 @@ const eventTable = {
             }
             
             this.renderEvents(data.events);
-            this.renderPagination(data.page, data.total_pages);
+            this.renderPagination(data.prev_cursor, data.next_cursor);
             
             // Update URL to reflect current state
             this.updateUrl();
@@ -215,62 +221,26 @@ const eventTable = {
         `).join('');
     },
     
-    renderPagination: function(currentPage, totalPages) {
+    renderPagination: function(prevCursor, nextCursor) {
         const pagination = document.querySelector('.pagination');
         if (!pagination) return;
         
-        if (totalPages <= 1) {
-            pagination.innerHTML = '';
-            return;
-        }
-        
         const pages = [];
         
         // Previous page button
-        if (currentPage > 1) {
+        if (prevCursor) {
             pages.push(`
                 <li class="page-item">
-                    <a class="page-link" href="#" data-page="${currentPage - 1}">&laquo; Previous</a>
+                    <a class="page-link" href="#" data-cursor="${prevCursor}">&laquo; Previous</a>
                 </li>
             `);
         }
         
-        // Page numbers
-        for (let i = 1; i <= totalPages; i++) {
-            // Show a subset of pages if there are too many
-            if (totalPages > 7) {
-                if (
-                    i === 1 || // Always show first page
-                    i === totalPages || // Always show last page
-                    (i >= currentPage - 1 && i <= currentPage + 1) // Show pages around current
-                ) {
-                    pages.push(`
-                        <li class="page-item ${i === currentPage ? 'active' : ''}">
-                            <a class="page-link" href="#" data-page="${i}">${i}</a>
-                        </li>
-                    `);
-                } else if (
-                    (i === 2 && currentPage > 3) ||
-                    (i === totalPages - 1 && currentPage < totalPages - 2)
-                ) {
-                    // Add ellipsis for skipped pages
-                    pages.push(`<li class="page-item disabled"><span class="page-link">...</span></li>`);
-                }
-            } else {
-                // Show all pages if there aren't too many
-                pages.push(`
-                    <li class="page-item ${i === currentPage ? 'active' : ''}">
-                        <a class="page-link" href="#" data-page="${i}">${i}</a>
-                    </li>
-                `);
-            }
-        }
-        
         // Next page button
-        if (currentPage < totalPages) {
+        if (nextCursor) {
             pages.push(`
                 <li class="page-item">
-                    <a class="page-link" href="#" data-page="${currentPage + 1}">Next &raquo;</a>
+                    <a class="page-link" href="#" data-cursor="${nextCursor}">Next &raquo;</a>
                 </li>
             `);
         }
@@ -279,6 +249,70 @@ const eventTable = {
     }
 };
 
+// Live dashboard updates pushed by the server
+const dashboardStream = {
+    source: null,
+    table: null,
+    // Delay before reopening a stream the server refused (it is at its stream limit)
+    retryDelay: 30000,
+    
+    init: function(table) {
+        if (!window.EventSource) {
+            return;
+        }
+        this.table = table;
+        this.connect();
+    },
+    
+    connect: function() {
+        // EventSource reconnects on its own if the stream drops, but gives up
+        // for good when the server answers with an error such as a 503
+        this.source = new EventSource(this.table.dataset.streamUrl);
+        this.source.addEventListener('status', (e) => this.applyUpdate(JSON.parse(e.data)));
+        this.source.addEventListener('error', () => {
+            if (this.source.readyState === EventSource.CLOSED) {
+                setTimeout(() => this.connect(), this.retryDelay);
+            }
+        });
+    },
+    
+    applyUpdate: function(update) {
+        update.cells.forEach(cell => {
+            const td = this.table.querySelector(
+                `.clickable-cell[data-scid="${cell.scid}"][data-metric="${cell.metric_type}"]`
+            );
+            if (!td) {
+                return;
+            }
+            const breach = cell.status === 'BREACH';
+            td.classList.toggle('bg-danger', breach);
+            td.classList.toggle('bg-success', !breach);
+            td.dataset.count = cell.count;
+            td.textContent = cell.count;
+        });
+        
+        this.updateChart();
+        
+        const lastCheck = document.getElementById('lastCheckTime');
+        if (lastCheck) {
+            lastCheck.textContent = new Date(update.timestamp + 'Z').toLocaleString();
+        }
+    },
+    
+    updateChart: function() {
+        // Breach totals per metric, in the same order as the table rows
+        const chart = window.Chart && Chart.getChart('metricsChart');
+        if (!chart) {
+            return;
+        }
+        chart.data.datasets[0].data = Array.from(this.table.querySelectorAll('tbody tr')).map(row =>
+            Array.from(row.querySelectorAll('.clickable-cell'))
+                .reduce((sum, td) => sum + parseInt(td.dataset.count, 10), 0)
+        );
+        chart.update();
+    }
+};
+
 // Initialize when DOM is loaded
 document.addEventListener('DOMContentLoaded', () => {
     // Check if we're on the events page
@@ -286,30 +320,11 @@ document.addEventListener('DOMContentLoaded', () => {
         eventTable.init();
     }
     
-    // Initialize other page-specific functionality
-    if (document.getElementById('run-monitor')) {
-        // Handle manual monitor trigger
-        document.getElementById('run-monitor').addEventListener('click', async function() {
-            try {
-                loadingStates.show(this);
-                const response = await fetch('/api/monitor', {
-                    method: 'POST'
-                });
-                const data = await response.json();
-                
-                if (response.ok) {
-                    alert('Monitoring completed successfully!');
-                    // Reload the page to show new data
-                    window.location.reload();
-                } else {
-                    throw new Error(data.error || 'Unknown error');
-                }
-            } catch (error) {
-                console.error('Error running monitor:', error);
-                showError('Error: ' + error.message);
-            } finally {
-                loadingStates.hide(this);
-            }
-        });
+    // Check if we're on the dashboard
+    const statusMatrix = document.getElementById('status-matrix');
+    if (statusMatrix) {
+        dashboardStream.init(statusMatrix);
     }
+    
+    // The Run Monitor button is handled by the layout on every page
 }); 
\ No newline at end of file
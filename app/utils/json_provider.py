@@ -0,0 +1,122 @@
+"""Fast JSON encoding for API responses.
+
+Uses orjson when it is installed and the standard library otherwise; both
+produce the same JSON for the values the API returns. Datetimes, dates and
+times are written as ISO 8601 strings (like the ``to_dict`` methods of the
+models), and NumPy scalars and arrays as plain numbers and lists.
+
+FastJSONProvider plugs this into Flask, so ``jsonify`` uses it. dumps_bytes
+is the same encoder for code outside a request, such as the event stream
+and the NDJSON export.
+"""
+
+import dataclasses
+import datetime
+import decimal
+import json
+import uuid
+import numpy as np
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library encoder
+    orjson = None
+
+# orjson options matching the stdlib encoder below: numpy support and
+# non-string dict keys (e.g. integer SCIDs), converted to strings like json.dumps
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+def _default(o):
+    """Encode values the JSON encoders do not handle themselves."""
+    if isinstance(o, (datetime.datetime, datetime.date, datetime.time)):
+        return o.isoformat()
+    if isinstance(o, np.generic):
+        return o.item()
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+def dumps_bytes(obj, sort_keys=False, indent=False):
+    """Serialize ``obj`` to compact UTF-8 JSON.
+    
+    Args:
+        obj: Value to serialize
+        sort_keys (bool): Sort dict keys
+        indent (bool): Indent by two spaces instead of writing compact JSON
+    
+    Returns:
+        bytes: Encoded JSON
+    """
+    if orjson is not None:
+        option = ORJSON_OPTIONS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; the stdlib encoder handles them
+            pass
+    
+    if indent:
+        text = json.dumps(obj, default=_default, sort_keys=sort_keys, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, default=_default, sort_keys=sort_keys, separators=(',', ':'), ensure_ascii=False)
+    return text.encode()
+
+def dumps(obj, sort_keys=False):
+    """Serialize ``obj`` to a compact JSON string."""
+    return dumps_bytes(obj, sort_keys=sort_keys).decode()
+
+def loads(s):
+    """Deserialize JSON text or UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider built on dumps_bytes.
+    
+    Responses are encoded straight to bytes. Calls that pass encoder
+    options the fast path does not know (``cls``, ``indent`` and so on)
+    go to the standard library like the default provider.
+    """
+    
+    default = staticmethod(_default)
+    
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj, sort_keys=self.sort_keys).decode()
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = dumps_bytes(obj, sort_keys=self.sort_keys, indent=indent) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def raw_json_response(body, status=200):
+    """Build a JSON response from an already encoded body.
+    
+    Args:
+        body (bytes): Encoded JSON, e.g. a cached response body
+        status (int): HTTP status code
+    
+    Returns:
+        Response: The body sent as is, without decoding or re-encoding it
+    """
+    return Response(body, status=status, mimetype='application/json')
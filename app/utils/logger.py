@@ -1,16 +1,84 @@
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
-from datetime import datetime
-from app.config import Config
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from app.config import get_config
 
 # Special null handler that does nothing
 class NullHandler(logging.Handler):
     def emit(self, record):
         pass
 
+# Handlers shared by every Logger. Records are put on a queue by the calling
+# thread and written to the files and console by a single listener thread.
+_queue_handler = None
+_listener = None
+_handlers_lock = threading.Lock()
+
+def _build_handlers():
+    """Create the file, error and console handlers served by the listener."""
+    # Create logs directory if it doesn't exist
+    if not os.path.exists('logs'):
+        os.makedirs('logs')
+    
+    # File handler for all logs
+    file_handler = RotatingFileHandler(
+        'logs/astra.log',
+        maxBytes=10485760,  # 10MB
+        backupCount=5
+    )
+    file_handler.setLevel(logging.DEBUG)
+    
+    # File handler for errors only
+    error_handler = RotatingFileHandler(
+        'logs/error.log',
+        maxBytes=10485760,  # 10MB
+        backupCount=5
+    )
+    error_handler.setLevel(logging.ERROR)
+    
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    
+    # Create formatters and add them to the handlers
+    file_formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    error_formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s\n'
+        'File: %(pathname)s\n'
+        'Line: %(lineno)d\n'
+        'Function: %(funcName)s'
+    )
+    
+    file_handler.setFormatter(file_formatter)
+    error_handler.setFormatter(error_formatter)
+    console_handler.setFormatter(file_formatter)
+    
+    return file_handler, error_handler, console_handler
+
+def _get_queue_handler():
+    """Get the shared queue handler, starting the listener thread on first use."""
+    global _queue_handler, _listener
+    with _handlers_lock:
+        if _queue_handler is None:
+            log_queue = queue.SimpleQueue()
+            _listener = QueueListener(log_queue, *_build_handlers(), respect_handler_level=True)
+            _listener.start()
+            # Flush queued records to disk before the interpreter exits
+            atexit.register(_listener.stop)
+            _queue_handler = QueueHandler(log_queue)
+        return _queue_handler
+
 class Logger:
-    """Centralized logging utility for the ASTRA application."""
+    """Centralized logging utility for the ASTRA application.
+    
+    Messages accept ``%``-style arguments that are only formatted when the
+    record is actually emitted, e.g. ``logger.debug("SCID %s: %s", scid, status)``.
+    """
     
     # Class variable to track global logging state
     _logging_enabled = True
@@ -23,7 +91,7 @@ class Logger:
             enabled (bool): Whether logging should be enabled
         """
         cls._logging_enabled = enabled
-        
+    
     @classmethod
     def is_enabled(cls):
         """Check if logging is enabled globally.
@@ -31,99 +99,64 @@ class Logger:
         Returns:
             bool: True if logging is enabled, False otherwise
         """
-        # Check both the class variable and the config setting
-        config = Config()
-        return cls._logging_enabled and config.is_logging_enabled()
+        # Check both the class variable and the shared (cached) config setting
+        return cls._logging_enabled and get_config().is_logging_enabled()
     
     def __init__(self, name='astra'):
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.INFO)
+        self.logger.setLevel(get_config().get_environment("LOG_LEVEL", "INFO").upper())
+        # Records go only through the queue, never through synchronous root handlers
+        self.logger.propagate = False
         self.name = name
         
         # Always configure handlers on init, but they may be disabled later
         self._configure_handlers()
-        
+    
     def _configure_handlers(self):
-        """Configure and set up all handlers for the logger."""
-        # Create logs directory if it doesn't exist
-        if not os.path.exists('logs'):
-            os.makedirs('logs')
-            
-        # File handler for all logs
-        file_handler = RotatingFileHandler(
-            'logs/astra.log',
-            maxBytes=10485760,  # 10MB
-            backupCount=5
-        )
-        file_handler.setLevel(logging.INFO)
-        
-        # File handler for errors only
-        error_handler = RotatingFileHandler(
-            'logs/error.log',
-            maxBytes=10485760,  # 10MB
-            backupCount=5
-        )
-        error_handler.setLevel(logging.ERROR)
-        
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # Create formatters and add them to the handlers
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        error_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s\n'
-            'File: %(pathname)s\n'
-            'Line: %(lineno)d\n'
-            'Function: %(funcName)s\n'
-            'Exception: %(exc_info)s'
-        )
-        
-        file_handler.setFormatter(file_formatter)
-        error_handler.setFormatter(error_formatter)
-        console_handler.setFormatter(file_formatter)
+        """Attach the shared queue handler to this logger."""
+        queue_handler = _get_queue_handler()
         
         # Remove any existing handlers
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
         
-        # Add the handlers to the logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(error_handler)
-        self.logger.addHandler(console_handler)
+        self.logger.addHandler(queue_handler)
     
-    def _log_if_enabled(self, level, message, **kwargs):
-        """Only log if logging is enabled.
+    def _log_if_enabled(self, level, message, args, **kwargs):
+        """Only log if the level is enabled and logging is switched on.
         
         Args:
-            level: The logging level method to call
-            message: The message to log
-            **kwargs: Additional arguments to pass to the logging method
+            level (int): The logging level
+            message: The message, optionally with ``%`` placeholders
+            args: Arguments for the placeholders
+            **kwargs: Additional arguments to pass to the logging call
         """
-        if self.is_enabled():
-            level(message, **kwargs)
+        # The level check is the cheapest, so it goes first
+        if self.logger.isEnabledFor(level) and self.is_enabled():
+            self.logger.log(level, message, *args, stacklevel=3, **kwargs)
     
-    def info(self, message):
+    def info(self, message, *args):
         """Log an info message."""
-        self._log_if_enabled(self.logger.info, message)
+        self._log_if_enabled(logging.INFO, message, args)
     
-    def error(self, message, exc_info=None):
+    def error(self, message, *args, exc_info=None):
         """Log an error message with optional exception info."""
-        self._log_if_enabled(self.logger.error, message, exc_info=exc_info)
+        self._log_if_enabled(logging.ERROR, message, args, exc_info=exc_info)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """Log a warning message."""
-        self._log_if_enabled(self.logger.warning, message)
+        self._log_if_enabled(logging.WARNING, message, args)
     
-    def debug(self, message):
+    def debug(self, message, *args):
         """Log a debug message."""
-        self._log_if_enabled(self.logger.debug, message)
+        self._log_if_enabled(logging.DEBUG, message, args)
     
-    def critical(self, message, exc_info=None):
+    def critical(self, message, *args, exc_info=None):
         """Log a critical message with optional exception info."""
-        self._log_if_enabled(self.logger.critical, message, exc_info=exc_info)
+        self._log_if_enabled(logging.CRITICAL, message, args, exc_info=exc_info)
+
+# Loggers already created, one per name
+_loggers = {}
 
 # Create a singleton instance for the main application
 main_logger = Logger()
@@ -135,8 +168,11 @@ def get_logger(name=None):
         name (str, optional): The name of the logger. If None, returns the main application logger.
     
     Returns:
-        Logger: A logger instance.
+        Logger: A logger instance, shared by every caller using the same name.
     """
     if name is None:
         return main_logger
-    return Logger(name) 
\ No newline at end of file
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, Logger(name))
+    return logger
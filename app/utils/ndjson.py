@@ -0,0 +1,69 @@
+"""Streaming reader for line-delimited JSON (NDJSON) results.
+
+MATLAB scripts print one JSON record per line. Lines are parsed as they are
+read, so a caller can ingest records while the script is still running and
+memory stays bounded by one line. Lines that do not start with ``{`` or
+``[`` (MATLAB banners, warnings, blank lines) are skipped; lines that look
+like JSON but fail to parse are reported and skipped. A whole
+``{"results": [...]}`` document on one line is also accepted, for scripts
+that still print their results in one piece.
+"""
+
+import json
+
+# Longest line accepted, in characters; longer lines are discarded and reported
+MAX_LINE_LENGTH = 1024 * 1024
+
+# Characters of a bad line included in its error report
+ERROR_SNIPPET_LENGTH = 200
+
+def iter_records(stream, on_error=None, max_line_length=MAX_LINE_LENGTH):
+    """Yield the JSON objects in a text stream, one line at a time.
+    
+    Args:
+        stream: Text stream (file, pipe or io.StringIO) to read lines from
+        on_error (callable, optional): Called as ``on_error(line_number, message, snippet)``
+                                       for every line that cannot be parsed
+        max_line_length (int): Longest line accepted, in characters
+    
+    Yields:
+        dict: One record per JSON object
+    """
+    def report(line_number, message, snippet=''):
+        if on_error is not None:
+            on_error(line_number, message, snippet[:ERROR_SNIPPET_LENGTH])
+    
+    line_number = 0
+    while True:
+        line = stream.readline(max_line_length + 1)
+        if not line:
+            return
+        line_number += 1
+        
+        if len(line) > max_line_length and not line.endswith('\n'):
+            # Skip the rest of the oversized line without holding it in memory
+            while line and not line.endswith('\n'):
+                line = stream.readline(max_line_length + 1)
+            report(line_number, f"line longer than {max_line_length} characters")
+            continue
+        
+        text = line.strip()
+        if not text or text[0] not in '{[':
+            continue
+        
+        try:
+            value = json.loads(text)
+        except ValueError as e:
+            report(line_number, str(e), text)
+            continue
+        
+        if isinstance(value, dict) and isinstance(value.get('results'), list):
+            value = value['results']
+        if isinstance(value, dict):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    yield item
+                else:
+                    report(line_number, "result is not a JSON object", json.dumps(item))
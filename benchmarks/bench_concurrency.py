@@ -0,0 +1,86 @@
+"""Concurrency check: parallel dashboard readers while one monitor thread writes.
+
+Reports read/write throughput and any "database is locked" errors. Run from
+the repository root:
+
+    python -m benchmarks.bench_concurrency --readers 8 --seconds 10
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from app.database import Database
+from benchmarks.bench_ingest import make_cycle
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel readers with one writer')
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--payloads', type=int, default=100)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(db_path=os.path.join(tmp, 'bench.db'))
+        db.init_app()
+        db.log_triggers(make_cycle(args.payloads, 4))
+        
+        filters = {'date_from': '2000-01-01', 'date_to': '2100-01-01'}
+        stop = threading.Event()
+        counts = {'reads': 0, 'writes': 0, 'locked': 0, 'errors': 0}
+        lock = threading.Lock()
+        
+        def record(key):
+            with lock:
+                counts[key] += 1
+        
+        def reader():
+            while not stop.is_set():
+                try:
+                    db.get_latest_statuses(filters=filters)
+                    db.get_breach_counts(filters=filters)
+                    db.get_all_triggers(limit=25, filters=filters)
+                    record('reads')
+                except OperationalError as e:
+                    record('locked' if 'locked' in str(e) else 'errors')
+                finally:
+                    db.close_session()
+        
+        def writer():
+            while not stop.is_set():
+                try:
+                    db.log_triggers(make_cycle(args.payloads, 4))
+                    record('writes')
+                except OperationalError as e:
+                    record('locked' if 'locked' in str(e) else 'errors')
+                finally:
+                    db.close_session()
+        
+        threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+        threads.append(threading.Thread(target=writer))
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        
+        journal_mode = db.engine.connect().exec_driver_sql('PRAGMA journal_mode').scalar()
+        db.cleanup()
+    
+    print(f"journal_mode={journal_mode} readers={args.readers} seconds={args.seconds}")
+    print(f"reads/sec   {counts['reads'] / args.seconds:>10.1f}")
+    print(f"writes/sec  {counts['writes'] / args.seconds:>10.1f}  ({args.payloads * 4} rows per write)")
+    print(f"locked      {counts['locked']:>10}")
+    print(f"errors      {counts['errors']:>10}")
+    if counts['locked'] or counts['errors']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
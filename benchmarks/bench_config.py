@@ -0,0 +1,80 @@
+"""Benchmark configuration lookups: re-parsing the JSON file vs. the shared config store.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_config --iterations 20000
+"""
+
+import argparse
+import json
+import logging
+import time
+
+from app.config import Config, get_config
+from app.utils.logger import Logger
+
+
+CONFIG_PATH = 'config/metrics_config.json'
+
+
+def parse_config():
+    """Legacy path: what every Config() construction used to do."""
+    with open(CONFIG_PATH) as f:
+        return json.load(f)
+
+
+def legacy_is_enabled():
+    """Legacy Logger.is_enabled: a fresh parse on every log call."""
+    value = parse_config().get('environment', {}).get('LOGGING_ENABLED', 'True').lower()
+    return value not in ('false', '0', 'no')
+
+
+def legacy_request():
+    """Legacy /api/events config work: parse, then build the payload name map."""
+    return {str(p['scid']): p['name'] for p in parse_config().get('payloads', [])}
+
+
+def cached_request():
+    """Per-request config work against the shared store."""
+    return get_config().get_payload_names()
+
+
+def legacy_log_call(logger):
+    if legacy_is_enabled():
+        logger.logger.info('bench message')
+
+
+def cached_log_call(logger):
+    logger.info('bench message')
+
+
+def run(name, fn, iterations, *args):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<22} {elapsed / iterations * 1e6:>10.2f} us/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark configuration lookups')
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+    
+    # Measure the logging overhead, not handler I/O
+    logger = Logger('bench.config')
+    for handler in logger.logger.handlers[:]:
+        logger.logger.removeHandler(handler)
+    logger.logger.addHandler(logging.NullHandler())
+    logger.logger.propagate = False
+    
+    run('Config() legacy', parse_config, args.iterations)
+    run('Config() cached', Config, args.iterations)
+    run('request legacy', legacy_request, args.iterations)
+    run('request cached', cached_request, args.iterations)
+    run('log call legacy', legacy_log_call, args.iterations, logger)
+    run('log call cached', cached_log_call, args.iterations, logger)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Microbenchmark: dashboard render time with logging on and off.
+
+Renders ``/`` through the Flask test client against a temporary database
+filled with a few monitoring cycles for the configured payloads. Run from
+the repository root (console log output goes to stderr):
+
+    python -m benchmarks.bench_dashboard --renders 200 2>/dev/null
+"""
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+
+
+def make_cycle(config, timestamp):
+    """Build one monitoring cycle for the configured payloads and metrics."""
+    results = []
+    for payload in config.get_payloads():
+        for metric_type, threshold in config.get_thresholds().items():
+            value = random.uniform(0.8, 1.2) * threshold
+            results.append({
+                'scid': payload['scid'],
+                'metric_type': metric_type,
+                'timestamp': timestamp,
+                'value': value,
+                'threshold': threshold,
+                'status': 'BREACH' if value > threshold else 'NORMAL'
+            })
+    return results
+
+
+def render(client, renders):
+    start = time.perf_counter()
+    for _ in range(renders):
+        response = client.get('/')
+        assert response.status_code == 200
+    return (time.perf_counter() - start) / renders
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dashboard rendering with logging on and off')
+    parser.add_argument('--renders', type=int, default=200)
+    parser.add_argument('--cycles', type=int, default=20)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before the app modules create the database singleton
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        from app import create_app
+        from app.config import get_config
+        from app.database import get_db
+        from app.utils.logger import Logger
+        
+        app = create_app()
+        config = get_config()
+        now = datetime.datetime.utcnow()
+        for cycle in range(args.cycles):
+            get_db().log_triggers(make_cycle(config, now - datetime.timedelta(minutes=10 * cycle)))
+        
+        client = app.test_client()
+        render(client, 5)
+        for enabled in (True, False):
+            Logger.set_enabled(enabled)
+            elapsed = render(client, args.renders)
+            print(f"logging {'on' if enabled else 'off':<4} {elapsed * 1000:>8.2f} ms/render")
+        get_db().cleanup()
+
+
+if __name__ == '__main__':
+    main()
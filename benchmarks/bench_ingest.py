@@ -0,0 +1,89 @@
+"""Benchmark event ingestion: per-event commits vs. the batched log_triggers path.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ingest --payloads 200 --metrics 4 --cycles 3
+"""
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+
+from app.database import Database
+from app.models.event import Event, BreachHistory
+
+
+def make_cycle(payloads, metrics):
+    """Build one monitoring cycle worth of results."""
+    timestamp = datetime.datetime.utcnow()
+    results = []
+    for scid in range(101, 101 + payloads):
+        for m in range(metrics):
+            value = random.uniform(0, 100)
+            results.append({
+                'scid': scid,
+                'metric_type': f"metric{m}",
+                'timestamp': timestamp,
+                'value': value,
+                'threshold': 75.0,
+                'status': 'BREACH' if value > 75.0 else 'NORMAL'
+            })
+    return results
+
+
+def ingest_per_event(db, results):
+    """Legacy path: one session and commit per event plus one per breach."""
+    for result in results:
+        with db.get_session() as session:
+            event = Event(**result)
+            session.add(event)
+            session.commit()
+            if result['status'] == 'BREACH':
+                session.add(BreachHistory(
+                    event_id=event.id,
+                    scid=result['scid'],
+                    metric_type=result['metric_type'],
+                    value=result['value'],
+                    threshold=result['threshold'],
+                    timestamp=result['timestamp']
+                ))
+                session.commit()
+
+
+def ingest_batched(db, results):
+    """New path: the whole cycle in a single transaction."""
+    db.log_triggers(results)
+
+
+def run(name, ingest, cycles, payloads, metrics):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(db_path=os.path.join(tmp, 'bench.db'))
+        db.init_app()
+        batches = [make_cycle(payloads, metrics) for _ in range(cycles)]
+        rows = sum(len(batch) for batch in batches)
+        
+        start = time.perf_counter()
+        for batch in batches:
+            ingest(db, batch)
+        elapsed = time.perf_counter() - start
+        db.cleanup()
+    
+    print(f"{name:<12} {rows:>8} rows  {elapsed:>8.3f}s  {rows / elapsed:>10.0f} rows/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark event ingestion')
+    parser.add_argument('--payloads', type=int, default=100)
+    parser.add_argument('--metrics', type=int, default=4)
+    parser.add_argument('--cycles', type=int, default=3)
+    args = parser.parse_args()
+    
+    run('per-event', ingest_per_event, args.cycles, args.payloads, args.metrics)
+    run('batched', ingest_batched, args.cycles, args.payloads, args.metrics)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark JSON response encoding: Flask's default provider vs. FastJSONProvider.
+
+Encodes an /api/events style response of ``--events`` events with each
+provider, and with FastJSONProvider's stdlib fallback, then compares with
+sending a cached, already encoded body. No database is needed:
+
+    python -m benchmarks.bench_json --events 10000
+"""
+
+import argparse
+import datetime
+import random
+import time
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import app.utils.json_provider as json_provider
+from app.utils.json_provider import FastJSONProvider, raw_json_response
+
+
+def make_response_data(events):
+    """Build an /api/events response body with ``events`` events."""
+    now = datetime.datetime.utcnow()
+    rows = []
+    for i in range(events):
+        value = random.uniform(0, 100)
+        rows.append({
+            'id': i + 1,
+            'scid': random.randint(101, 200),
+            'payload_name': f"Payload {random.randint(1, 100)}",
+            'metric_type': random.choice(('thermal', 'voltage', 'latency')),
+            'value': value,
+            'threshold': 75.0,
+            'status': 'BREACH' if value > 75.0 else 'NORMAL',
+            'timestamp': (now - datetime.timedelta(seconds=i)).isoformat()
+        })
+    return {'success': True, 'data': {'events': rows, 'next_cursor': None, 'page_size': events}}
+
+
+def measure(encode, min_seconds):
+    """Seconds per call of ``encode``, repeated for at least ``min_seconds``."""
+    encode()
+    calls = 0
+    start = time.perf_counter()
+    while calls == 0 or time.perf_counter() - start < min_seconds:
+        encode().get_data()
+        calls += 1
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON response encoding')
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--seconds', type=float, default=2.0, help='Minimum time per measurement')
+    args = parser.parse_args()
+    
+    data = make_response_data(args.events)
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+    body = fast_provider.response(data).get_data()
+    assert body == default_provider.response(data).get_data()
+    
+    encoders = [('flask default', lambda: default_provider.response(data))]
+    if json_provider.orjson is not None:
+        encoders.append(('fast (orjson)', lambda: fast_provider.response(data)))
+    encoders.append(('fast (stdlib)', lambda: fast_provider.response(data)))
+    encoders.append(('cached bytes', lambda: raw_json_response(body)))
+    
+    print(f"{len(body) / 1e6:.1f} MB response")
+    baseline = None
+    with app.app_context():
+        for name, encode in encoders:
+            if name == 'fast (stdlib)':
+                # Same provider with orjson hidden, as if it were not installed
+                orjson, json_provider.orjson = json_provider.orjson, None
+                try:
+                    elapsed = measure(encode, args.seconds)
+                finally:
+                    json_provider.orjson = orjson
+            else:
+                elapsed = measure(encode, args.seconds)
+            baseline = baseline or elapsed
+            print(f"{name:<16} {elapsed * 1000:>9.3f} ms/response  {baseline / elapsed:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
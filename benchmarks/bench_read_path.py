@@ -0,0 +1,130 @@
+"""Benchmark list reads: ORM instances + to_dict() vs. Core column selects.
+
+Fills a temporary SQLite database with ``--events`` events, then reads pages
+of increasing size both ways and reports rows/sec:
+
+- ``orm``: session.query(Event) followed by Event.to_dict() per row
+- ``core``: select(*EVENT_COLUMNS) followed by event_dicts()
+
+The breach history chart query is compared the same way. Run from the
+repository root:
+
+    python -m benchmarks.bench_read_path --events 200000
+"""
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import insert, select
+
+from app.database import Database
+from app.models.event import EVENT_COLUMNS, Event, event_dicts
+
+# Page sizes read in each comparison
+PAGE_SIZES = (25, 1000, 10000)
+
+
+def fill(db, events, payloads=100):
+    """Insert random events spread over the last 30 days."""
+    now = datetime.datetime.utcnow()
+    metrics = ('thermal', 'voltage', 'latency', 'power')
+    for offset in range(0, events, 50000):
+        rows = []
+        for _ in range(min(50000, events - offset)):
+            value = random.uniform(0, 100)
+            rows.append({
+                'scid': random.randint(101, 100 + payloads),
+                'metric_type': random.choice(metrics),
+                'timestamp': now - datetime.timedelta(seconds=random.uniform(0, 30 * 86400)),
+                'value': value,
+                'threshold': 75.0,
+                'status': 'BREACH' if value > 75.0 else 'NORMAL'
+            })
+        with db.get_session() as session:
+            session.execute(insert(Event), rows)
+            session.commit()
+
+
+def orm_page(db, page_size):
+    with db.get_session() as session:
+        events = session.query(Event).order_by(Event.timestamp.desc()).limit(page_size).all()
+        return [event.to_dict() for event in events]
+
+
+def core_page(db, page_size):
+    with db.get_session() as session:
+        rows = session.execute(
+            select(*EVENT_COLUMNS).order_by(Event.timestamp.desc()).limit(page_size)
+        ).all()
+        return event_dicts(rows)
+
+
+def history_conditions():
+    return (Event.scid == 101, Event.metric_type == 'thermal', Event.status == 'BREACH')
+
+
+def orm_history(db, _):
+    with db.get_session() as session:
+        events = session.query(Event).filter(*history_conditions()).order_by(Event.timestamp).all()
+        return [{
+            'timestamp': event.timestamp.isoformat(),
+            'value': event.value,
+            'threshold': event.threshold,
+            'status': event.status
+        } for event in events]
+
+
+def core_history(db, _):
+    with db.get_session() as session:
+        rows = session.execute(
+            select(Event.timestamp, Event.value, Event.threshold, Event.status)
+            .where(*history_conditions())
+            .order_by(Event.timestamp)
+        ).all()
+        return [{
+            'timestamp': timestamp.isoformat(),
+            'value': value,
+            'threshold': threshold,
+            'status': status
+        } for timestamp, value, threshold, status in rows]
+
+
+def rate(read, db, size, min_seconds):
+    """Rows/sec of ``read``, repeated for at least ``min_seconds``."""
+    read(db, size)
+    rows = reads = 0
+    start = time.perf_counter()
+    while reads == 0 or time.perf_counter() - start < min_seconds:
+        rows += len(read(db, size))
+        reads += 1
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ORM vs. Core list reads')
+    parser.add_argument('--events', type=int, default=200000)
+    parser.add_argument('--seconds', type=float, default=2.0, help='Minimum time per measurement')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(db_path=os.path.join(tmp, 'bench.db'))
+        db.init_app()
+        fill(db, args.events)
+        
+        comparisons = [(f"events page {size}", orm_page, core_page, size) for size in PAGE_SIZES]
+        comparisons.append(('breach history', orm_history, core_history, None))
+        
+        print(f"{'read':<20} {'orm rows/s':>12} {'core rows/s':>12} {'speedup':>8}")
+        for name, orm_read, core_read, size in comparisons:
+            orm_rate = rate(orm_read, db, size, args.seconds)
+            core_rate = rate(core_read, db, size, args.seconds)
+            print(f"{name:<20} {orm_rate:>12.0f} {core_rate:>12.0f} {core_rate / orm_rate:>7.2f}x")
+        db.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""Benchmark the dashboard status matrix on a large fleet.
+
+Builds a temporary database with ``--payloads`` payloads and ``--events``
+events spread over the last 60 days, then reports latency percentiles for:
+
+- ``legacy``: the previous two-query build of the nested status dict
+- ``query``: the single query the status matrix is now built from
+- ``build``: StatusMatrixBuilder.build with an empty cache, including the
+  write to the cache backend
+- ``render cold``: rendering ``/`` right after an ingestion (a new generation)
+- ``render warm``: rendering ``/`` with the matrix already cached
+
+Run from the repository root (console log output goes to stderr):
+
+    python -m benchmarks.bench_status_matrix --payloads 120 --events 1000000 2>/dev/null
+"""
+
+import argparse
+import datetime
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+# Days of history the events are spread over, matching the default dashboard window
+HISTORY_DAYS = 60
+
+# Rows per INSERT batch while filling the database
+INSERT_BATCH = 50000
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a sorted list."""
+    index = max(0, min(len(samples) - 1, int(round(pct / 100 * len(samples))) - 1))
+    return samples[index]
+
+
+def write_config(repo_root, tmp, payloads):
+    """Copy the metrics config into ``tmp`` with ``payloads`` payloads."""
+    with open(os.path.join(repo_root, 'config', 'metrics_config.json')) as f:
+        data = json.load(f)
+    data['payloads'] = [{'scid': 101 + i, 'name': f"Payload {i + 1}"} for i in range(payloads)]
+    data.setdefault('environment', {})['LOGGING_ENABLED'] = 'False'
+    os.makedirs(os.path.join(tmp, 'config'))
+    with open(os.path.join(tmp, 'config', 'metrics_config.json'), 'w') as f:
+        json.dump(data, f)
+    return data
+
+
+def fill(db, data, events):
+    """Insert random events and rebuild the rollup tables from them."""
+    from sqlalchemy import insert
+    from app.models.event import Event
+    
+    rng = np.random.default_rng(0)
+    metric_types = list(data['metrics'])
+    thresholds = np.array([float(data['metrics'][name].get('threshold', 0)) for name in metric_types])
+    scids = np.array([payload['scid'] for payload in data['payloads']])
+    now = datetime.datetime.utcnow()
+    
+    for offset in range(0, events, INSERT_BATCH):
+        n = min(INSERT_BATCH, events - offset)
+        metric = rng.integers(0, len(metric_types), n)
+        value = thresholds[metric] * rng.uniform(0.5, 1.05, n)
+        seconds = rng.uniform(0, HISTORY_DAYS * 86400, n)
+        rows = [{
+            'scid': int(scid),
+            'metric_type': metric_types[m],
+            'timestamp': now - datetime.timedelta(seconds=s),
+            'value': v,
+            'threshold': thresholds[m],
+            'status': 'BREACH' if v > thresholds[m] else 'NORMAL'
+        } for scid, m, v, s in zip(rng.choice(scids, n).tolist(), metric.tolist(), value.tolist(), seconds.tolist())]
+        with db.get_session() as session:
+            session.execute(insert(Event), rows)
+            session.commit()
+    
+    db.rebuild_latest_status()
+    db.rebuild_breach_counts()
+
+
+def legacy_status(db, data, filters):
+    """The previous build: two queries folded into a nested dict."""
+    matrix = {
+        payload['scid']: {
+            'name': payload['name'],
+            'metrics': {
+                name: {'status': 'NORMAL', 'threshold': metric.get('threshold', 0), 'count': 0}
+                for name, metric in data['metrics'].items()
+            }
+        }
+        for payload in data['payloads']
+    }
+    for status in db.get_latest_statuses(filters=filters):
+        if status.scid in matrix and status.metric_type in matrix[status.scid]['metrics']:
+            matrix[status.scid]['metrics'][status.metric_type]['status'] = status.status
+    for breach in db.get_breach_counts(filters=filters):
+        if breach.scid in matrix and breach.metric_type in matrix[breach.scid]['metrics']:
+            cell = matrix[breach.scid]['metrics'][breach.metric_type]
+            cell['count'] = breach.count
+            if breach.count > 0:
+                cell['status'] = 'BREACH'
+    return matrix
+
+
+def measure(name, func, runs, setup=None):
+    """Time ``func``, calling ``setup`` untimed before each run."""
+    samples = []
+    for _ in range(runs):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    print(f"{name:<12} p50 {percentile(samples, 50) * 1000:>8.2f} ms  "
+          f"p95 {percentile(samples, 95) * 1000:>8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the dashboard status matrix')
+    parser.add_argument('--payloads', type=int, default=120)
+    parser.add_argument('--events', type=int, default=1000000)
+    parser.add_argument('--runs', type=int, default=100)
+    args = parser.parse_args()
+    
+    repo_root = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The config and database must be in place before the app modules load them
+        data = write_config(repo_root, tmp, args.payloads)
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.chdir(tmp)
+        try:
+            from app import create_app
+            from app.config import bump_generation
+            from app.database import get_db
+            from app.routes.utils import get_default_date_range
+            from app.services import get_status_matrix_builder
+            
+            app = create_app()
+            db = get_db()
+            start = time.perf_counter()
+            fill(db, data, args.events)
+            print(f"Loaded {args.events} events for {args.payloads} payloads in {time.perf_counter() - start:.1f}s")
+            
+            date_from, date_to = get_default_date_range()
+            filters = {'date_from': date_from, 'date_to': date_to}
+            builder = get_status_matrix_builder()
+            client = app.test_client()
+            
+            def render():
+                assert client.get('/').status_code == 200
+            
+            # A new generation empties the cache, as an ingestion would
+            legacy_status(db, data, filters)
+            measure('legacy', lambda: legacy_status(db, data, filters), args.runs)
+            measure('query', lambda: db.get_status_cells(filters), args.runs)
+            measure('build', lambda: builder.build(date_from, date_to), args.runs, setup=bump_generation)
+            measure('render cold', render, args.runs, setup=bump_generation)
+            measure('render warm', render, args.runs)
+            db.cleanup()
+        finally:
+            os.chdir(repo_root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Load test for a running ASTRA server.
+
+Starts a fixed number of client threads per path, each issuing requests back
+to back for the given duration, and reports requests/sec and latency
+percentiles. Start the server first, e.g.
+
+    gunicorn --workers 4 --worker-class gthread --threads 8 --bind 127.0.0.1:5000 wsgi:app
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --concurrency 16 --seconds 20
+"""
+
+import argparse
+import threading
+import time
+import urllib.error
+import urllib.request
+
+PATHS = ('/', '/events', '/api/events')
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a sorted list."""
+    if not samples:
+        return float('nan')
+    index = max(0, min(len(samples) - 1, int(round(pct / 100 * len(samples))) - 1))
+    return samples[index]
+
+
+def hammer(url, deadline, latencies, errors, lock):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                response.read()
+            ok = True
+        except (urllib.error.URLError, OSError):
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors[0] += 1
+
+
+def run(base_url, path, concurrency, seconds):
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=hammer, args=(base_url + path, deadline, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    print(f"{path:<12} {len(latencies) / elapsed:>9.1f} req/s  "
+          f"p50 {percentile(latencies, 50) * 1000:>8.1f} ms  "
+          f"p99 {percentile(latencies, 99) * 1000:>8.1f} ms  "
+          f"errors {errors[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test a running ASTRA server')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--paths', nargs='*', default=list(PATHS))
+    args = parser.parse_args()
+    
+    for path in args.paths:
+        run(args.url.rstrip('/'), path, args.concurrency, args.seconds)
+
+
+if __name__ == '__main__':
+    main()
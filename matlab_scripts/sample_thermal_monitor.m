@@ -3,7 +3,7 @@
 % Example MATLAB script to monitor thermal metrics for satellite payloads
 % Returns JSON with thermal measurements for the specified payload
 
-function sample_thermal_monitor(scid)
+function jsonString = sample_thermal_monitor(scid)
     % Default to all payloads if no specific one provided
     if nargin < 1
         scid = 0;  % 0 means all payloads
@@ -15,15 +15,17 @@ function sample_thermal_monitor(scid)
     % Define available payloads
     payloads = [101, 102, 103, 104, 105, 106, 107, 108, 109, 110];
     
-    % Filter to specific payload if requested
-    if scid > 0
-        if ismember(scid, payloads)
-            payloads = scid;
-        else
-            % Payload not found, return empty result
+    % Filter to the requested payload, or shard of payloads, if any. Unknown
+    % scids in a shard are skipped without dropping the known ones
+    if any(scid > 0)
+        payloads = intersect(scid, payloads);
+        if isempty(payloads)
+            % None of the payloads found, return empty result
             results = struct('results', []);
             jsonString = jsonencode(results);
-            disp(jsonString);
+            if nargout == 0
+                disp(jsonString);
+            end
             return;
         end
     end
@@ -65,6 +67,12 @@ function sample_thermal_monitor(scid)
             
             % Add to results array
             results_array{end+1} = result;
+            
+            % Stream the record as one NDJSON line when run via -batch, so
+            % Python can ingest it while the script is still running
+            if nargout == 0
+                disp(jsonencode(result));
+            end
         end
     end
     
@@ -72,6 +80,6 @@ function sample_thermal_monitor(scid)
     results = struct('results', {results_array});
     jsonString = jsonencode(results);
     
-    % Print to stdout (this will be captured by the Python subprocess)
-    disp(jsonString);
+    % Records were already printed line by line when run via -batch;
+    % callers using the MATLAB Engine receive jsonString as the return value
 end 
\ No newline at end of file
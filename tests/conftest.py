@@ -0,0 +1,64 @@
+"""Shared fixtures for the test suite."""
+
+import datetime
+import random
+
+import pytest
+
+from app.database import Database
+
+
+def make_events(count, start=None, scids=(101, 102, 103), metric_types=('thermal', 'voltage')):
+    """Build ``count`` trigger dicts one second apart, as log_triggers takes them."""
+    start = start or datetime.datetime.utcnow() - datetime.timedelta(days=1)
+    events = []
+    for i in range(count):
+        value = random.uniform(0, 100)
+        events.append({
+            'scid': scids[i % len(scids)],
+            'metric_type': metric_types[i % len(metric_types)],
+            'timestamp': start + datetime.timedelta(seconds=i),
+            'value': value,
+            'threshold': 75.0,
+            'status': 'BREACH' if value > 75.0 else 'NORMAL'
+        })
+    return events
+
+
+class StubMatlabConfig:
+    """Just the settings MatlabInterface reads, for tests without metrics_config.json."""
+    
+    def __init__(self, tmp_path, scids=(101,), shard_size=0):
+        self.tmp_path = str(tmp_path)
+        self.scids = scids
+        self.shard_size = shard_size
+    
+    def get_matlab_scripts_path(self):
+        return self.tmp_path
+    
+    def is_simulation_mode(self):
+        return False
+    
+    def get_matlab_max_workers(self):
+        return 2
+    
+    def get_matlab_script_timeout(self):
+        return 5
+    
+    def get_matlab_execution_mode(self):
+        return 'batch'
+    
+    def get_matlab_shard_size(self):
+        return self.shard_size
+    
+    def get_payloads(self):
+        return [{'scid': scid, 'name': f"Payload {scid}"} for scid in self.scids]
+
+
+@pytest.fixture
+def db(tmp_path):
+    """An initialized Database on a temporary SQLite file."""
+    database = Database(db_path=str(tmp_path / 'astra.db'))
+    database.init_app()
+    yield database
+    database.cleanup()
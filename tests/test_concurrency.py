@@ -0,0 +1,62 @@
+"""Concurrent writers and readers on the WAL-mode SQLite pool."""
+
+import datetime
+import threading
+
+from conftest import make_events
+
+WRITERS = 4
+READERS = 4
+BATCHES = 20
+BATCH_SIZE = 50
+
+
+def test_concurrent_writes_and_reads_do_not_lock(db):
+    errors = []
+    counts = []
+    writing = threading.Event()
+    writing.set()
+    
+    def write(writer):
+        try:
+            for batch in range(BATCHES):
+                start = datetime.datetime(2024, 1, 1) + datetime.timedelta(hours=writer, minutes=batch)
+                db.log_triggers(make_events(BATCH_SIZE, start=start, scids=(101 + writer,)))
+        except Exception as e:
+            errors.append(e)
+    
+    def read():
+        try:
+            seen = []
+            while writing.is_set():
+                seen.append(db.get_trigger_count())
+                db.get_all_triggers(limit=25)
+                db.get_latest_statuses()
+                db.close_session()
+            counts.append(seen)
+        except Exception as e:
+            errors.append(e)
+    
+    writers = [threading.Thread(target=write, args=(i,)) for i in range(WRITERS)]
+    readers = [threading.Thread(target=read) for _ in range(READERS)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    writing.clear()
+    for thread in readers:
+        thread.join()
+    
+    assert not errors, errors
+    with db.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == 'wal'
+    
+    # Every batch commits atomically: readers only ever see whole batches,
+    # and never see the count go down
+    assert len(counts) == READERS
+    for seen in counts:
+        assert seen == sorted(seen)
+        assert all(count % BATCH_SIZE == 0 for count in seen)
+    
+    assert db.get_trigger_count() == WRITERS * BATCHES * BATCH_SIZE
+    assert len(db.get_latest_statuses()) == WRITERS * 2
@@ -0,0 +1,92 @@
+"""Round-trip tests for the bulk event export formats."""
+
+import csv
+import datetime
+import io
+import json
+
+import pytest
+
+from app.services.event_service import EventService
+from app.services.export_service import EXPORT_COLUMNS, ExportService
+from conftest import make_events
+
+# Small chunks so every export spans several chunks (and Parquet row groups)
+CHUNK_SIZE = 40
+
+
+@pytest.fixture
+def exported(db):
+    """Export service over 100 seeded events, and the events in export order."""
+    events = make_events(100, start=datetime.datetime(2024, 1, 1))
+    db.log_triggers(events)
+    event_service = EventService()
+    event_service.db = db
+    service = ExportService()
+    service.event_service = event_service
+    return service, events
+
+
+def export(service, fmt):
+    filters = {'date_from': '2024-01-01', 'date_to': '2024-01-02'}
+    return b''.join(service.export(fmt, filters, chunk_size=CHUNK_SIZE))
+
+
+def check_columns(columns, events):
+    assert list(columns) == list(EXPORT_COLUMNS)
+    assert columns['id'] == list(range(1, len(events) + 1))
+    assert columns['scid'] == [event['scid'] for event in events]
+    assert columns['status'] == [event['status'] for event in events]
+    assert columns['value'] == pytest.approx([event['value'] for event in events])
+
+
+def test_csv_round_trip(exported):
+    service, events = exported
+    rows = list(csv.DictReader(io.StringIO(export(service, 'csv').decode())))
+    
+    columns = {name: [row[name] for row in rows] for name in EXPORT_COLUMNS}
+    columns['id'] = [int(value) for value in columns['id']]
+    columns['scid'] = [int(value) for value in columns['scid']]
+    columns['value'] = [float(value) for value in columns['value']]
+    check_columns(columns, events)
+
+
+def test_ndjson_round_trip(exported):
+    service, events = exported
+    rows = [json.loads(line) for line in export(service, 'ndjson').splitlines()]
+    
+    check_columns({name: [row[name] for row in rows] for name in EXPORT_COLUMNS}, events)
+    assert rows[0]['timestamp'] == events[0]['timestamp'].isoformat()
+
+
+def test_arrow_round_trip(exported):
+    pa = pytest.importorskip('pyarrow')
+    service, events = exported
+    
+    table = pa.ipc.open_stream(export(service, 'arrow')).read_all()
+    
+    check_columns(table.to_pydict(), events)
+    assert table.column('timestamp').to_pylist() == [event['timestamp'] for event in events]
+
+
+def test_parquet_round_trip(exported):
+    pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    service, events = exported
+    
+    parquet = pq.ParquetFile(io.BytesIO(export(service, 'parquet')))
+    
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    check_columns(table.to_pydict(), events)
+    assert table.column('timestamp').to_pylist() == [event['timestamp'] for event in events]
+
+
+def test_columnar_formats_need_pyarrow(exported, monkeypatch):
+    import app.services.export_service as export_service
+    monkeypatch.setattr(export_service, 'pa', None)
+    service, _ = exported
+    
+    assert service.get_formats() == ['csv', 'ndjson']
+    with pytest.raises(ValueError):
+        service.export('parquet')
@@ -0,0 +1,99 @@
+"""Tests for the MATLAB engine pool, run on FakeMatlabEngine."""
+
+import json
+from concurrent.futures import Future
+
+import pytest
+
+from app.services.matlab_engine_pool import FakeMatlabEngine, MatlabEnginePool
+
+
+class HangingEngine(FakeMatlabEngine):
+    """Engine whose monitor calls never finish, like a hung script."""
+    
+    def __getattr__(self, name):
+        if name == 'sample_hang_monitor':
+            return lambda *args, nargout=1, background=False: Future()
+        return super().__getattr__(name)
+
+
+class FailingEngine(FakeMatlabEngine):
+    """Engine whose monitor calls raise a MATLAB error but stay usable."""
+    
+    def __getattr__(self, name):
+        if name == 'sample_broken_monitor':
+            def broken(*args, nargout=1, background=False):
+                raise RuntimeError("Undefined function 'broken'")
+            return broken
+        return super().__getattr__(name)
+
+
+def make_pool(engine_class=FakeMatlabEngine, size=1):
+    """Pool that records every engine it starts."""
+    engines = []
+    
+    def factory():
+        engines.append(engine_class(payloads=[101, 102, 103], thresholds={'thermal': 75.0}))
+        return engines[-1]
+    
+    pool = MatlabEnginePool(size, '/scripts', engine_factory=factory)
+    pool.start()
+    return pool, engines
+
+
+def results(output):
+    return json.loads(output)['results']
+
+
+def test_health_check_replaces_a_dead_engine():
+    pool, engines = make_pool()
+    engines[0].quit()
+    
+    with pool.acquire(timeout=1) as engine:
+        assert engine is engines[1]
+        assert engine.alive
+    assert len(engines) == 2
+
+
+def test_engine_is_replaced_after_a_script_timeout():
+    pool, engines = make_pool(HangingEngine)
+    
+    with pytest.raises(TimeoutError):
+        pool.call('sample_hang_monitor', 101, timeout=0.05)
+    
+    assert not engines[0].alive
+    with pool.acquire(timeout=1) as engine:
+        assert engine is engines[1]
+
+
+def test_scid_reaches_the_script_function():
+    pool, _ = make_pool()
+    
+    def scids(argument):
+        return [result['scid'] for result in results(pool.call('sample_thermal_monitor', argument, timeout=1))]
+    
+    assert scids(102) == [102]
+    assert scids([101, 103]) == [101, 103]
+    assert scids(0) == [101, 102, 103]
+
+
+def test_engines_are_returned_to_the_pool_on_error():
+    pool, engines = make_pool(FailingEngine, size=2)
+    
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            pool.call('sample_broken_monitor', 101, timeout=1)
+        with pytest.raises(AttributeError):
+            pool.call('not_a_monitor', timeout=1)
+    
+    # A script error leaves the engine healthy, so it is reused rather than restarted
+    assert len(engines) == 2
+    assert pool._engines.qsize() == 2
+    assert results(pool.call('sample_thermal_monitor', 101, timeout=1))[0]['scid'] == 101
+
+
+def test_shutdown_quits_every_engine():
+    pool, engines = make_pool(size=2)
+    pool.shutdown()
+    
+    assert not any(engine.alive for engine in engines)
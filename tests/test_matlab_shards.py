@@ -0,0 +1,84 @@
+"""Tests for running MATLAB monitors on payload shards."""
+
+import datetime
+import threading
+
+import pytest
+
+from app.services.matlab_interface import MatlabInterface
+from conftest import StubMatlabConfig
+
+# Payloads the (simulated) MATLAB scripts know about
+KNOWN_SCIDS = (101, 102, 103, 104)
+
+
+class FakeScripts:
+    """Stands in for stream_script, answering like the sample_*_monitor.m scripts.
+    
+    The scripts intersect the requested scids with the payloads they know,
+    so a shard yields results for its known scids and nothing for the rest.
+    """
+    
+    def __init__(self, fail_on=()):
+        self.arguments = []
+        self.fail_on = set(fail_on)
+        self.lock = threading.Lock()
+    
+    def __call__(self, script_name, payload_id=None, on_results=None):
+        argument = MatlabInterface._scid_argument(payload_id)
+        with self.lock:
+            self.arguments.append(argument)
+        requested = [int(scid) for scid in argument.strip('[]').split()]
+        if self.fail_on & set(requested):
+            raise RuntimeError(f"{script_name} failed")
+        results = [{
+            'scid': scid,
+            'metric_type': 'thermal',
+            'timestamp': datetime.datetime(2024, 1, 1),
+            'value': 80.0,
+            'threshold': 75.0,
+            'status': 'BREACH'
+        } for scid in sorted(set(requested) & set(KNOWN_SCIDS))]
+        if results:
+            on_results(results)
+        return len(results)
+
+
+def make_interface(tmp_path, scids, shard_size, scripts):
+    interface = MatlabInterface(StubMatlabConfig(tmp_path, scids, shard_size))
+    interface.stream_script = scripts
+    return interface
+
+
+def test_scid_argument_formats_scalars_and_shards():
+    assert MatlabInterface._scid_argument(None) == ''
+    assert MatlabInterface._scid_argument(101) == '101'
+    assert MatlabInterface._scid_argument([101, 102]) == '[101 102]'
+    assert MatlabInterface._scid_argument((101,)) == '[101]'
+
+
+def test_unknown_scid_does_not_drop_the_rest_of_its_shard(tmp_path):
+    scripts = FakeScripts()
+    interface = make_interface(tmp_path, [101, 999, 102, 103, 104], 2, scripts)
+    
+    results = interface.monitor_metric('thermal')
+    
+    assert sorted(scripts.arguments) == ['[101 999]', '[102 103]', '[104]']
+    assert sorted(result['scid'] for result in results) == list(KNOWN_SCIDS)
+
+
+def test_failing_shard_keeps_results_of_the_others(tmp_path):
+    scripts = FakeScripts(fail_on={103})
+    interface = make_interface(tmp_path, list(KNOWN_SCIDS), 2, scripts)
+    
+    results = interface.monitor_metric('thermal')
+    
+    assert sorted(result['scid'] for result in results) == [101, 102]
+
+
+def test_metric_fails_only_when_every_shard_fails(tmp_path):
+    scripts = FakeScripts(fail_on=set(KNOWN_SCIDS))
+    interface = make_interface(tmp_path, list(KNOWN_SCIDS), 2, scripts)
+    
+    with pytest.raises(RuntimeError):
+        interface.monitor_metric('thermal')
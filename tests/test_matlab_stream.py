@@ -0,0 +1,72 @@
+"""Tests for streaming NDJSON results out of a ``matlab -batch`` process."""
+
+import io
+import json
+
+import app.services.matlab_interface as matlab_interface
+from app.services.matlab_interface import MatlabInterface
+from conftest import StubMatlabConfig
+
+RECORDS = [
+    {'timestamp': '2024-01-01T00:00:00', 'scid': scid, 'metric_type': 'thermal',
+     'value': 80.0, 'threshold': 75.0, 'status': 'BREACH'}
+    for scid in (101, 102)
+]
+
+
+class FakeProcess:
+    """Finished ``matlab -batch`` process with canned stdout."""
+    
+    def __init__(self, cmd, stdout):
+        self.cmd = cmd
+        self.stdout = io.StringIO(stdout)
+        self.stderr = io.StringIO('')
+        self.returncode = 0
+        self.pid = 0
+    
+    def wait(self):
+        return self.returncode
+    
+    def poll(self):
+        return self.returncode
+
+
+def run(tmp_path, monkeypatch, stdout):
+    """Run sample_thermal_monitor through stream_script against a fake process."""
+    (tmp_path / 'sample_thermal_monitor.m').write_text('% fake script\n')
+    processes = []
+    
+    def popen(cmd, **kwargs):
+        processes.append(FakeProcess(cmd, stdout))
+        return processes[-1]
+    
+    monkeypatch.setattr(matlab_interface.subprocess, 'Popen', popen)
+    interface = MatlabInterface(StubMatlabConfig(tmp_path))
+    errors = []
+    monkeypatch.setattr(interface, '_parse_error_reporter', lambda source: lambda *error: errors.append(error))
+    results = []
+    interface.stream_script('sample_thermal_monitor.m', [101, 102], results.extend)
+    return processes[0].cmd, results, errors
+
+
+def test_batch_command_suppresses_the_returned_document(tmp_path, monkeypatch):
+    cmd, _, _ = run(tmp_path, monkeypatch, '')
+    
+    assert cmd[:2] == ['matlab', '-batch']
+    assert cmd[2].endswith('sample_thermal_monitor([101 102]);')
+
+
+def test_records_are_parsed_and_an_ans_block_is_ignored(tmp_path, monkeypatch):
+    # What MATLAB printed when the call had no semicolon: the streamed records,
+    # then the whole returned document as a quoted char array
+    document = json.dumps({'results': RECORDS})
+    stdout = (
+        ''.join(json.dumps(record) + '\n' for record in RECORDS)
+        + f"\nans =\n\n    '{document}'\n\n"
+    )
+    
+    _, results, errors = run(tmp_path, monkeypatch, stdout)
+    
+    assert [result['scid'] for result in results] == [101, 102]
+    assert all(result['timestamp'].year == 2024 for result in results)
+    assert errors == []
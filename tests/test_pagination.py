@@ -0,0 +1,87 @@
+"""Tests for page size validation of keyset and offset pagination."""
+
+import pytest
+from flask import Flask, request
+from sqlalchemy import select
+
+from app.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate_keyset
+from app.models.event import EVENT_COLUMNS, Event
+from app.routes import api
+from app.routes.api import api_bp
+from app.routes.utils import parse_cursor_params, parse_pagination_params
+from conftest import make_events
+
+
+def parse(query_string):
+    with Flask(__name__).test_request_context(f'/?{query_string}'):
+        return parse_cursor_params(request)[1], parse_pagination_params(request)[1]
+
+
+def test_page_size_below_one_is_clamped():
+    assert parse('page_size=-5') == (1, 1)
+    assert parse('page_size=0') == (1, 1)
+
+
+def test_page_size_above_max_is_clamped():
+    assert parse(f'page_size={MAX_PAGE_SIZE + 1}') == (MAX_PAGE_SIZE, MAX_PAGE_SIZE)
+    assert parse('page_size=100000000') == (MAX_PAGE_SIZE, MAX_PAGE_SIZE)
+
+
+def test_missing_or_invalid_page_size_uses_default():
+    assert parse('') == (DEFAULT_PAGE_SIZE, DEFAULT_PAGE_SIZE)
+    assert parse('page_size=abc') == (DEFAULT_PAGE_SIZE, DEFAULT_PAGE_SIZE)
+
+
+def test_paginate_keyset_never_returns_more_than_max(db):
+    db.log_triggers(make_events(MAX_PAGE_SIZE + 10))
+    
+    with db.get_session() as session:
+        for page_size, expected in ((-5, 1), (0, 1), (MAX_PAGE_SIZE * 10, MAX_PAGE_SIZE)):
+            rows, next_cursor, _ = paginate_keyset(
+                select(*EVENT_COLUMNS), Event, 'timestamp', 'DESC', page_size, session=session
+            )
+            assert len(rows) == expected
+            assert next_cursor is not None
+
+
+class StubEventService:
+    """Event service that returns no events and records which pagination ran."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def get_events(self, page, page_size, sort_by, sort_order, filters):
+        self.calls.append('offset')
+        return {'events': [], 'total_pages': 1, 'total_count': 0}
+    
+    def get_events_page(self, cursor, page_size, sort_by, sort_order, filters, include_total):
+        self.calls.append('cursor')
+        return {'events': [], 'next_cursor': None, 'prev_cursor': None, 'total_count': None}
+
+
+@pytest.fixture
+def events_api(monkeypatch):
+    service = StubEventService()
+    monkeypatch.setattr(api, 'get_event_service', lambda: service)
+    app = Flask(__name__)
+    app.register_blueprint(api_bp, url_prefix='/api')
+    return app.test_client(), service
+
+
+def test_events_api_uses_offset_pagination_by_default(events_api):
+    client, service = events_api
+    
+    assert client.get('/api/events?sort_order=ASC').json['data']['page'] == 1
+    assert 'next_cursor' in client.get('/api/events?sort_order=ASC&paginate=cursor').json['data']
+    assert 'next_cursor' in client.get('/api/events?sort_order=ASC&cursor=abc').json['data']
+    assert service.calls == ['offset', 'cursor', 'cursor']
+
+
+def test_events_api_rejects_unknown_sort_column(events_api):
+    client, service = events_api
+    
+    for query in ('sort_by=__class__', 'sort_by=__class__&paginate=cursor'):
+        response = client.get(f'/api/events?{query}', headers={'Content-Type': 'application/json'})
+        assert response.status_code == 400
+        assert response.json['success'] is False
+    assert service.calls == []
@@ -0,0 +1,14 @@
+"""Regression test: the hot dashboard and event list queries use indexes."""
+
+from app.services.query_audit import explain_hot_queries
+from conftest import make_events
+
+
+def test_hot_queries_use_an_index(db):
+    db.log_triggers(make_events(2000))
+    
+    report = explain_hot_queries(db)
+    
+    assert report
+    scans = {entry['name']: entry['plan'] for entry in report if not entry['uses_index']}
+    assert not scans
@@ -0,0 +1,47 @@
+"""Tests for the fixed-rate metric scheduler."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+from app.services import scheduler as scheduler_module
+from app.services.scheduler import MonitorScheduler
+
+
+class StubSchedulerConfig:
+    """Config with two hourly metrics sharing one worker thread."""
+    
+    def get_matlab_max_workers(self):
+        return 1
+    
+    def get_metrics(self):
+        return ['a_slow', 'b_queued']
+    
+    def get_metric_interval(self, metric_type):
+        return 3600
+
+
+def test_lag_includes_time_queued_for_a_worker(monkeypatch):
+    def stream_metric(metric_type, callback):
+        if metric_type == 'a_slow':
+            time.sleep(0.3)
+        return 0
+    
+    monkeypatch.setattr(scheduler_module, 'get_matlab', lambda: SimpleNamespace(stream_metric=stream_metric))
+    monkeypatch.setattr(scheduler_module, 'get_db', lambda: SimpleNamespace(log_triggers=None))
+    scheduler = MonitorScheduler(config=StubSchedulerConfig())
+    stop_event = threading.Event()
+    thread = threading.Thread(target=scheduler.run, args=(stop_event,))
+    thread.start()
+    
+    deadline = time.monotonic() + 5
+    while scheduler.get_stats().get('b_queued', {}).get('runs', 0) < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stop_event.set()
+    thread.join()
+    
+    stats = scheduler.get_stats()
+    assert stats['a_slow']['last_lag'] < 0.3
+    # Both were due at once, but the second only started once the worker was free
+    assert stats['b_queued']['runs'] == 1
+    assert stats['b_queued']['last_lag'] >= 0.3
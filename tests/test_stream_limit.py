@@ -0,0 +1,92 @@
+"""Tests for the per-process limit on open /api/stream connections."""
+
+import threading
+
+import pytest
+from flask import Flask
+
+from app.config.config import Config
+from app.routes.api import api_bp
+from app.services.status_broker import StatusBroker, get_status_broker
+
+
+@pytest.fixture
+def stream_limit(monkeypatch):
+    """Allow two streams and skip building the status matrix."""
+    monkeypatch.setattr(Config, 'get_stream_max_connections', lambda self: 2)
+    monkeypatch.setattr(StatusBroker, '_load_cells', lambda self, key: {})
+
+
+def test_subscriptions_past_the_limit_are_refused(stream_limit):
+    broker = StatusBroker()
+    first = broker.subscribe('2024-01-01', '2024-02-01')
+    second = broker.subscribe('2024-01-15', '2024-02-01')
+    
+    assert first is not None and second is not None
+    assert broker.subscribe('2024-01-01', '2024-02-01') is None
+    
+    broker.unsubscribe(first)
+    assert broker.get_subscriber_count() == 1
+    third = broker.subscribe('2024-01-01', '2024-02-01')
+    assert third is not None
+    
+    broker.unsubscribe(second)
+    broker.unsubscribe(third)
+    assert broker.get_subscriber_count() == 0
+
+
+class RacingLock:
+    """Lock that runs a callback once, right after its nth release."""
+    
+    def __init__(self, release_count, callback):
+        self._lock = threading.Lock()
+        self._release_count = release_count
+        self._callback = callback
+    
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._lock.release()
+        self._release_count -= 1
+        if self._release_count == 0:
+            self._callback()
+
+
+def test_window_closed_between_lookups_is_rebuilt(stream_limit):
+    broker = StatusBroker()
+    first = broker.subscribe('2024-01-01', '2024-02-01')
+    # The last subscriber leaves right after the second subscribe has seen
+    # the window (its limit check and first lookup each take the lock)
+    broker._lock = RacingLock(2, lambda: broker.unsubscribe(first))
+    
+    second = broker.subscribe('2024-01-01', '2024-02-01')
+    
+    assert second is not None
+    assert broker.get_subscriber_count() == 1
+    assert broker._windows[('2024-01-01', '2024-02-01')]['subscribers'] == {second}
+    broker.unsubscribe(second)
+    assert broker.get_subscriber_count() == 0
+
+
+def test_stream_endpoint_returns_503_at_the_limit(stream_limit):
+    app = Flask(__name__)
+    app.register_blueprint(api_bp, url_prefix='/api')
+    broker = get_status_broker()
+    held = [broker.subscribe('2024-01-01', '2024-02-01') for _ in range(2)]
+    
+    try:
+        response = app.test_client().get('/api/stream')
+        assert response.status_code == 503
+        assert response.headers['Retry-After']
+    finally:
+        for subscription in held:
+            broker.unsubscribe(subscription)
+    
+    # A freed slot is usable again, and closing the response releases it
+    response = app.test_client().get('/api/stream', buffered=False)
+    assert response.status_code == 200
+    assert broker.get_subscriber_count() == 1
+    response.close()
+    assert broker.get_subscriber_count() == 0
@@ -0,0 +1,104 @@
+"""Tests for threshold rule snapshots across config reloads."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.monitor_service import MonitorService
+from app.services.threshold_engine import ThresholdEngine
+
+
+class StubConfig:
+    """Config whose metrics can be swapped like a reloaded metrics_config.json."""
+    
+    def __init__(self, metrics):
+        self.metrics = metrics
+    
+    def get_metrics(self):
+        return self.metrics
+
+
+class StubDatabase:
+    def __init__(self):
+        self.logged = []
+    
+    def log_triggers(self, events):
+        self.logged.extend(events)
+        return len(events)
+
+
+def test_stale_indexes_are_mapped_to_the_reloaded_rules():
+    config = StubConfig({'thermal': {'threshold': 10}, 'voltage': {'threshold': 100}})
+    engine = ThresholdEngine(config)
+    rules = engine.get_rules()
+    thermal = rules.metric_index['thermal']
+    
+    # A reload reorders the metrics, so index 0 now means voltage
+    config.metrics = {'voltage': {'threshold': 100}, 'thermal': {'threshold': 10}}
+    breach, threshold = engine.evaluate([101], [thermal], [50.0], rules=rules)
+    
+    assert breach.tolist() == [True]
+    assert threshold.tolist() == [10.0]
+
+
+def test_indexes_of_a_removed_metric_are_rejected():
+    config = StubConfig({'thermal': {'threshold': 10}, 'voltage': {'threshold': 100}})
+    engine = ThresholdEngine(config)
+    rules = engine.get_rules()
+    
+    config.metrics = {'thermal': {'threshold': 10}}
+    with pytest.raises(ValueError):
+        engine.evaluate([101], [rules.metric_index['voltage']], [50.0], rules=rules)
+
+
+def test_state_is_reset_only_for_metrics_whose_rules_changed():
+    rule = {'threshold': 10, 'debounce': 2}
+    config = StubConfig({'thermal': dict(rule), 'voltage': dict(rule)})
+    engine = ThresholdEngine(config)
+    
+    def check(metric_type):
+        rules = engine.get_rules()
+        return engine.evaluate([101], [rules.metric_index[metric_type]], [50.0], rules=rules)[0][0]
+    
+    # First breaching sample of each metric is debounced
+    assert not check('thermal') and not check('voltage')
+    
+    # Reload with a new thermal threshold; voltage's rule is unchanged
+    config.metrics = {'thermal': {'threshold': 20, 'debounce': 2}, 'voltage': dict(rule)}
+    assert not check('thermal')
+    assert check('voltage')
+
+
+def test_check_samples_labels_events_with_the_snapshot_it_used():
+    config = StubConfig({'thermal': {'threshold': 10}, 'voltage': {'threshold': 100}})
+    service = MonitorService()
+    service.threshold_engine = ThresholdEngine(config)
+    service.db = StubDatabase()
+    rules = service.threshold_engine.get_rules()
+    
+    config.metrics = {'voltage': {'threshold': 100}, 'thermal': {'threshold': 10}}
+    events = service.check_samples([101, 101], rules.indexes(['thermal', 'voltage']), [50.0, 50.0], rules=rules)
+    
+    assert [(event['metric_type'], event['status']) for event in events] == [
+        ('thermal', 'BREACH'),
+        ('voltage', 'NORMAL')
+    ]
+
+
+def test_check_metrics_parses_iso_timestamps():
+    config = StubConfig({'thermal': {'threshold': 10}})
+    service = MonitorService()
+    service.threshold_engine = ThresholdEngine(config)
+    service.db = StubDatabase()
+    
+    events = service.check_metrics([
+        {'scid': 101, 'metric_type': 'thermal', 'value': 50.0, 'timestamp': '2024-01-01T00:00:00Z'},
+        {'scid': 101, 'metric_type': 'thermal', 'value': 5.0, 'timestamp': 'yesterday'},
+        {'scid': 102, 'metric_type': 'thermal', 'value': 5.0, 'timestamp': datetime(2024, 1, 2)}
+    ])
+    
+    assert [event['timestamp'] for event in events] == [
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+        datetime(2024, 1, 2)
+    ]
+    assert service.db.logged == events
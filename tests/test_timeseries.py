@@ -0,0 +1,33 @@
+"""Tests for the bounded size of downsampled time series."""
+
+import datetime
+
+from app.services.event_service import MAX_TIMESERIES_POINTS, EventService
+from conftest import make_events
+
+
+def make_service(db):
+    service = EventService()
+    service.db = db
+    return service
+
+
+def test_small_bucket_seconds_is_widened_to_the_point_limit(db):
+    start = datetime.datetime(2024, 1, 1)
+    db.log_triggers(make_events(20000, start=start, scids=(101,), metric_types=('thermal',)))
+    
+    series = make_service(db).get_timeseries(101, 'thermal', '2024-01-01', '2024-03-01',
+                                             bucket_seconds=1, include_normal=True)
+    
+    span = (datetime.datetime(2024, 3, 2) - start).total_seconds()
+    assert series['bucket_seconds'] == -(-span // MAX_TIMESERIES_POINTS)
+    assert len(series['points']) <= MAX_TIMESERIES_POINTS
+
+
+def test_bucket_seconds_above_the_limit_is_kept(db):
+    db.log_triggers(make_events(100, start=datetime.datetime(2024, 1, 1), scids=(101,), metric_types=('thermal',)))
+    
+    series = make_service(db).get_timeseries(101, 'thermal', '2024-01-01', '2024-01-01',
+                                             bucket_seconds=3600, include_normal=True)
+    
+    assert series['bucket_seconds'] == 3600
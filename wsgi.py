@@ -0,0 +1,23 @@
+"""WSGI entry point for production serving.
+
+The web tier only serves requests; it never runs the monitor. Run it with
+several threaded workers:
+
+    gunicorn --workers 4 --worker-class gthread --threads 8 --bind 0.0.0.0:5000 wsgi:app
+
+Every open dashboard event stream (/api/stream) holds one of those threads.
+Each worker accepts at most STREAM_MAX_CONNECTIONS (default 4) streams and
+answers more with a 503, so the other threads keep serving the API; with
+the command above that is 16 live dashboards. For more, use async workers
+and set STREAM_MAX_CONNECTIONS to 0:
+
+    gunicorn --workers 4 --worker-class gevent --worker-connections 1000 --bind 0.0.0.0:5000 wsgi:app
+
+Run exactly one monitor process next to it:
+
+    python -m app.monitor
+"""
+
+from app import create_app
+
+app = create_app()